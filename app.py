@@ -2,17 +2,29 @@
 Flask application for Local AI RAG Chatbot.
 Main application file with routes and handlers.
 """
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, render_template, request, jsonify, send_file, session, Response, stream_with_context, g
 import os
+import json
+import queue
 from werkzeug.utils import secure_filename
 from datetime import datetime
 from config import Config
 from logger import logger
-from rag_engine import RAGEngine
-from gemini_client import GeminiClient
 from github_client import GitHubClient
+from github_mirror import verify_signature
+from workflow_dispatch import DispatchTracker, WORKFLOW_ARTIFACTS
+from artifact_watcher import ArtifactWatcher
+from repo_sync import RepoSync
+from workflow_history import WorkflowHistory
+from batch_reports import BatchRunner
+from github_index import GitHubIndex
+from github_digest import GitHubDigest
+from chat_pipeline import ChatPipeline
+from async_runtime import async_runtime
+from startup import Components
 from word_generator import (
     create_process_document,
+    create_process_analysis_report,
     list_generated_reports,
     cleanup_old_reports
 )
@@ -21,18 +33,93 @@ from word_generator import (
 app = Flask(__name__)
 app.config.from_object(Config)
 
-# Initialize components
+
+
+def create_rag_engine():
+    """Create the RAG engine (imports ChromaDB, opens the vector store)."""
+    from rag_engine import RAGEngine
+    return RAGEngine()
+
+
+def create_gemini_client():
+    """Create the Gemini client."""
+    from gemini_client import GeminiClient
+    return GeminiClient()
+
+
+# Initialize components; the expensive ones start in the background so the
+# server can answer (e.g. /health) while they come up
 try:
     Config.validate()
-    rag_engine = RAGEngine()
-    gemini_client = GeminiClient()
-    github_client = GitHubClient()
+    components = Components()
+    rag_engine = components.register('rag_engine', create_rag_engine)
+    gemini_client = components.register('gemini', create_gemini_client)
+    github_client = GitHubClient(connect=False)
+    components.register('github', github_client.initialize, required=False)
+    components.start()
+    github_index = GitHubIndex(github_client, rag_engine)
+    if Config.GITHUB_INDEX_ENABLED:
+        github_index.start()
+    github_digest = GitHubDigest(github_client)
+    if Config.GITHUB_DIGEST_ENABLED:
+        github_digest.start()
+    chat_pipeline = ChatPipeline(
+        rag_engine, gemini_client, github_client,
+        github_index=github_index if Config.GITHUB_INDEX_ENABLED else None,
+        github_digest=github_digest if Config.GITHUB_DIGEST_ENABLED else None
+    )
+    workflow_dispatches = DispatchTracker(github_client)
+    artifact_watcher = ArtifactWatcher(github_client)
+    repo_sync = RepoSync(github_client, rag_engine)
+    workflow_history = WorkflowHistory()
+    batch_runner = BatchRunner(github_client, workflow_dispatches, artifact_watcher)
     logger.info("Application initialized successfully")
 except Exception as e:
     logger.error(f"Failed to initialize application: {e}")
     raise
 
 
+# GitHub endpoints that do not act on the session's repository
+REPOSITORY_INDEPENDENT_ENDPOINTS = ('connect_github', 'github_webhook')
+
+
+@app.before_request
+def select_repository():
+    """
+    Scope GitHub API calls to the repository chosen in this session.
+    
+    Only /api/github/ endpoints select it (opening an evicted repository is
+    a blocking GitHub call); chat selects it in the pipeline. A repository
+    that can no longer be opened is reported rather than silently replaced
+    by the default one.
+    """
+    if (not request.path.startswith('/api/github/')
+            or request.endpoint in REPOSITORY_INDEPENDENT_ENDPOINTS):
+        return None
+    
+    repository = session.get('github_repo')
+    try:
+        g.github_repo_token = github_client.set_request_repository(
+            repository, strict=True
+        )
+    except Exception as e:
+        logger.warning(f"Session repository {repository} is unavailable: {e}")
+        return jsonify({
+            'error': f"Repository {repository} is unavailable; reconnect it "
+                     f"or connect another repository",
+            'repository': repository
+        }), 400
+    return None
+
+
+@app.teardown_request
+def reset_repository(exc=None):
+    """Restore the default repository after the request."""
+    token = g.pop('github_repo_token', None)
+    if token is not None:
+        github_client.reset_request_repository(token)
+
+
 @app.route('/')
 def index():
     """Render main chat interface."""
@@ -47,7 +134,9 @@ def settings():
         if github_client.is_connected()
         else None
     )
-    rag_stats = rag_engine.get_stats()
+    # Never wait for a component that is still starting; the page shows a
+    # placeholder instead
+    rag_stats = rag_engine.get_stats() if components.is_ready('rag_engine') else None
     
     return render_template(
         'settings.html',
@@ -62,48 +151,36 @@ def chat():
     """
     Handle chat requests.
     Combines RAG context and GitHub data to generate responses.
+    
+    Runs the async chat pipeline on the shared runtime; when served through
+    asgi.py this route is handled natively without blocking a thread.
     """
     try:
-        data = request.get_json()
-        user_query = data.get('query', '').strip()
-        
-        if not user_query:
-            return jsonify({'error': 'Query cannot be empty'}), 400
-        
-        logger.info(f"Processing chat query: {user_query[:100]}...")
-        
-        # Retrieve RAG context
-        rag_context = rag_engine.retrieve_context(user_query)
-        
-        # Gather GitHub data if connected
-        github_data = None
-        if github_client.is_connected():
-            github_data = {
-                'repository_info': github_client.get_repository_info(),
-                'pull_requests': github_client.get_pull_requests(
-                    state='open', limit=5
-                ),
-                'issues': github_client.get_issues(state='open', limit=5)
-            }
-        
-        # Generate response
-        response = gemini_client.generate_response(
-            user_query,
-            rag_context=rag_context,
-            github_data=github_data
+        body, status = async_runtime.run(
+            chat_pipeline.handle(
+                request.get_json(), repository=session.get('github_repo')
+            ),
+            timeout=Config.CHAT_REQUEST_TIMEOUT
         )
-        
-        return jsonify({
-            'response': response,
-            'rag_chunks_used': len(rag_context),
-            'github_data_available': github_data is not None
-        })
+        return jsonify(body), status
         
     except Exception as e:
         logger.error(f"Error processing chat request: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/chat/session/<session_id>', methods=['DELETE'])
+def delete_chat_session(session_id):
+    """Forget a conversation session."""
+    try:
+        if chat_pipeline.conversations.delete(session_id):
+            return jsonify({'success': True, 'message': 'Conversation cleared'})
+        return jsonify({'error': 'Conversation not found'}), 404
+    except Exception as e:
+        logger.error(f"Error deleting conversation: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/upload', methods=['POST'])
 def upload_document():
     """Handle document uploads for RAG."""
@@ -154,6 +231,12 @@ def upload_document():
 def rag_stats():
     """Get RAG database statistics."""
     try:
+        if not components.is_ready('rag_engine'):
+            _, component_states = components.get_status()
+            return jsonify({
+                'error': 'RAG engine is still starting, please retry shortly',
+                'state': component_states['rag_engine']['state']
+            }), 503
         stats = rag_engine.get_stats()
         return jsonify(stats)
     except Exception as e:
@@ -180,7 +263,12 @@ def clear_rag():
 
 @app.route('/api/github/connect', methods=['POST'])
 def connect_github():
-    """Connect to a GitHub repository."""
+    """
+    Connect this session to a GitHub repository.
+    
+    The repository is kept in the shared pool and remembered in the
+    session, so other sessions keep their own repository.
+    """
     try:
         data = request.get_json()
         repo_url = data.get('repo_url', '').strip()
@@ -188,17 +276,20 @@ def connect_github():
         if not repo_url:
             return jsonify({'error': 'Repository URL is required'}), 400
         
-        success = github_client.connect_to_repo(repo_url)
+        try:
+            full_name = github_client.add_repository(repo_url)
+        except Exception as e:
+            logger.error(f"Failed to connect to repository {repo_url}: {e}")
+            return jsonify({'error': 'Failed to connect to repository'}), 500
         
-        if success:
+        session['github_repo'] = full_name
+        with github_client.use_repository(full_name):
             repo_info = github_client.get_repository_info()
-            return jsonify({
-                'success': True,
-                'message': 'Connected to repository',
-                'repo_info': repo_info
-            })
-        else:
-            return jsonify({'error': 'Failed to connect to repository'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Connected to repository',
+            'repo_info': repo_info
+        })
             
     except Exception as e:
         logger.error(f"Error connecting to GitHub: {e}")
@@ -220,6 +311,44 @@ def github_info():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/github/sync', methods=['POST'])
+def sync_repository():
+    """
+    Index the connected repository's markdown and text files into RAG.
+    
+    Runs in the background; only files whose blob SHA changed since the
+    last sync are downloaded and embedded.
+    """
+    try:
+        if not github_client.is_connected():
+            return jsonify({'error': 'Not connected to a repository'}), 404
+        
+        data = request.get_json(silent=True) or {}
+        status = repo_sync.start(ref=data.get('ref') or 'HEAD')
+        if status is None:
+            return jsonify({'error': 'A sync of this repository is already running'}), 409
+        
+        return jsonify(dict(status, status_url='/api/github/sync')), 202
+        
+    except Exception as e:
+        logger.error(f"Error starting repository sync: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/github/sync', methods=['GET'])
+def get_repository_sync():
+    """Get the last sync status of the connected repository."""
+    try:
+        status = repo_sync.get_status()
+        if status is None:
+            return jsonify({'error': 'Repository has not been synced'}), 404
+        return jsonify(status)
+        
+    except Exception as e:
+        logger.error(f"Error getting repository sync status: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/github/workflows', methods=['GET'])
 def list_workflows():
     """List available GitHub Actions workflows."""
@@ -301,15 +430,88 @@ def get_issues():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/github/webhook', methods=['POST'])
+def github_webhook():
+    """Apply GitHub webhook events to the local mirror."""
+    try:
+        if not Config.GITHUB_WEBHOOK_SECRET:
+            return jsonify({'error': 'Webhook secret not configured'}), 503
+        
+        body = request.get_data()
+        if not verify_signature(
+            Config.GITHUB_WEBHOOK_SECRET,
+            body,
+            request.headers.get('X-Hub-Signature-256')
+        ):
+            return jsonify({'error': 'Invalid signature'}), 401
+        
+        event = request.headers.get('X-GitHub-Event', '')
+        if event == 'ping':
+            return jsonify({'success': True, 'message': 'pong'})
+        
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({
+                'error': 'Webhook payload must be JSON (content type application/json)'
+            }), 400
+        
+        applied = github_client.apply_webhook_event(event, payload)
+        return jsonify({'success': True, 'event': event, 'applied': applied})
+        
+    except Exception as e:
+        logger.error(f"Error handling GitHub webhook: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/health', methods=['GET'])
 def health():
-    """Health check endpoint."""
+    """
+    Health check endpoint.
+    
+    Returns 503 until the required components (RAG engine, Gemini) are
+    ready; GitHub is optional and reported without affecting the status.
+    """
+    status, component_states = components.get_status()
     return jsonify({
-        'status': 'healthy',
-        'gemini_connected': True,  # If we got here, Gemini is configured
+        'status': status,
+        'components': component_states,
+        'gemini_connected': components.is_ready('gemini'),
         'github_connected': github_client.is_connected(),
-        'rag_chunks': rag_engine.get_stats().get('total_chunks', 0)
-    })
+        'rag_chunks': (
+            rag_engine.get_stats().get('total_chunks', 0)
+            if components.is_ready('rag_engine') else None
+        )
+    }), 200 if status == 'healthy' else 503
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Get runtime metrics for the chat pipeline."""
+    try:
+        return jsonify({
+            'chat': chat_pipeline.get_stats(),
+            'conversations': chat_pipeline.conversations.get_stats(),
+            'async_runtime': async_runtime.get_stats(),
+            'model_routes': (
+                gemini_client.get_route_stats()
+                if components.is_ready('gemini') else None
+            ),
+            'gemini': (
+                gemini_client.get_resilience_stats()
+                if components.is_ready('gemini') else None
+            ),
+            'github_cache': github_client.get_cache_stats(),
+            'github_repositories': github_client.get_pool_stats(),
+            'github_index': github_index.get_stats(),
+            'github_digest': github_digest.get_stats(),
+            'github_mirror': github_client.get_mirror_stats(),
+            'github_rate_limit': github_client.get_rate_limit_stats(),
+            'workflow_dispatches': workflow_dispatches.get_stats(),
+            'artifact_watcher': artifact_watcher.get_stats()
+        })
+    except Exception as e:
+        logger.error(f"Error getting metrics: {e}")
+        return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/prompts/templates', methods=['GET'])
@@ -352,32 +554,60 @@ def update_prompt():
     Request JSON:
         - template: Template name to use (optional)
         - custom_prompt: Custom prompt text (optional)
+        - temperature: Sampling temperature (optional)
+        - max_output_tokens: Maximum response length (optional)
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
         template = data.get('template')
         custom_prompt = data.get('custom_prompt')
+        temperature = data.get('temperature')
+        max_output_tokens = data.get('max_output_tokens')
+        
+        # Validate everything before touching Config, so a bad value
+        # leaves the current prompt and settings in place
+        if temperature is not None:
+            try:
+                temperature = float(temperature)
+            except (TypeError, ValueError):
+                return jsonify({'error': 'temperature must be a number'}), 400
+            if not 0 <= temperature <= 2:
+                return jsonify({'error': 'temperature must be between 0 and 2'}), 400
+        if max_output_tokens is not None:
+            try:
+                max_output_tokens = int(max_output_tokens)
+            except (TypeError, ValueError):
+                return jsonify({'error': 'max_output_tokens must be an integer'}), 400
+            if max_output_tokens <= 0:
+                return jsonify({'error': 'max_output_tokens must be positive'}), 400
+        if not custom_prompt and (not isinstance(template, str)
+                                  or template not in Config.SYSTEM_PROMPTS):
+            return jsonify({'error': 'Invalid template or prompt'}), 400
         
         if custom_prompt:
             # Use custom prompt
             Config.CUSTOM_SYSTEM_PROMPT = custom_prompt
             Config.SYSTEM_PROMPT_TEMPLATE = 'custom'
             logger.info("Updated to custom system prompt")
-        elif template and template in Config.SYSTEM_PROMPTS:
+        else:
             # Use template
             Config.CUSTOM_SYSTEM_PROMPT = ''
             Config.SYSTEM_PROMPT_TEMPLATE = template
             logger.info(f"Updated to '{template}' template")
-        else:
-            return jsonify({'error': 'Invalid template or prompt'}), 400
         
-        # Re-initialize Gemini client with new prompt
-        global gemini_client
-        gemini_client = GeminiClient()
+        # Swap the prompt on the live client (no re-initialization)
+        settings = gemini_client.update_settings(
+            system_prompt=Config.get_system_prompt(),
+            temperature=temperature,
+            max_output_tokens=max_output_tokens
+        )
         
         return jsonify({
             'success': True,
             'message': 'System prompt updated successfully',
+            'generation_config': settings.generation_config,
             'current_prompt': Config.get_system_prompt(),
             'template': Config.SYSTEM_PROMPT_TEMPLATE
         })
@@ -393,9 +623,8 @@ def reset_prompt():
         Config.CUSTOM_SYSTEM_PROMPT = ''
         Config.SYSTEM_PROMPT_TEMPLATE = 'default'
         
-        # Re-initialize Gemini client
-        global gemini_client
-        gemini_client = GeminiClient()
+        # Swap the prompt on the live client
+        gemini_client.update_settings(system_prompt=Config.get_system_prompt())
         
         logger.info("Reset system prompt to default")
         
@@ -593,6 +822,7 @@ def download_file(filename):
             as_attachment=True,
             download_name=filename,
             mimetype=(
+                'application/zip' if filename.endswith('.zip') else
                 'application/vnd.openxmlformats-'
                 'officedocument.wordprocessingml.document'
             )
@@ -653,42 +883,197 @@ def cleanup_reports():
 @app.route('/api/github/process-analysis/trigger', methods=['POST'])
 def trigger_process_analysis_workflow():
     """
-    Trigger GitHub Actions workflow for process analysis.
+    Generate a process analysis report, locally or via GitHub Actions.
     
     Request JSON:
         - process_name: Name of the process
         - process_data: Data for analysis
         - analysis_type: Type of analysis (optional)
+        - executor: 'github' to run the workflow (default, keeps the
+          dispatch_id response for existing clients), or 'local' to build
+          the report in-process
         
     Returns:
-        JSON with workflow run information
+        JSON with the generated file (local), or a pending dispatch handle
+        whose status_url gives the run ID (github)
     """
     try:
-        if not github_client.is_connected():
-            return jsonify({'error': 'GitHub not connected'}), 400
-        
         data = request.get_json()
         process_name = data.get('process_name', 'Process Analysis')
         process_data = data.get('process_data', '')
         analysis_type = data.get('analysis_type', 'standard')
+        executor = data.get('executor') or 'github'
+        
+        if executor == 'local':
+            filename = create_process_analysis_report(
+                process_name, process_data, analysis_type
+            )
+            return jsonify({
+                'success': True,
+                'executor': 'local',
+                'filename': filename,
+                'download_url': f'/api/download/{filename}',
+                'message': 'Report generated'
+            })
         
-        # Trigger the workflow
-        run_info = github_client.trigger_process_workflow(
-            process_name, process_data, analysis_type
+        if executor != 'github':
+            return jsonify({'error': f"Unknown executor: {executor}"}), 400
+        
+        if not github_client.is_connected():
+            return jsonify({'error': 'GitHub not connected'}), 400
+        
+        workflow_file = 'process-analysis-doc.yml'
+        
+        dispatch = workflow_dispatches.register(
+            workflow_file, process_name=process_name
         )
         
+        # Trigger the workflow; the run ID is resolved in the background
+        try:
+            github_client.trigger_process_workflow(
+                process_name, process_data, analysis_type, workflow_file,
+                correlation_id=dispatch['dispatch_id']
+            )
+        except Exception:
+            workflow_dispatches.discard(dispatch['dispatch_id'])
+            raise
+        workflow_dispatches.start(dispatch['dispatch_id'])
+        
         return jsonify({
             'success': True,
-            'run_id': run_info.get('run_id'),
-            'workflow_name': run_info.get('workflow_name'),
+            'executor': 'github',
+            'dispatch_id': dispatch['dispatch_id'],
+            'status': dispatch['status'],
+            'status_url': f"/api/github/dispatch/{dispatch['dispatch_id']}",
+            'run_id': None,
             'message': 'Workflow triggered successfully'
-        })
+        }), 202
         
     except Exception as e:
         logger.error(f"Error triggering SOX workflow: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/github/process-analysis/batch', methods=['POST'])
+def start_process_analysis_batch():
+    """
+    Generate many process analysis reports in one batch.
+    
+    Runs in the background: workflow dispatches are throttled
+    (BATCH_DISPATCH_CONCURRENCY, BATCH_DISPATCH_INTERVAL) and every run is
+    tracked until its report is downloaded; the reports are then bundled
+    into one zip.
+    
+    Request JSON:
+        - items: List of {process_name, process_data, analysis_type}
+        - executor: 'local' or 'github' (optional, defaults to
+          PROCESS_REPORT_EXECUTOR)
+        
+    Returns:
+        JSON batch handle; poll its status_url for per-item status
+    """
+    try:
+        data = request.get_json() or {}
+        items = data.get('items') or []
+        executor = data.get('executor') or Config.PROCESS_REPORT_EXECUTOR
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'items must be a non-empty list'}), 400
+        if len(items) > Config.BATCH_MAX_ITEMS:
+            return jsonify({'error': f'At most {Config.BATCH_MAX_ITEMS} items per batch'}), 400
+        if executor not in ('local', 'github'):
+            return jsonify({'error': f"Unknown executor: {executor}"}), 400
+        if executor == 'github' and not github_client.is_connected():
+            return jsonify({'error': 'GitHub not connected'}), 400
+        
+        batch = batch_runner.submit(items, executor)
+        return jsonify(dict(
+            batch,
+            status_url=f"/api/github/process-analysis/batch/{batch['batch_id']}"
+        )), 202
+        
+    except Exception as e:
+        logger.error(f"Error starting report batch: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/github/process-analysis/batch/<batch_id>', methods=['GET'])
+def get_process_analysis_batch(batch_id):
+    """Get a report batch's per-item status, wall time and bundle link."""
+    try:
+        batch = batch_runner.get(batch_id)
+        if batch is None:
+            return jsonify({'error': 'Batch not found'}), 404
+        return jsonify(batch)
+        
+    except Exception as e:
+        logger.error(f"Error getting report batch: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/github/workflows/stats', methods=['GET'])
+def workflow_stats():
+    """
+    Get duration, queue time and failure statistics per workflow.
+    
+    When the stored history is older than WORKFLOW_HISTORY_REFRESH, new
+    runs are collected in the background and the stored statistics are
+    returned meanwhile ('collecting' is true until the collection ends).
+    
+    Query parameters:
+        days: Window of run history to analyse (default 30)
+    """
+    try:
+        if not github_client.is_connected():
+            return jsonify({'error': 'Not connected to a repository'}), 404
+        
+        days = request.args.get('days', 30, type=int)
+        repo = github_client.full_name
+        
+        if workflow_history.is_stale(repo):
+            workflow_history.start_collect(github_client)
+        
+        return jsonify(dict(
+            workflow_history.get_collection_info(repo),
+            repository=repo,
+            days=days,
+            workflows=workflow_history.get_stats(repo, days=days)
+        ))
+        
+    except Exception as e:
+        logger.error(f"Error getting workflow stats: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/github/dispatch/<dispatch_id>', methods=['GET'])
+def get_workflow_dispatch(dispatch_id):
+    """Get the status and resolved run ID of a workflow dispatch."""
+    try:
+        dispatch = workflow_dispatches.get(dispatch_id)
+        if dispatch is None:
+            return jsonify({'error': 'Dispatch not found'}), 404
+        return jsonify(dispatch)
+        
+    except Exception as e:
+        logger.error(f"Error getting workflow dispatch: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+def run_artifact_name(run_id):
+    """
+    Name of the artifact a workflow run uploads.
+    
+    Taken from the dispatch the run was resolved to, then from the
+    'artifact' query parameter, defaulting to the process report workflow's
+    artifact.
+    """
+    return (
+        workflow_dispatches.artifact_name_for_run(run_id)
+        or request.args.get('artifact')
+        or WORKFLOW_ARTIFACTS['process-analysis-doc.yml']
+    )
+
+
 @app.route('/api/github/artifacts/check/<int:run_id>', methods=['GET'])
 def check_workflow_artifacts(run_id):
     """
@@ -704,10 +1089,8 @@ def check_workflow_artifacts(run_id):
         if not github_client.is_connected():
             return jsonify({'error': 'GitHub not connected'}), 400
         
-        # Check for artifacts and download if available
-        result = github_client.check_and_download_artifact(
-            run_id, 'sox-report'
-        )
+        # Answered from the watcher's cache once the artifact is downloaded
+        result = artifact_watcher.check(run_id, run_artifact_name(run_id))
         
         return jsonify(result)
         
@@ -716,6 +1099,45 @@ def check_workflow_artifacts(run_id):
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/github/artifacts/events/<int:run_id>', methods=['GET'])
+def workflow_artifact_events(run_id):
+    """
+    Stream artifact status events for a workflow run (Server-Sent Events).
+    
+    Args:
+        run_id: GitHub Actions workflow run ID
+        
+    Returns:
+        text/event-stream; the event with "final": true is the last one
+    """
+    if not github_client.is_connected():
+        return jsonify({'error': 'GitHub not connected'}), 400
+    
+    artifact_name = run_artifact_name(run_id)
+    events = artifact_watcher.subscribe(run_id, artifact_name)
+    
+    def stream():
+        try:
+            while True:
+                try:
+                    event = events.get(timeout=15)
+                except queue.Empty:
+                    # Keep proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
+                if event.get('final'):
+                    return
+        finally:
+            artifact_watcher.unsubscribe(run_id, artifact_name, events)
+    
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 # ============================================
 # MLOps-Specific Endpoints (Isolated Section)
 # ============================================
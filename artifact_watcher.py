@@ -0,0 +1,261 @@
+"""
+Background watcher for workflow run artifacts.
+Checks pending runs with exponential backoff, downloads each run's artifact
+exactly once, caches the outcome by run ID and artifact name and pushes
+completion to subscribers (Server-Sent Events on the settings page).
+"""
+import queue
+import threading
+import time
+from logger import logger
+from config import Config
+from github_rate_limit import github_priority, BACKGROUND
+
+# Run states that mean "check again later"
+IN_PROGRESS_STATES = {
+    'queued', 'in_progress', 'waiting', 'requested', 'pending', 'rate_limited'
+}
+
+
+def is_final(result):
+    """
+    Decide whether an artifact check result is final.
+
+    Args:
+        result: Dictionary returned by GitHubClient.check_and_download_artifact
+
+    Returns:
+        True if checking again cannot change the outcome
+    """
+    if result.get('success') or 'conclusion' in result:
+        return True
+    if 'error' in result:
+        return False  # Transient failure (network, API)
+    return result.get('status') not in IN_PROGRESS_STATES
+
+
+class ArtifactWatcher:
+    """Watches workflow runs until their artifact is downloaded."""
+
+    def __init__(self, github_client):
+        """
+        Initialize the watcher (the thread starts on first watch).
+
+        Args:
+            github_client: GitHubClient used to check and download artifacts
+        """
+        self.github_client = github_client
+        # All keyed by (run ID, artifact name): a lookup under the wrong
+        # name must not decide the outcome for the right one
+        self._results = {}
+        self._watches = {}
+        self._subscribers = {}
+        self._run_locks = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self.stats = {'checks': 0, 'downloads': 0, 'local_answers': 0}
+
+    def check(self, run_id, artifact_name):
+        """
+        Get a run's artifact status.
+
+        Finished runs are answered from the cache; runs already being
+        watched return their last known status without an API call.
+
+        Args:
+            run_id: Workflow run ID
+            artifact_name: Name of the artifact to download
+
+        Returns:
+            Dictionary with status and download information
+        """
+        key = (run_id, artifact_name)
+        with self._lock:
+            result = self._results.get(key) or (
+                self._watches[key]['last'] if key in self._watches else None
+            )
+            if result is not None:
+                self.stats['local_answers'] += 1
+                return result
+
+        result = self._check_run(run_id, artifact_name)
+        if not is_final(result):
+            self.watch(run_id, artifact_name)
+        return result
+
+    def watch(self, run_id, artifact_name):
+        """
+        Start watching a run in the background.
+
+        Args:
+            run_id: Workflow run ID
+            artifact_name: Name of the artifact to download
+        """
+        key = (run_id, artifact_name)
+        with self._lock:
+            if key in self._results or key in self._watches:
+                return
+            self._watches[key] = {
+                'artifact_name': artifact_name,
+                # Checked from the watcher thread, outside the request
+                'repository': self.github_client.full_name,
+                'delay': Config.ARTIFACT_WATCH_INITIAL_DELAY,
+                'next_check': time.monotonic(),
+                'started': time.monotonic(),
+                'last': {'success': False, 'status': 'queued',
+                         'message': 'Waiting for the workflow run...'}
+            }
+            self._ensure_thread()
+            self._wakeup.notify()
+
+    def subscribe(self, run_id, artifact_name):
+        """
+        Subscribe to a run's artifact events.
+
+        Args:
+            run_id: Workflow run ID
+            artifact_name: Name of the artifact to download
+
+        Returns:
+            queue.Queue receiving event dicts; an event with 'final' True
+            is the last one
+        """
+        key = (run_id, artifact_name)
+        events = queue.Queue()
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self._subscribers.setdefault(key, []).append(events)
+        if result is not None:
+            events.put(dict(result, run_id=run_id, final=True))
+        else:
+            self.watch(run_id, artifact_name)
+        return events
+
+    def unsubscribe(self, run_id, artifact_name, events):
+        """Remove a subscriber queue."""
+        key = (run_id, artifact_name)
+        with self._lock:
+            subscribers = self._subscribers.get(key, [])
+            if events in subscribers:
+                subscribers.remove(events)
+            if not subscribers:
+                self._subscribers.pop(key, None)
+
+    def _check_run(self, run_id, artifact_name):
+        """Check one run, downloading its artifact at most once."""
+        key = (run_id, artifact_name)
+        with self._lock:
+            run_lock = self._run_locks.setdefault(key, threading.Lock())
+
+        with run_lock:
+            with self._lock:
+                if key in self._results:
+                    return self._results[key]
+                self.stats['checks'] += 1
+
+            result = self.github_client.check_and_download_artifact(
+                run_id, artifact_name
+            )
+
+            with self._lock:
+                if is_final(result):
+                    if result.get('success'):
+                        self.stats['downloads'] += 1
+                    self._store(key, result)
+            return result
+
+    def _store(self, key, result):
+        """Cache a final result, evicting the oldest beyond the limit."""
+        self._results[key] = result
+        self._run_locks.pop(key, None)
+        while len(self._results) > Config.ARTIFACT_CACHE_MAX_RUNS:
+            self._results.pop(next(iter(self._results)))
+
+    def _publish(self, key, result, final):
+        """Send an event to the subscribers of a (run ID, artifact name)."""
+        run_id = key[0]
+        with self._lock:
+            subscribers = list(self._subscribers.get(key, []))
+            if final:
+                self._subscribers.pop(key, None)
+        for events in subscribers:
+            events.put(dict(result, run_id=run_id, final=final))
+
+    def _ensure_thread(self):
+        """Start the watcher thread if needed (caller holds the lock)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._watch_loop, name='artifact-watcher', daemon=True
+        )
+        self._thread.start()
+
+    def _watch_loop(self):
+        """Check due runs, backing off exponentially while they are pending."""
+        # Every poll (run, artifact list and download) is background work
+        # that must leave the reserved budget to chat
+        with github_priority(BACKGROUND):
+            self._watch()
+
+    def _watch(self):
+        """Body of the watch loop; returns once no runs are watched."""
+        while True:
+            with self._lock:
+                if not self._watches:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                next_due = min(w['next_check'] for w in self._watches.values())
+                if next_due > now:
+                    self._wakeup.wait(next_due - now)
+                    continue
+                due = [
+                    (key, dict(w)) for key, w in self._watches.items()
+                    if w['next_check'] <= now
+                ]
+
+            for key, watch in due:
+                run_id = key[0]
+                try:
+                    with self.github_client.use_repository(watch['repository']):
+                        result = self._check_run(run_id, watch['artifact_name'])
+                except Exception as e:
+                    logger.error(f"Error watching run {run_id}: {e}")
+                    result = {'success': False, 'error': str(e)}
+
+                final = is_final(result)
+                timed_out = (not final and time.monotonic() - watch['started']
+                             > Config.ARTIFACT_WATCH_TIMEOUT)
+                if timed_out:
+                    result = {
+                        'success': False,
+                        'status': 'timeout',
+                        'message': 'Stopped waiting for the workflow run.'
+                    }
+
+                with self._lock:
+                    if final or timed_out:
+                        self._watches.pop(key, None)
+                    else:
+                        current = self._watches[key]
+                        current['last'] = result
+                        current['delay'] = min(
+                            current['delay'] * 2, Config.ARTIFACT_WATCH_MAX_DELAY
+                        )
+                        current['next_check'] = time.monotonic() + current['delay']
+                status_changed = result.get('status') != watch['last'].get('status')
+
+                if final or timed_out or status_changed:
+                    self._publish(key, result, final or timed_out)
+
+    def get_stats(self):
+        """Get watcher statistics."""
+        with self._lock:
+            return dict(
+                self.stats,
+                watching=len(self._watches),
+                cached_runs=len(self._results),
+                subscribers=sum(len(s) for s in self._subscribers.values())
+            )
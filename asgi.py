@@ -0,0 +1,92 @@
+"""
+ASGI entry point.
+Serves /api/chat natively as a coroutine so a single process can hold
+hundreds of chats waiting on Gemini without a thread each. All other
+routes are delegated to the Flask app.
+
+Run with:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+"""
+import json
+from http.cookies import SimpleCookie
+from asgiref.wsgi import WsgiToAsgi
+from itsdangerous import BadSignature
+from app import app, chat_pipeline
+from async_runtime import async_runtime
+from logger import logger
+
+flask_application = WsgiToAsgi(app)
+
+
+async def _read_body(receive):
+    """Read the full HTTP request body."""
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+
+def _session_repository(scope):
+    """Read the repository selected in the caller's Flask session."""
+    cookies = SimpleCookie()
+    for name, value in scope.get('headers', []):
+        if name == b'cookie':
+            cookies.load(value.decode('latin-1'))
+
+    morsel = cookies.get(app.config['SESSION_COOKIE_NAME'])
+    serializer = app.session_interface.get_signing_serializer(app)
+    if morsel is None or serializer is None:
+        return None
+
+    try:
+        data = serializer.loads(
+            morsel.value,
+            max_age=int(app.permanent_session_lifetime.total_seconds())
+        )
+    except BadSignature:
+        return None
+    return data.get('github_repo')
+
+
+async def _send_json(send, payload, status):
+    """Send a JSON response."""
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii'))
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def application(scope, receive, send):
+    """ASGI application: async chat route, Flask for everything else."""
+    if (scope['type'] == 'http'
+            and scope['path'] == '/api/chat'
+            and scope['method'] == 'POST'):
+        try:
+            payload = json.loads(await _read_body(receive) or b'{}')
+        except ValueError:
+            await _send_json(send, {'error': 'Invalid JSON body'}, 400)
+            return
+
+        try:
+            body, status = await async_runtime.run_async(
+                chat_pipeline.handle(
+                    payload, repository=_session_repository(scope)
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error processing chat request: {e}")
+            body, status = {'error': str(e)}, 500
+
+        await _send_json(send, body, status)
+        return
+
+    await flask_application(scope, receive, send)
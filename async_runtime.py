@@ -0,0 +1,152 @@
+"""
+Shared asyncio runtime for I/O-bound model calls.
+Runs one background event loop that owns every async Gemini call and the
+semaphore bounding how many are in flight at once. Blocking calls made with
+asyncio.to_thread share one bounded worker pool.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logger import logger
+from config import Config
+
+
+class AsyncRuntime:
+    """Background event loop with a bounded number of in-flight model calls."""
+
+    def __init__(self, max_concurrency=None, max_workers=None):
+        """
+        Initialize the runtime (the loop thread starts on first use).
+
+        Args:
+            max_concurrency: Maximum concurrent model calls
+                (defaults to Config.GEMINI_MAX_CONCURRENCY)
+            max_workers: Worker threads for blocking calls
+                (defaults to Config.ASYNC_RUNTIME_WORKERS)
+        """
+        self.max_concurrency = max_concurrency or Config.GEMINI_MAX_CONCURRENCY
+        self.max_workers = max_workers or Config.ASYNC_RUNTIME_WORKERS
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._start_lock = threading.Lock()
+        self.in_flight = 0
+
+    def _ensure_started(self):
+        """Start the event loop thread if it is not running yet."""
+        if self._loop is not None:
+            return
+
+        with self._start_lock:
+            if self._loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            loop.set_default_executor(ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='async-runtime-io'
+            ))
+            thread = threading.Thread(
+                target=self._run_loop,
+                args=(loop,),
+                name='async-runtime',
+                daemon=True
+            )
+            thread.start()
+            self._thread = thread
+            self._loop = loop
+            logger.info(
+                f"Async runtime started (max {self.max_concurrency} "
+                f"concurrent model calls, {self.max_workers} I/O workers)"
+            )
+
+    def _run_loop(self, loop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    @property
+    def loop(self):
+        """The runtime's event loop."""
+        self._ensure_started()
+        return self._loop
+
+    def model_slot(self):
+        """
+        Semaphore bounding in-flight model calls.
+
+        Must be used from coroutines running on this runtime's loop.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def call_model(self, coro_factory):
+        """
+        Run a model call while holding a concurrency slot.
+
+        Args:
+            coro_factory: Zero-argument callable returning the coroutine
+
+        Returns:
+            The coroutine's result
+        """
+        async with self.model_slot():
+            self.in_flight += 1
+            try:
+                return await coro_factory()
+            finally:
+                self.in_flight -= 1
+
+    def submit(self, coro):
+        """
+        Schedule a coroutine on the runtime loop.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """
+        Run a coroutine on the runtime loop and wait for its result.
+
+        Used by synchronous (WSGI) request handlers.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            The coroutine's result
+        """
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro):
+        """
+        Await a coroutine on the runtime loop from another event loop.
+
+        Used by ASGI handlers, which wait without holding a thread.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def get_stats(self):
+        """Get runtime statistics."""
+        return {
+            'running': self._loop is not None,
+            'max_concurrency': self.max_concurrency,
+            'io_workers': self.max_workers,
+            'in_flight_model_calls': self.in_flight
+        }
+
+
+# Shared runtime used by the chat pipeline
+async_runtime = AsyncRuntime()
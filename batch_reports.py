@@ -0,0 +1,275 @@
+"""
+Batch generation of process analysis reports.
+A batch runs in one background thread: reports are generated locally, or
+dispatched to the process analysis workflow with bounded concurrency and a
+minimum interval between dispatches, then tracked until every artifact is
+downloaded. Finished reports are collected into one zip bundle.
+"""
+import os
+import queue
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logger import logger
+from config import Config
+from github_rate_limit import github_priority, BACKGROUND
+from workflow_dispatch import WORKFLOW_ARTIFACTS
+from word_generator import create_process_analysis_report
+
+WORKFLOW_FILE = 'process-analysis-doc.yml'
+ARTIFACT_NAME = WORKFLOW_ARTIFACTS[WORKFLOW_FILE]
+
+# Item states
+QUEUED = 'queued'
+DISPATCHED = 'dispatched'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+FINAL_STATES = (COMPLETED, FAILED)
+
+
+class BatchRunner:
+    """Runs batches of process analysis reports and tracks their items."""
+
+    def __init__(self, github_client, dispatch_tracker, artifact_watcher):
+        """
+        Initialize the runner.
+
+        Args:
+            github_client: GitHubClient used to dispatch workflows
+            dispatch_tracker: DispatchTracker resolving dispatches to runs
+            artifact_watcher: ArtifactWatcher downloading run artifacts
+        """
+        self.github_client = github_client
+        self.dispatch_tracker = dispatch_tracker
+        self.artifact_watcher = artifact_watcher
+        self._batches = {}
+        self._lock = threading.Lock()
+        self._throttle_lock = threading.Lock()
+        self._next_dispatch = 0.0
+
+    def submit(self, items, executor=None):
+        """
+        Start a batch in the background.
+
+        Args:
+            items: List of dicts with process_name, process_data and
+                optional analysis_type
+            executor: 'local' or 'github' (defaults to
+                Config.PROCESS_REPORT_EXECUTOR)
+
+        Returns:
+            Batch status dict
+        """
+        executor = executor or Config.PROCESS_REPORT_EXECUTOR
+        batch = {
+            'batch_id': uuid.uuid4().hex,
+            'executor': executor,
+            'repository': self.github_client.full_name,
+            'state': RUNNING,
+            'started_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'wall_seconds': None,
+            'bundle': None,
+            'download_url': None,
+            'items': [
+                {
+                    'index': i,
+                    'process_name': item.get('process_name') or 'Process Analysis',
+                    'process_data': item.get('process_data', ''),
+                    'analysis_type': item.get('analysis_type') or 'standard',
+                    'status': QUEUED,
+                    'dispatch_id': None,
+                    'run_id': None,
+                    'filename': None,
+                    'error': None
+                }
+                for i, item in enumerate(items)
+            ],
+            '_started': time.monotonic()
+        }
+        with self._lock:
+            self._prune()
+            self._batches[batch['batch_id']] = batch
+
+        threading.Thread(
+            target=self._run,
+            args=(batch,),
+            name=f"report-batch-{batch['batch_id'][:8]}",
+            daemon=True
+        ).start()
+        return self.get(batch['batch_id'])
+
+    def get(self, batch_id):
+        """
+        Get a batch's status with per-item status and counts.
+
+        Returns:
+            Batch dict, or None if unknown
+        """
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            status = {k: v for k, v in batch.items() if not k.startswith('_')}
+            status['items'] = [
+                {k: v for k, v in item.items() if k != 'process_data'}
+                for item in batch['items']
+            ]
+        counts = {}
+        for item in status['items']:
+            counts[item['status']] = counts.get(item['status'], 0) + 1
+        status['counts'] = counts
+        return status
+
+    def _update(self, item, **fields):
+        with self._lock:
+            item.update(fields)
+
+    def _prune(self):
+        """Drop finished batches older than the retention window."""
+        cutoff = time.monotonic() - Config.BATCH_RETENTION
+        for batch_id, batch in list(self._batches.items()):
+            if batch['state'] != RUNNING and batch['_started'] < cutoff:
+                del self._batches[batch_id]
+
+    def _run(self, batch):
+        """Generate or dispatch every item, track them and bundle the reports."""
+        try:
+            if batch['executor'] == 'local':
+                self._run_local(batch)
+            else:
+                with github_priority(BACKGROUND), \
+                        self.github_client.use_repository(batch['repository']):
+                    self._run_github(batch)
+            self._bundle(batch)
+        except Exception as e:
+            logger.error(f"Report batch {batch['batch_id']} failed: {e}")
+            for item in batch['items']:
+                if item['status'] not in FINAL_STATES:
+                    self._update(item, status=FAILED, error=str(e))
+
+        with self._lock:
+            batch['state'] = COMPLETED
+            batch['finished_at'] = datetime.now().isoformat()
+            batch['wall_seconds'] = round(time.monotonic() - batch['_started'], 2)
+        logger.info(f"Report batch {batch['batch_id']} finished in {batch['wall_seconds']}s")
+
+    def _run_local(self, batch):
+        """Generate every report in-process."""
+        def generate(item):
+            try:
+                # Items may share a process name and finish in the same second
+                filename = create_process_analysis_report(
+                    item['process_name'], item['process_data'], item['analysis_type'],
+                    suffix=f"{batch['batch_id'][:8]}_{item['index'] + 1}"
+                )
+                self._update(item, status=COMPLETED, filename=filename)
+            except Exception as e:
+                self._update(item, status=FAILED, error=str(e))
+
+        with ThreadPoolExecutor(max_workers=Config.BATCH_DISPATCH_CONCURRENCY) as pool:
+            list(pool.map(generate, batch['items']))
+
+    def _run_github(self, batch):
+        """Dispatch every item, then follow each until its artifact arrives."""
+        repository = batch['repository']
+
+        def dispatch(item):
+            # Pool threads do not inherit the batch thread's context
+            with github_priority(BACKGROUND), self.github_client.use_repository(repository):
+                self._dispatch(item)
+
+        with ThreadPoolExecutor(max_workers=Config.BATCH_DISPATCH_CONCURRENCY) as pool:
+            list(pool.map(dispatch, batch['items']))
+
+        subscriptions = {}
+        deadline = time.monotonic() + Config.ARTIFACT_WATCH_TIMEOUT
+        while time.monotonic() < deadline:
+            pending = [i for i in batch['items'] if i['status'] not in FINAL_STATES]
+            if not pending:
+                return
+
+            for item in pending:
+                if item['status'] == DISPATCHED:
+                    handle = self.dispatch_tracker.get(item['dispatch_id'])
+                    if handle is None or handle['status'] == 'unresolved':
+                        self._update(item, status=FAILED, error='Workflow run not found')
+                    elif handle['status'] == 'resolved':
+                        self._update(item, status=RUNNING, run_id=handle['run_id'])
+                        subscriptions[item['index']] = self.artifact_watcher.subscribe(
+                            handle['run_id'], ARTIFACT_NAME
+                        )
+                elif item['status'] == RUNNING:
+                    self._drain(item, subscriptions)
+
+            time.sleep(Config.WORKFLOW_RESOLVE_INTERVAL)
+
+        for item in batch['items']:
+            if item['status'] not in FINAL_STATES:
+                self._update(item, status=FAILED, error='Timed out waiting for the workflow run')
+            if item['index'] in subscriptions:
+                self.artifact_watcher.unsubscribe(
+                    item['run_id'], ARTIFACT_NAME, subscriptions[item['index']]
+                )
+
+    def _dispatch(self, item):
+        """Dispatch one item, spacing dispatches to avoid secondary rate limits."""
+        with self._throttle_lock:
+            wait = self._next_dispatch - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_dispatch = time.monotonic() + Config.BATCH_DISPATCH_INTERVAL
+
+        dispatch = self.dispatch_tracker.register(
+            WORKFLOW_FILE, process_name=item['process_name']
+        )
+        try:
+            self.github_client.trigger_process_workflow(
+                item['process_name'], item['process_data'], item['analysis_type'],
+                WORKFLOW_FILE, correlation_id=dispatch['dispatch_id']
+            )
+        except Exception as e:
+            self.dispatch_tracker.discard(dispatch['dispatch_id'])
+            self._update(item, status=FAILED, error=str(e))
+            return
+        self.dispatch_tracker.start(dispatch['dispatch_id'])
+        self._update(item, status=DISPATCHED, dispatch_id=dispatch['dispatch_id'])
+
+    def _drain(self, item, subscriptions):
+        """Apply any artifact events received for a running item."""
+        events = subscriptions[item['index']]
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                return
+            if not event.get('final'):
+                continue
+            if event.get('success'):
+                self._update(item, status=COMPLETED, filename=event['filename'])
+            else:
+                self._update(item, status=FAILED,
+                             error=event.get('error') or event.get('message'))
+            return
+
+    def _bundle(self, batch):
+        """Zip the batch's reports into one download."""
+        filenames = list(dict.fromkeys(
+            i['filename'] for i in batch['items'] if i['status'] == COMPLETED
+        ))
+        if not filenames:
+            return
+
+        bundle = f"Batch_Reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{batch['batch_id'][:8]}.zip"
+        with zipfile.ZipFile(os.path.join('generated_reports', bundle), 'w',
+                             zipfile.ZIP_DEFLATED) as archive:
+            for filename in filenames:
+                archive.write(os.path.join('generated_reports', filename), filename)
+
+        with self._lock:
+            batch['bundle'] = bundle
+            batch['download_url'] = f'/api/download/{bundle}'
@@ -0,0 +1,153 @@
+"""
+Benchmark for query type detection.
+Compares the compiled keyword matcher with the per-call keyword scan it
+replaced, using the real template keywords plus hundreds of synthetic ones,
+and first checks that both score a fixture corpus identically (exit status 1
+if not). Against the old first-match scan the speed gain is small and only
+appears with many keywords; what the compiled matcher mainly buys is full
+scores in one pass, far cheaper than scoring each keyword separately.
+
+Usage:
+    python benchmark_query_classifier.py [synthetic_templates] [keywords_per_template]
+"""
+import random
+import string
+import sys
+import timeit
+from query_classifier import QueryClassifier
+
+# Silence classifier info logging during the benchmark
+import logging
+logging.getLogger('rag_chatbot').setLevel(logging.WARNING)
+
+
+def naive_detect(query, keywords_by_type):
+    """Previous approach: scan every keyword list for every query."""
+    query_lower = query.lower()
+    for template_type, keywords in keywords_by_type.items():
+        if any(keyword in query_lower for keyword in keywords):
+            return template_type
+    return 'generic'
+
+
+def naive_scores(query, keywords_by_type):
+    """Reference scoring: count every occurrence of every keyword."""
+    query_lower = query.lower()
+    scores = {}
+    for template_type, keywords in keywords_by_type.items():
+        for keyword in set(k.strip().lower() for k in keywords):
+            if not keyword:
+                continue
+            start = query_lower.find(keyword)
+            while start != -1:
+                weight = keyword.count(' ') + 1
+                scores[template_type] = scores.get(template_type, 0) + weight
+                start = query_lower.find(keyword, start + 1)
+    return scores
+
+
+# Overlapping, nested and repeated keywords
+FIXTURES = [
+    "What is the description of this repository?",
+    "Please analyse the SOX control objective for quarterly access reviews",
+    "sox control test and control analysis for the internal control audit",
+    "Model deployment of the model: model training on the dataset",
+    "ML pipeline vs CI/CD pipeline: build, release, then model deployment",
+    "GitHub Actions runs the docker container build; GitLab CI does too",
+    "Compliance compliance COMPLIANCE",
+    "",
+]
+
+
+def check_scores(classifier, keywords_by_type, queries):
+    """Return the queries whose compiled scores differ from the reference."""
+    return [
+        query for query in queries
+        if classifier.classify(query)[1] != naive_scores(query, keywords_by_type)
+    ]
+
+
+def random_word(rng, length=8):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def build_keywords(base_keywords, extra_templates, per_template, rng):
+    """Extend the real template keywords with synthetic domain templates."""
+    keywords_by_type = {k: list(v) for k, v in base_keywords.items()}
+    for i in range(extra_templates):
+        keywords_by_type[f'domain_{i}'] = [
+            ' '.join(random_word(rng) for _ in range(rng.randint(1, 3)))
+            for _ in range(per_template)
+        ]
+    return keywords_by_type
+
+
+def main():
+    extra_templates = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    per_template = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    rng = random.Random(42)
+
+    base = QueryClassifier.from_templates_file()
+    base_keywords = {}
+    for keyword, types in base._keyword_types.items():
+        for template_type in types:
+            base_keywords.setdefault(template_type, []).append(keyword)
+
+    keywords_by_type = build_keywords(
+        base_keywords, extra_templates, per_template, rng
+    )
+    total_keywords = sum(len(v) for v in keywords_by_type.values())
+    classifier = QueryClassifier(keywords_by_type)
+
+    mismatches = check_scores(classifier, keywords_by_type, FIXTURES)
+    for query in mismatches:
+        print(f"Score mismatch for {query!r}:")
+        print(f"  compiled:  {classifier.classify(query)[1]}")
+        print(f"  reference: {naive_scores(query, keywords_by_type)}")
+    if mismatches:
+        return 1
+    print(f"Scores match the reference scan on {len(FIXTURES)} fixture queries")
+
+    queries = [
+        "What is the description of this repository?",
+        "Summarise the open pull requests and anything blocking the release",
+        "Please analyse the SOX control objective for quarterly access reviews",
+        "How should we document hyperparameter tuning for the churn model?",
+        "Explain how the GitHub Actions pipeline builds the docker image",
+    ] * 20
+
+    runs = 20
+    naive_time = timeit.timeit(
+        lambda: [naive_detect(q, keywords_by_type) for q in queries],
+        number=runs
+    )
+    scoring_time = timeit.timeit(
+        lambda: [naive_scores(q, keywords_by_type) for q in queries],
+        number=runs
+    )
+    compiled_time = timeit.timeit(
+        lambda: [classifier.detect(q) for q in queries],
+        number=runs
+    )
+    calls = runs * len(queries)
+
+    print("=" * 60)
+    print("QUERY CLASSIFIER BENCHMARK")
+    print("=" * 60)
+    print(f"Templates: {len(keywords_by_type)}  Keywords: {total_keywords}")
+    print(f"Queries timed: {calls}")
+    print()
+    print(f"Per-call keyword scan: {naive_time / calls * 1e6:8.2f} us/query (first match only)")
+    print(f"Per-keyword scoring:   {scoring_time / calls * 1e6:8.2f} us/query")
+    print(f"Compiled matcher:      {compiled_time / calls * 1e6:8.2f} us/query")
+    print()
+    sample = queries[2]
+    best, scores, matches = classifier.classify(sample)
+    print(f"Sample: {sample!r}")
+    print(f"  -> {best} {scores}")
+    for match in matches:
+        print(f"     {match['keyword']!r} at {match['start']}-{match['end']}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
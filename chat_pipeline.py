@@ -0,0 +1,453 @@
+"""
+Async chat pipeline.
+Combines RAG retrieval, GitHub data and Gemini generation for /api/chat.
+Shared by the Flask view and the ASGI entry point.
+"""
+import asyncio
+import re
+import time
+from logger import logger
+from config import Config
+from conversation_store import ConversationStore, SESSION_ID_PATTERN
+from github_digest import INDEXED_SECTIONS, join_sections
+from latency_stats import LatencyTracker
+
+
+class ChatPipeline:
+    """Runs chat requests as coroutines on the shared async runtime."""
+
+    def __init__(self, rag_engine, gemini_client, github_client, github_index=None,
+                 github_digest=None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            rag_engine: RAGEngine instance
+            gemini_client: GeminiClient instance
+            github_client: GitHubClient instance
+            github_index: Optional GitHubIndex; once a repository is indexed,
+                relevant issues and PRs are retrieved from it instead of
+                fetching the latest ones from GitHub
+            github_digest: Optional GitHubDigest; once a repository has a
+                digest, it replaces the per-request GitHub fetches
+        """
+        self.rag_engine = rag_engine
+        self.gemini_client = gemini_client
+        self.github_client = github_client
+        self.github_index = github_index
+        self.github_digest = github_digest
+
+        # Multi-turn sessions (opt-in via 'session_id' in the request)
+        self.conversations = ConversationStore()
+
+        # Single-flight state; only touched from the runtime's event loop
+        self._in_flight = {}
+        self.executed_count = 0
+        self.coalesced_count = 0
+
+        # Context-gathering stages run concurrently, each with a deadline
+        self.stage_latency = {
+            stage: LatencyTracker()
+            for stage in (
+                'rag', 'github', 'repository_info', 'pull_requests', 'issues',
+                'related_items', 'workflows'
+            )
+        }
+        self.stage_timeouts = {stage: 0 for stage in self.stage_latency}
+
+    async def handle(self, payload, repository=None):
+        """
+        Handle a chat request payload.
+
+        Args:
+            payload: Parsed JSON request body
+            repository: Repository (owner/name) selected by the caller's
+                session, or None for the default repository
+
+        Returns:
+            Tuple of (response dict, HTTP status code)
+        """
+        try:
+            user_query = (payload or {}).get('query', '').strip()
+
+            if not user_query:
+                return {'error': 'Query cannot be empty'}, 400
+
+            logger.info(f"Processing chat query: {user_query[:100]}...")
+
+            # Scope GitHub calls to the caller's repository; the context is
+            # copied into the stage threads. Opening a repository that is
+            # not pooled yet is blocking, so do it off the loop first.
+            if repository:
+                try:
+                    await asyncio.to_thread(
+                        self.github_client.add_repository, repository
+                    )
+                except Exception as e:
+                    # Answering from the default repository would be misleading
+                    logger.warning(f"Session repository {repository} is unavailable: {e}")
+                    return {
+                        'error': f"Repository {repository} is unavailable; reconnect "
+                                 f"it or connect another repository",
+                        'repository': repository
+                    }, 400
+            self.github_client.set_request_repository(repository)
+
+            # Optional model tier requested by the caller (e.g. 'fast')
+            route_hint = payload.get('route')
+
+            # A request is conversational when it continues a session or
+            # explicitly starts one ('conversation': true)
+            session_id = payload.get('session_id')
+            if not session_id and payload.get('conversation') is not True:
+                return self._public(await self.run(user_query, route_hint)), 200
+
+            if session_id and not (isinstance(session_id, str)
+                                   and SESSION_ID_PATTERN.match(session_id)):
+                return {'error': 'Invalid session_id'}, 400
+            conversation = self.conversations.get(session_id) if session_id else None
+            if session_id and conversation is None:
+                logger.info(f"Conversation {session_id} expired; starting a new one")
+
+            if conversation is None:
+                # A new conversation has no history yet, so its first turn
+                # can still share an identical in-flight request
+                result = await self.run(user_query, route_hint)
+                conversation = self.conversations.create()
+                self._record_turn(conversation, user_query, result, False)
+                return self._public(result), 200
+
+            # Follow-ups depend on their own history, so they are not
+            # coalesced with other requests
+            result = await self._execute(user_query, route_hint, conversation)
+            return self._public(dict(result, coalesced=False)), 200
+
+        except Exception as e:
+            logger.error(f"Error processing chat request: {e}")
+            return {'error': str(e)}, 500
+
+    async def run(self, user_query, route_hint=None):
+        """
+        Answer a query, coalescing identical concurrent requests.
+
+        Requests with the same normalized query and configuration that
+        arrive while one is in flight wait on that request's result instead
+        of repeating the embedding, ChromaDB, GitHub and Gemini calls.
+
+        Args:
+            user_query: User's question
+            route_hint: Optional model route requested by the caller
+
+        Returns:
+            Chat response dict
+        """
+        key = self._coalesce_key(user_query, route_hint)
+        task = self._in_flight.get(key)
+
+        if task is not None:
+            self.coalesced_count += 1
+            logger.info("Coalesced chat query with an in-flight request")
+            result = await asyncio.shield(task)
+            return dict(result, coalesced=True)
+
+        task = asyncio.ensure_future(self._execute(user_query, route_hint))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        self.executed_count += 1
+
+        result = await asyncio.shield(task)
+        return dict(result, coalesced=False)
+
+    def _coalesce_key(self, user_query, route_hint=None):
+        """
+        Build the single-flight key for a query.
+
+        Args:
+            user_query: User's question
+            route_hint: Optional model route requested by the caller
+
+        Returns:
+            Hashable key of the normalized query and active configuration
+        """
+        normalized = re.sub(r'\s+', ' ', user_query).strip().lower()
+        settings = self.gemini_client.settings
+        return (
+            normalized,
+            settings.system_prompt,
+            tuple(sorted(settings.generation_config.items())),
+            self.github_client.full_name,
+            route_hint
+        )
+
+    def get_stats(self):
+        """Get coalescing and context stage statistics."""
+        total = self.executed_count + self.coalesced_count
+        return {
+            'executed': self.executed_count,
+            'coalesced': self.coalesced_count,
+            'in_flight': len(self._in_flight),
+            'coalesced_ratio': (
+                round(self.coalesced_count / total, 3) if total else 0.0
+            ),
+            'stages': {
+                stage: dict(tracker.get_stats(), timeouts=self.stage_timeouts[stage])
+                for stage, tracker in self.stage_latency.items()
+            }
+        }
+
+    async def _execute(self, user_query, route_hint=None, conversation=None):
+        """
+        Retrieve context and generate a response for a query.
+
+        Args:
+            user_query: User's question
+            route_hint: Optional model route requested by the caller
+            conversation: Conversation session, for multi-turn requests
+
+        Returns:
+            Chat response dict
+        """
+        repository = self.github_client.full_name
+        use_index = (
+            self.github_index is not None
+            and self.github_client.is_connected()
+            and self.github_index.is_ready(repository)
+        )
+        # Repository metadata, open PRs/issues and workflow health are
+        # precomputed in the background; reading them is a dict lookup
+        digest = None
+        if self.github_digest is not None and self.github_client.is_connected():
+            digest = self.github_digest.get(repository)
+
+        query_embedding = None
+        if use_index:
+            # One query embedding serves RAG retrieval and the issue/PR index
+            query_embedding = asyncio.ensure_future(
+                self.rag_engine.embed_query_async(user_query)
+            )
+
+        # RAG retrieval and each GitHub fetch run concurrently; pre-generation
+        # latency is the slowest stage rather than the sum of all of them
+        stages = {
+            'rag': (
+                self._retrieve(user_query, conversation, query_embedding),
+                Config.CHAT_RAG_TIMEOUT
+            )
+        }
+        if use_index:
+            stages['related_items'] = (
+                self._search_github_index(query_embedding, repository),
+                Config.CHAT_RAG_TIMEOUT
+            )
+
+        # Without a digest, repository context is fetched per request
+        if digest is None:
+            if use_index:
+                # Issues and PRs come from the local index; only the (cached)
+                # repository info and workflow runs are read from GitHub
+                stages['repository_info'] = (
+                    asyncio.to_thread(self.github_client.get_repository_info, strict=True),
+                    Config.CHAT_GITHUB_TIMEOUT
+                )
+                stages['workflows'] = (
+                    asyncio.to_thread(
+                        self.github_client.get_workflow_runs,
+                        limit=Config.CHAT_GITHUB_RUN_LIMIT, strict=True
+                    ),
+                    Config.CHAT_GITHUB_TIMEOUT
+                )
+            elif self.github_client.is_connected() and Config.GITHUB_GRAPHQL_ENABLED:
+                # One GraphQL round trip for all repository context
+                stages['github'] = (
+                    asyncio.to_thread(
+                        self.github_client.get_repository_context,
+                        pr_limit=Config.CHAT_GITHUB_PR_LIMIT,
+                        issue_limit=Config.CHAT_GITHUB_ISSUE_LIMIT,
+                        run_limit=Config.CHAT_GITHUB_RUN_LIMIT,
+                        strict=True
+                    ),
+                    Config.CHAT_GITHUB_TIMEOUT
+                )
+            elif self.github_client.is_connected():
+                # Strict getters raise, so a failed fetch is a skipped source
+                # rather than an empty list
+                github_fetches = {
+                    'repository_info': lambda: self.github_client.get_repository_info(
+                        strict=True
+                    ),
+                    'pull_requests': lambda: self.github_client.get_pull_requests(
+                        state='open', limit=Config.CHAT_GITHUB_PR_LIMIT, strict=True
+                    ),
+                    'issues': lambda: self.github_client.get_issues(
+                        state='open', limit=Config.CHAT_GITHUB_ISSUE_LIMIT, strict=True
+                    )
+                }
+                for stage, fetch in github_fetches.items():
+                    stages[stage] = (asyncio.to_thread(fetch), Config.CHAT_GITHUB_TIMEOUT)
+
+        names = list(stages)
+        outcomes = await asyncio.gather(*(
+            self._run_stage(name, coro, timeout)
+            for name, (coro, timeout) in stages.items()
+        ))
+        results = dict(zip(names, outcomes))
+        skipped = [name for name in names if results[name] is None]
+
+        rag_context, retrieval_reused = results['rag'] or ([], False)
+
+        github_data = {}
+        if digest is not None:
+            if results.get('related_items'):
+                # The related items replace the digest's bulk open PR/issue
+                # listings; repository metadata and workflow health stay
+                github_data['digest'] = join_sections(
+                    digest['sections'], omit=INDEXED_SECTIONS
+                )
+                github_data['digest_omitted'] = list(INDEXED_SECTIONS)
+            else:
+                github_data['digest'] = digest['text']
+        for name in names[1:]:
+            if results[name] is None:
+                continue
+            if name == 'github':
+                # Sources whose REST fallback failed come back as None
+                for source, data in results[name].items():
+                    if data is None:
+                        skipped.append(source)
+                    else:
+                        github_data[source] = data
+            else:
+                github_data[name] = results[name]
+        github_data = github_data or None
+
+        # Generate response
+        result = await self.gemini_client.generate_detailed_response_async(
+            user_query,
+            rag_context=rag_context,
+            github_data=github_data,
+            route_hint=route_hint,
+            conversation=(
+                conversation.prompt_context() if conversation is not None else None
+            )
+        )
+
+        response = {
+            'response': result['response'],
+            'rag_chunks_used': len(rag_context),
+            'github_data_available': github_data is not None,
+            'prompt_budget': result['prompt_budget'],
+            'route': result['route'],
+            'degraded': result['degraded'],
+            'hedged': result['hedged'],
+            'truncated': result['truncated'],
+            'skipped_sources': skipped,
+            'github_digest': (
+                {k: v for k, v in digest.items() if k not in ('text', 'sections')}
+                if digest is not None else None
+            )
+        }
+
+        # Kept for recording the turn; removed before the response is returned
+        response['_chunk_ids'] = [chunk['id'] for chunk in rag_context if chunk.get('id')]
+
+        if conversation is not None:
+            self._record_turn(conversation, user_query, response, retrieval_reused)
+
+        return response
+
+    def _record_turn(self, conversation, user_query, response, retrieval_reused):
+        """
+        Add an answered turn to a conversation and tag the response with it.
+
+        Args:
+            conversation: Conversation session
+            user_query: User's question
+            response: Chat response dict (updated in place)
+            retrieval_reused: Whether the chunks came from an earlier turn
+        """
+        # Degraded answers are not real turns and would pollute history
+        if not response['degraded']:
+            conversation.add_turn(
+                user_query, response['response'], response['_chunk_ids'],
+                retrieval_reused
+            )
+        response['session_id'] = conversation.session_id
+        response['retrieval_reused'] = retrieval_reused
+
+    @staticmethod
+    def _public(response):
+        """Drop internal fields from a chat response."""
+        return {k: v for k, v in response.items() if not k.startswith('_')}
+
+    async def _retrieve(self, user_query, conversation=None, query_embedding=None):
+        """
+        Retrieve RAG context for a query.
+
+        Follow-ups on the same topic reuse the previous turn's chunks.
+
+        Args:
+            user_query: User's question
+            conversation: Conversation session, for multi-turn requests
+            query_embedding: Optional future of a shared query embedding
+
+        Returns:
+            Tuple of (context chunks, whether they were reused)
+
+        Raises:
+            Exception: If retrieval fails (_run_stage reports 'rag' as skipped)
+        """
+        chunk_ids = conversation.reusable_chunk_ids(user_query) if conversation else []
+        if chunk_ids:
+            chunks = await asyncio.to_thread(self.rag_engine.get_chunks, chunk_ids)
+            if chunks:
+                return chunks, True
+
+        if query_embedding is not None:
+            # Shielded: a late stage must not cancel the shared embedding
+            query_embedding = await asyncio.shield(query_embedding)
+        return await self.rag_engine.retrieve_context_async(
+            user_query, query_embedding=query_embedding
+        ), False
+
+    async def _search_github_index(self, query_embedding, repository):
+        """
+        Retrieve the issues and PRs most relevant to the query.
+
+        Args:
+            query_embedding: Future of the shared query embedding
+            repository: Repository full name
+
+        Returns:
+            List of related item dicts
+        """
+        embedding = await asyncio.shield(query_embedding)
+        return await self.github_index.search_async(embedding, repository)
+
+    async def _run_stage(self, stage, coro, timeout):
+        """
+        Await one context stage with a deadline.
+
+        Args:
+            stage: Stage name
+            coro: Awaitable producing the stage's data
+            timeout: Seconds to wait before leaving the stage out
+
+        Returns:
+            The stage's result, or None if it was late or failed
+        """
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(coro, timeout)
+            self.stage_latency[stage].record(time.monotonic() - start)
+            return result
+        except asyncio.TimeoutError:
+            self.stage_latency[stage].record(time.monotonic() - start, success=False)
+            self.stage_timeouts[stage] += 1
+            logger.warning(
+                f"Chat stage '{stage}' exceeded {timeout}s; continuing without it"
+            )
+            return None
+        except Exception as e:
+            self.stage_latency[stage].record(time.monotonic() - start, success=False)
+            logger.error(f"Chat stage '{stage}' failed: {e}")
+            return None
@@ -0,0 +1,148 @@
+"""
+HTTP call-count check for GitHub REST listings.
+Serves paginated pull request, issue and workflow run listings from an
+in-memory stub session, and verifies that each GitHubClient listing makes
+only the requests it needs: pages stop as soon as enough items are
+collected, filtered issue listings are not inflated by interleaved
+pull requests, and dispatched run lookups page until the correlation IDs
+they look for are found.
+
+Usage:
+    python check_github_listing_calls.py
+"""
+import sys
+from urllib.parse import parse_qs, urlencode, urlparse
+from github_client import GitHubClient
+from github_http import GitHubHTTP
+
+# Silence client info logging during the check
+import logging
+logging.getLogger('rag_chatbot').setLevel(logging.WARNING)
+
+REPO = 'owner/repo'
+BASE_URL = 'https://stub.github.test'
+
+
+def make_item(number, is_pull_request=False):
+    item = {
+        'number': number,
+        'title': f'Item {number}',
+        'state': 'open',
+        'user': {'login': 'octocat'},
+        'created_at': '2026-01-01T00:00:00Z',
+        'updated_at': '2026-01-01T00:00:00Z',
+        'labels': [],
+        'html_url': f'https://github.com/{REPO}/issues/{number}'
+    }
+    if is_pull_request:
+        item['pull_request'] = {'url': f'https://github.com/{REPO}/pull/{number}'}
+    return item
+
+
+def make_run(run_id):
+    return {
+        'id': run_id,
+        'name': 'CI',
+        'status': 'completed',
+        'conclusion': 'success',
+        'created_at': '2026-01-01T00:00:00Z',
+        'updated_at': '2026-01-01T00:00:00Z',
+        'html_url': f'https://github.com/{REPO}/actions/runs/{run_id}'
+    }
+
+
+# Issues API: two of every three items are pull requests
+LISTINGS = {
+    f'/repos/{REPO}/pulls': [make_item(n, True) for n in range(1, 251)],
+    f'/repos/{REPO}/issues': [make_item(n, n % 3 != 0) for n in range(1, 301)],
+    f'/repos/{REPO}/actions/runs': [make_run(n) for n in range(1, 121)],
+    f'/repos/{REPO}/actions/workflows/dispatch.yml/runs': [
+        dict(make_run(n), display_title=f'Report [dispatch-{n}]') for n in range(250, 0, -1)
+    ],
+}
+
+
+class StubResponse:
+    def __init__(self, body, next_url=None):
+        self.status_code = 200
+        self.headers = {}
+        self.links = {'next': {'url': next_url}} if next_url else {}
+        self._body = body
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        pass
+
+
+class StubSession:
+    """Answers paginated listing requests and records each one."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        parsed = urlparse(url)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        query.update({k: str(v) for k, v in (params or {}).items()})
+        self.requests.append((parsed.path, query))
+
+        items = LISTINGS[parsed.path]
+        per_page = int(query.get('per_page', 30))
+        page = int(query.get('page', 1))
+        chunk = items[(page - 1) * per_page:page * per_page]
+        next_url = None
+        if page * per_page < len(items):
+            next_url = f"{BASE_URL}{parsed.path}?{urlencode(dict(query, page=page + 1))}"
+
+        if parsed.path.endswith('/runs'):
+            body = {'total_count': len(items), 'workflow_runs': chunk}
+        else:
+            body = chunk
+        return StubResponse(body, next_url)
+
+
+def make_client():
+    client = GitHubClient(connect=False)
+    client.mirror = None
+    client.http = GitHubHTTP('stub-token', base_url=BASE_URL, ttl=0)
+    client.http.session = StubSession()
+    client.default_repo = object()
+    client.default_full_name = REPO
+    return client
+
+
+# (description, listing call, expected items, expected HTTP requests)
+CASES = [
+    ('5 open PRs', lambda c: c.get_pull_requests(limit=5), 5, 1),
+    ('150 PRs (two pages)', lambda c: c.get_pull_requests(limit=150), 150, 2),
+    ('all 250 PRs', lambda c: c.get_pull_requests(limit=1000), 250, 3),
+    ('5 issues among interleaved PRs', lambda c: c.get_issues(limit=5), 5, 1),
+    ('33 issues from one full page', lambda c: c.get_issues(limit=33), 33, 1),
+    ('50 issues (two pages)', lambda c: c.get_issues(limit=50), 50, 2),
+    ('3 workflow runs', lambda c: c.get_workflow_runs(limit=3), 3, 1),
+    ('dispatch on the first page',
+     lambda c: c.list_dispatched_runs('dispatch.yml', '2026-01-01T00:00:00Z', ['dispatch-240']), 100, 1),
+    ('dispatch on the third page',
+     lambda c: c.list_dispatched_runs('dispatch.yml', '2026-01-01T00:00:00Z', ['dispatch-240', 'dispatch-30']), 250, 3),
+    ('whole dispatch window',
+     lambda c: c.list_dispatched_runs('dispatch.yml', '2026-01-01T00:00:00Z'), 250, 3),
+]
+
+
+def main():
+    failures = 0
+    for description, listing, expected_items, expected_requests in CASES:
+        client = make_client()
+        items = listing(client)
+        requests_made = len(client.http.session.requests)
+        ok = len(items) == expected_items and requests_made == expected_requests
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {description}: {len(items)} items in "
+              f"{requests_made} request(s) (expected {expected_items} in {expected_requests})")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Parity check for the local process analysis report.
+Runs the report script embedded in .github/workflows/process-analysis-doc.yml
+and word_generator.create_process_analysis_report on the same inputs, and
+compares the document structure (paragraph styles, text, alignment and run
+formatting, header and footer). Timestamps and source labels are ignored.
+
+Usage:
+    python check_report_parity.py
+"""
+import difflib
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import textwrap
+from docx import Document
+
+WORKFLOW_FILE = os.path.join('.github', 'workflows', 'process-analysis-doc.yml')
+LOCAL_SOURCE = 'Local Report Generator'
+INPUTS = {
+    'PROCESS_NAME': 'Quarterly Access Review',
+    'PROCESS_DATA': 'User access lists for 3 systems\nApprovals by system owners',
+    'ANALYSIS_TYPE': 'detailed'
+}
+
+
+def workflow_script():
+    """Extract the Python heredoc of the report generation step."""
+    with open(WORKFLOW_FILE, encoding='utf-8') as f:
+        workflow = f.read()
+    match = re.search(r"python << 'EOF'\n(.*?)\n\s*EOF\n", workflow, re.S)
+    if not match:
+        sys.exit(f"Report script not found in {WORKFLOW_FILE}")
+    return textwrap.dedent(match.group(1))
+
+
+def normalize(text):
+    """Blank out the parts that legitimately differ between the two paths."""
+    text = re.sub(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', '<time>', text)
+    text = re.sub(r'GitHub Actions( Generated| Workflow)?', '<source>', text)
+    return text.replace(LOCAL_SOURCE, '<source>')
+
+
+def describe_paragraph(part, paragraph):
+    runs = ', '.join(
+        f"bold={run.bold} size={run.font.size} "
+        f"color={run.font.color.rgb if run.font.color and run.font.color.type else None}"
+        for run in paragraph.runs
+    )
+    return (f"{part} [{paragraph.style.name}] align={paragraph.alignment} "
+            f"{normalize(paragraph.text)!r} runs: {runs}")
+
+
+def structure(path):
+    """Describe a document as comparable lines."""
+    doc = Document(path)
+    section = doc.sections[0]
+    normal = doc.styles['Normal'].font
+    lines = [f"normal font={normal.name} size={normal.size}"]
+    lines += [describe_paragraph('header', p) for p in section.header.paragraphs]
+    lines += [describe_paragraph('body', p) for p in doc.paragraphs]
+    lines += [describe_paragraph('footer', p) for p in section.footer.paragraphs]
+    return lines
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        subprocess.run(
+            [sys.executable, '-c', workflow_script()],
+            cwd=workdir, env=dict(os.environ, **INPUTS), check=True,
+            stdout=subprocess.DEVNULL
+        )
+        with open(os.path.join(workdir, 'report_filename.txt')) as f:
+            workflow_name = f.read().strip()
+        workflow_lines = structure(os.path.join(workdir, workflow_name))
+
+    from word_generator import create_process_analysis_report
+    local_name = create_process_analysis_report(
+        INPUTS['PROCESS_NAME'], INPUTS['PROCESS_DATA'], INPUTS['ANALYSIS_TYPE'],
+        source=LOCAL_SOURCE
+    )
+    local_path = os.path.join('generated_reports', local_name)
+    try:
+        local_lines = structure(local_path)
+    finally:
+        os.remove(local_path)
+
+    name_pattern = r'_\d{8}_\d{6}\.docx$'
+    if re.sub(name_pattern, '', workflow_name) != re.sub(name_pattern, '', local_name):
+        print(f"Filename mismatch: {workflow_name} vs {local_name}")
+        return 1
+
+    diff = list(difflib.unified_diff(
+        workflow_lines, local_lines, 'workflow', 'local', lineterm=''
+    ))
+    if diff:
+        print('\n'.join(diff))
+        return 1
+    print(f"Local report matches the workflow output ({len(local_lines)} elements compared)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
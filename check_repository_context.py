@@ -0,0 +1,148 @@
+"""
+HTTP call-count and latency check for the chat repository context.
+Serves the GraphQL repository context query and the REST endpoints it
+falls back to from an in-memory stub session with a fixed per-request
+delay, and verifies that GitHubClient.get_repository_context makes a single
+GraphQL request (workflow runs included), that the REST fallback's four
+requests run concurrently (about one delay of wall time, not four), and
+that a GitHubDigest refresh is that same single GraphQL request.
+
+Usage:
+    python check_repository_context.py
+"""
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+from check_github_listing_calls import (
+    REPO, StubResponse, StubSession, make_client
+)
+from github_digest import GitHubDigest
+
+# Silence client logging (the fallback case logs the GraphQL failure)
+import logging
+logging.getLogger('rag_chatbot').setLevel(logging.CRITICAL)
+
+DELAY = 0.2
+LIMITS = {'pr_limit': 5, 'issue_limit': 5, 'run_limit': 3}
+
+REPOSITORY = {
+    'full_name': REPO,
+    'description': 'Stub repository',
+    'stargazers_count': 1,
+    'forks_count': 0,
+    'open_issues_count': 2,
+    'language': 'Python',
+    'created_at': '2026-01-01T00:00:00Z',
+    'updated_at': '2026-01-01T00:00:00Z'
+}
+
+GRAPHQL_REPOSITORY = {
+    'nameWithOwner': REPO,
+    'description': 'Stub repository',
+    'stargazerCount': 1,
+    'forkCount': 0,
+    'primaryLanguage': {'name': 'Python'},
+    'createdAt': '2026-01-01T00:00:00Z',
+    'updatedAt': '2026-01-01T00:00:00Z',
+    'openIssues': {'totalCount': 1},
+    'pullRequests': {'totalCount': 1, 'nodes': []},
+    'issues': {'nodes': []},
+    # Four default-branch commits, each with an Actions run and a check
+    # suite of another app (no workflow run)
+    'defaultBranchRef': {'target': {'history': {'nodes': [
+        {'checkSuites': {'nodes': [
+            {
+                'status': 'COMPLETED', 'conclusion': 'SUCCESS',
+                'createdAt': f'2026-01-0{day}T00:00:00Z',
+                'updatedAt': f'2026-01-0{day}T00:10:00Z',
+                'workflowRun': {
+                    'databaseId': day, 'url': f'https://github.com/{REPO}/actions/runs/{day}',
+                    'workflow': {'name': 'CI'}
+                }
+            },
+            {
+                'status': 'COMPLETED', 'conclusion': 'NEUTRAL',
+                'createdAt': f'2026-01-0{day}T00:00:00Z',
+                'updatedAt': f'2026-01-0{day}T00:00:00Z',
+                'workflowRun': None
+            }
+        ]}}
+        for day in range(4, 0, -1)
+    ]}}}
+}
+
+
+class SlowStubSession(StubSession):
+    """Delays every request and answers GraphQL with data or an error."""
+
+    def __init__(self, graphql_ok):
+        super().__init__()
+        self.graphql_ok = graphql_ok
+        self.graphql_requests = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        time.sleep(DELAY)
+        with self._lock:
+            if urlparse(url).path == f'/repos/{REPO}':
+                self.requests.append((f'/repos/{REPO}', {}))
+                return StubResponse(REPOSITORY)
+            return super().get(url, params=params, headers=headers, timeout=timeout)
+
+    def post(self, url, json=None, timeout=None):
+        time.sleep(DELAY)
+        with self._lock:
+            self.graphql_requests += 1
+        if self.graphql_ok:
+            return StubResponse({'data': {'repository': GRAPHQL_REPOSITORY}})
+        return StubResponse({'errors': [{'message': 'stub failure'}]})
+
+
+def run_case(graphql_ok):
+    client = make_client()
+    client.http.session = SlowStubSession(graphql_ok)
+    started = time.monotonic()
+    context = client.get_repository_context(**LIMITS)
+    elapsed = time.monotonic() - started
+    return client.http.session, context, elapsed
+
+
+def main():
+    failures = 0
+
+    session, context, elapsed = run_case(graphql_ok=True)
+    ok = (session.graphql_requests == 1 and not session.requests
+          and context['repository_info']['name'] == REPO
+          and [run['id'] for run in context['workflows']] == [4, 3, 2])
+    failures += not ok
+    print(f"{'ok  ' if ok else 'FAIL'} GraphQL context: {session.graphql_requests} GraphQL "
+          f"and {len(session.requests)} REST request(s) in {elapsed:.2f}s (expected 1 and 0)")
+
+    session, context, elapsed = run_case(graphql_ok=False)
+    # One delay for the failed GraphQL query, one for the concurrent REST calls
+    ok = (len(session.requests) == 4 and elapsed < DELAY * 3
+          and context['repository_info']['name'] == REPO
+          and len(context['pull_requests']) == LIMITS['pr_limit']
+          and len(context['issues']) == LIMITS['issue_limit']
+          and len(context['workflows']) == LIMITS['run_limit'])
+    failures += not ok
+    print(f"{'ok  ' if ok else 'FAIL'} REST fallback: {len(session.requests)} REST request(s) "
+          f"in {elapsed:.2f}s (expected 4 in under {DELAY * 3:.2f}s)")
+
+    client = make_client()
+    client.github = object()  # Marks the client connected
+    client.http.session = SlowStubSession(graphql_ok=True)
+    text = GitHubDigest(client).refresh()
+    session = client.http.session
+    ok = (session.graphql_requests == 1 and not session.requests
+          and 'Workflow Health (last 4 runs)' in text)
+    failures += not ok
+    print(f"{'ok  ' if ok else 'FAIL'} Digest refresh: {session.graphql_requests} GraphQL "
+          f"and {len(session.requests)} REST request(s) (expected 1 and 0)")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Circuit breaker for calls to an external backend.
+Opens after repeated failures so callers fail fast instead of waiting on
+an unhealthy service, then lets a trial request through after a cool-down.
+"""
+import threading
+import time
+from logger import logger
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Backend name used in log messages
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before allowing a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.rejected_count = 0
+
+    @property
+    def state(self):
+        """Current state, moving from open to half-open once cooled down."""
+        with self._lock:
+            if (self._state == self.OPEN
+                    and time.monotonic() - self._opened_at >= self.reset_timeout):
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            return self._state
+
+    def allow_request(self):
+        """
+        Check whether a call may be attempted.
+
+        Returns:
+            True if the call should go ahead, False to fail fast
+        """
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected_count += 1
+            return False
+
+    def record_success(self):
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit if needed."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if (self._state == self.HALF_OPEN
+                    or self._failures >= self.failure_threshold):
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"Circuit for {self.name} opened after "
+                        f"{self._failures} failure(s)"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def get_stats(self):
+        """Get breaker statistics."""
+        return {
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'rejected': self.rejected_count
+        }
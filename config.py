@@ -19,6 +19,106 @@ class Config:
     # GitHub Configuration
     GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
     GITHUB_REPO_URL = os.getenv('GITHUB_REPO_URL', '')
+    GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+    GITHUB_GRAPHQL_URL = os.getenv(
+        'GITHUB_GRAPHQL_URL', 'https://api.github.com/graphql'
+    )
+    # Fetch chat repository context with one GraphQL query instead of
+    # separate REST calls
+    GITHUB_GRAPHQL_ENABLED = os.getenv(
+        'GITHUB_GRAPHQL_ENABLED', 'true'
+    ).lower() == 'true'
+    # Seconds a cached GitHub response is used without any request;
+    # after that it is revalidated with a conditional request
+    GITHUB_CACHE_TTL = float(os.getenv('GITHUB_CACHE_TTL', '60'))
+    GITHUB_CACHE_MAX_ENTRIES = 256
+    GITHUB_MAX_PER_PAGE = 100  # Largest page size the REST API allows
+    GITHUB_HTTP_POOL_SIZE = int(os.getenv('GITHUB_HTTP_POOL_SIZE', '10'))
+    # Repositories kept connected for per-session repository selection
+    GITHUB_REPO_POOL_SIZE = int(os.getenv('GITHUB_REPO_POOL_SIZE', '16'))
+    ARTIFACT_CHUNK_SIZE = 1024 * 1024  # Bytes buffered per download chunk
+    ARTIFACT_DOWNLOAD_RETRIES = int(os.getenv('ARTIFACT_DOWNLOAD_RETRIES', '3'))
+    # Requests held back for interactive (chat) calls; background work
+    # waits for the rate-limit window to reset once the budget reaches it
+    GITHUB_RATE_LIMIT_RESERVE = int(os.getenv('GITHUB_RATE_LIMIT_RESERVE', '500'))
+    GITHUB_BACKGROUND_MAX_WAIT = float(os.getenv('GITHUB_BACKGROUND_MAX_WAIT', '300'))
+    
+    # Where batch process analysis reports are built: 'local' (in-process)
+    # or 'github' (process-analysis-doc.yml, for an Actions audit trail)
+    PROCESS_REPORT_EXECUTOR = os.getenv('PROCESS_REPORT_EXECUTOR', 'local')
+    # Batch reports: parallel dispatches, minimum seconds between workflow
+    # dispatches (avoids GitHub's secondary rate limits) and batch size cap
+    BATCH_DISPATCH_CONCURRENCY = int(os.getenv('BATCH_DISPATCH_CONCURRENCY', '4'))
+    BATCH_DISPATCH_INTERVAL = float(os.getenv('BATCH_DISPATCH_INTERVAL', '1'))
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '100'))
+    BATCH_RETENTION = 86400  # Seconds finished batches are kept
+    
+    # Workflow Dispatch Configuration
+    WORKFLOW_RESOLVE_INTERVAL = float(os.getenv('WORKFLOW_RESOLVE_INTERVAL', '3'))
+    WORKFLOW_RESOLVE_TIMEOUT = float(os.getenv('WORKFLOW_RESOLVE_TIMEOUT', '180'))
+    WORKFLOW_DISPATCH_RETENTION = 3600  # Seconds finished dispatches are kept
+    
+    # Artifact Watcher Configuration
+    ARTIFACT_WATCH_INITIAL_DELAY = float(os.getenv('ARTIFACT_WATCH_INITIAL_DELAY', '5'))
+    ARTIFACT_WATCH_MAX_DELAY = float(os.getenv('ARTIFACT_WATCH_MAX_DELAY', '60'))
+    ARTIFACT_WATCH_TIMEOUT = float(os.getenv('ARTIFACT_WATCH_TIMEOUT', '3600'))
+    ARTIFACT_CACHE_MAX_RUNS = 500  # Finished runs remembered by the watcher
+    
+    # Repository Sync Configuration (repository docs indexed into RAG)
+    REPO_SYNC_EXTENSIONS = [
+        ext.strip().lower()
+        for ext in os.getenv('REPO_SYNC_EXTENSIONS', '.md,.markdown,.txt,.rst').split(',')
+        if ext.strip()
+    ]
+    REPO_SYNC_MAX_FILE_SIZE = int(os.getenv('REPO_SYNC_MAX_FILE_SIZE', str(512 * 1024)))
+    
+    # Workflow Run History Configuration
+    # Seconds before /api/github/workflows/stats collects new runs again
+    WORKFLOW_HISTORY_REFRESH = float(os.getenv('WORKFLOW_HISTORY_REFRESH', '300'))
+    # How far back the first collection of a repository goes
+    WORKFLOW_HISTORY_BACKFILL_DAYS = int(os.getenv('WORKFLOW_HISTORY_BACKFILL_DAYS', '90'))
+    # Seconds a run still in progress (e.g. awaiting approval) holds the
+    # collection watermark back
+    WORKFLOW_HISTORY_PENDING_MAX_AGE = float(
+        os.getenv('WORKFLOW_HISTORY_PENDING_MAX_AGE', '86400')
+    )
+    # Webhook secret; when set, PRs, issues and workflow runs are served
+    # from a local SQLite mirror kept current by /api/github/webhook
+    GITHUB_WEBHOOK_SECRET = os.getenv('GITHUB_WEBHOOK_SECRET', '')
+    GITHUB_STATE_DB = os.getenv('GITHUB_STATE_DB', './github_state.db')
+    GITHUB_MIRROR_BACKFILL_LIMIT = int(
+        os.getenv('GITHUB_MIRROR_BACKFILL_LIMIT', '100')
+    )
+    # Seconds before the mirror is resynced from the API (repairs missed events)
+    GITHUB_MIRROR_RESYNC_INTERVAL = float(
+        os.getenv('GITHUB_MIRROR_RESYNC_INTERVAL', '21600')
+    )
+    
+    # GitHub Issue/PR Index Configuration (issues and PRs embedded for chat)
+    GITHUB_INDEX_ENABLED = os.getenv('GITHUB_INDEX_ENABLED', 'true').lower() == 'true'
+    # Seconds between background refreshes of each connected repository
+    GITHUB_INDEX_REFRESH = float(os.getenv('GITHUB_INDEX_REFRESH', '300'))
+    # How far back the first refresh of a repository goes (open items are
+    # always indexed, however old)
+    GITHUB_INDEX_BACKFILL_DAYS = int(os.getenv('GITHUB_INDEX_BACKFILL_DAYS', '180'))
+    # Seconds between full resyncs, which drop deleted and transferred items
+    GITHUB_INDEX_RESYNC_INTERVAL = float(
+        os.getenv('GITHUB_INDEX_RESYNC_INTERVAL', '21600')
+    )
+    # Related issues and PRs added to a chat prompt
+    GITHUB_INDEX_TOP_K = int(os.getenv('GITHUB_INDEX_TOP_K', '5'))
+    # Characters of title and body embedded per item
+    GITHUB_INDEX_MAX_CHARS = int(os.getenv('GITHUB_INDEX_MAX_CHARS', '2000'))
+    
+    # GitHub Digest Configuration (prompt-ready repository summary for chat)
+    GITHUB_DIGEST_ENABLED = os.getenv('GITHUB_DIGEST_ENABLED', 'true').lower() == 'true'
+    # Seconds between background refreshes of each connected repository
+    GITHUB_DIGEST_REFRESH = float(os.getenv('GITHUB_DIGEST_REFRESH', '60'))
+    # Age (seconds) after which chat responses flag the digest as stale
+    GITHUB_DIGEST_MAX_AGE = float(os.getenv('GITHUB_DIGEST_MAX_AGE', '300'))
+    # Open PRs and issues listed, and recent runs summarized as workflow health
+    GITHUB_DIGEST_ITEMS = int(os.getenv('GITHUB_DIGEST_ITEMS', '5'))
+    GITHUB_DIGEST_RUNS = int(os.getenv('GITHUB_DIGEST_RUNS', '20'))
     
     # Flask Configuration
     SECRET_KEY = os.getenv(
@@ -26,6 +126,8 @@ class Config:
     )
     DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     ENV = os.getenv('FLASK_ENV', 'development')
+    # Seconds a request waits for a component still starting in the background
+    STARTUP_WAIT_TIMEOUT = float(os.getenv('STARTUP_WAIT_TIMEOUT', '30'))
     
     # ChromaDB Configuration
     CHROMA_DB_PATH = os.getenv('CHROMA_DB_PATH', './chroma_db')
@@ -50,6 +152,76 @@ class Config:
     TEMPERATURE = float(os.getenv('GEMINI_TEMPERATURE', '0.7'))
     MAX_OUTPUT_TOKENS = int(os.getenv('GEMINI_MAX_TOKENS', '2048'))
     
+    # Prompt Budget Configuration
+    PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '8000'))
+    PROMPT_CHARS_PER_TOKEN = 4  # Rough estimate used for token counting
+    PROMPT_MIN_CHUNK_TOKENS = 64  # Smallest truncated chunk worth keeping
+    
+    # Async Chat Configuration
+    GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '32'))
+    CHAT_REQUEST_TIMEOUT = float(os.getenv('CHAT_REQUEST_TIMEOUT', '120'))
+    # Worker threads shared by blocking calls (ChromaDB, GitHub) on the async path
+    ASYNC_RUNTIME_WORKERS = int(os.getenv('ASYNC_RUNTIME_WORKERS', '32'))
+    # Per-stage deadlines (seconds) for context gathering; a late stage is
+    # left out of the prompt instead of delaying the response
+    CHAT_RAG_TIMEOUT = float(os.getenv('CHAT_RAG_TIMEOUT', '10'))
+    CHAT_GITHUB_TIMEOUT = float(os.getenv('CHAT_GITHUB_TIMEOUT', '5'))
+    # Open PRs, open issues and workflow runs fetched as chat context
+    CHAT_GITHUB_PR_LIMIT = int(os.getenv('CHAT_GITHUB_PR_LIMIT', '5'))
+    CHAT_GITHUB_ISSUE_LIMIT = int(os.getenv('CHAT_GITHUB_ISSUE_LIMIT', '5'))
+    CHAT_GITHUB_RUN_LIMIT = int(os.getenv('CHAT_GITHUB_RUN_LIMIT', '3'))
+    
+    # Model Routing Configuration
+    # Each route is a model tier with its own output budget. A route's
+    # max_output_tokens caps the active setting (None means no extra cap).
+    MODEL_ROUTING_ENABLED = os.getenv(
+        'MODEL_ROUTING_ENABLED', 'true'
+    ).lower() == 'true'
+    GEMINI_FAST_MODEL = os.getenv('GEMINI_FAST_MODEL', 'gemini-2.5-flash-lite')
+    DEFAULT_MODEL_ROUTE = 'standard'
+    MODEL_ROUTES = {
+        'fast': {
+            'model': GEMINI_FAST_MODEL,
+            'max_output_tokens': int(os.getenv('GEMINI_FAST_MAX_TOKENS', '512'))
+        },
+        'standard': {
+            'model': GEMINI_MODEL,
+            'max_output_tokens': None
+        }
+    }
+    # Route for unclassified questions. The fast tier caps answers at
+    # GEMINI_FAST_MAX_TOKENS, so it is opt-in (GENERIC_MODEL_ROUTE=fast)
+    GENERIC_MODEL_ROUTE = os.getenv('GENERIC_MODEL_ROUTE', 'standard')
+    # Route chosen for each detected query type
+    MODEL_ROUTE_BY_QUERY_TYPE = {
+        'generic': GENERIC_MODEL_ROUTE,
+        'sox_audit': 'standard',
+        'mlops_workflow': 'standard',
+        'devops_pipeline': 'standard'
+    }
+    # Prompts larger than this are too much context for the fast tier
+    FAST_ROUTE_MAX_PROMPT_TOKENS = int(
+        os.getenv('FAST_ROUTE_MAX_PROMPT_TOKENS', '2000')
+    )
+    
+    # Gemini Deadline, Hedging and Circuit Breaker Configuration
+    GEMINI_REQUEST_DEADLINE = float(os.getenv('GEMINI_REQUEST_DEADLINE', '30'))
+    GEMINI_HEDGE_ENABLED = os.getenv(
+        'GEMINI_HEDGE_ENABLED', 'true'
+    ).lower() == 'true'
+    GEMINI_HEDGE_PERCENTILE = float(os.getenv('GEMINI_HEDGE_PERCENTILE', '95'))
+    GEMINI_HEDGE_MIN_SAMPLES = 20  # Latency samples needed before hedging
+    GEMINI_BREAKER_FAILURES = int(os.getenv('GEMINI_BREAKER_FAILURES', '5'))
+    GEMINI_BREAKER_RESET_SECONDS = float(
+        os.getenv('GEMINI_BREAKER_RESET_SECONDS', '30')
+    )
+    
+    # Conversation Memory Configuration
+    CONVERSATION_MAX_SESSIONS = int(os.getenv('CONVERSATION_MAX_SESSIONS', '500'))
+    CONVERSATION_TOKEN_BUDGET = int(os.getenv('CONVERSATION_TOKEN_BUDGET', '1500'))
+    CONVERSATION_MAX_RECENT_TURNS = 4  # Turns kept verbatim before summarising
+    CONVERSATION_TOPIC_OVERLAP = 0.5  # Term overlap to reuse prior retrieval
+    
     # System Prompt Configuration
     SYSTEM_PROMPT_TEMPLATE = os.getenv('SYSTEM_PROMPT_TEMPLATE', 'default')
     CUSTOM_SYSTEM_PROMPT = os.getenv('CUSTOM_SYSTEM_PROMPT', '')
@@ -0,0 +1,223 @@
+"""
+Server-side conversation memory for multi-turn chat.
+Keeps recent turns per session, compacts older turns into a rolling
+summary that fits a fixed token budget, and evicts idle sessions (LRU).
+"""
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from logger import logger
+from config import Config
+from prompt_budget import estimate_tokens
+
+# Session IDs are issued by the server as uuid4 hex strings
+SESSION_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# Words ignored when comparing the topic of consecutive questions
+STOPWORDS = {
+    'the', 'and', 'for', 'are', 'was', 'were', 'what', 'which', 'who',
+    'how', 'why', 'when', 'where', 'this', 'that', 'these', 'those', 'with',
+    'about', 'does', 'did', 'can', 'could', 'would', 'should', 'will',
+    'please', 'tell', 'more', 'also', 'there', 'their', 'them', 'they',
+    'its', 'from', 'into', 'than', 'then', 'have', 'has', 'had', 'you',
+    'your', 'our', 'any', 'all', 'some', 'just', 'only', 'explain',
+    'describe', 'give', 'show', 'list', 'again', 'same', 'other'
+}
+
+
+def content_terms(text):
+    """
+    Extract lower-cased content words from text.
+
+    Args:
+        text: Text to analyse
+
+    Returns:
+        Set of words of three or more characters, minus stopwords
+    """
+    return {
+        word for word in re.findall(r'[a-z0-9][a-z0-9_/.-]{2,}', text.lower())
+        if word not in STOPWORDS
+    }
+
+
+class Conversation:
+    """Recent turns, rolling summary and last retrieval for one session."""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        # Concurrent requests of one session share the conversation
+        self._lock = threading.Lock()
+        self.turns = deque()
+        self.summary_lines = deque()
+        self.topic_terms = set()
+        self.last_chunk_ids = []
+        self.turn_count = 0
+        self.last_used = time.time()
+
+    def reusable_chunk_ids(self, user_query):
+        """
+        Decide whether a follow-up can reuse the previous retrieval.
+
+        The topic is considered unchanged when the question adds no new
+        content words, or when most of its content words overlap with the
+        recent topic.
+
+        Args:
+            user_query: The new question
+
+        Returns:
+            IDs of the previous chunks to reuse, or an empty list
+        """
+        terms = content_terms(user_query)
+        with self._lock:
+            if not self.last_chunk_ids or not self.topic_terms:
+                return []
+            if terms and (len(terms & self.topic_terms) / len(terms)
+                          < Config.CONVERSATION_TOPIC_OVERLAP):
+                return []
+            return list(self.last_chunk_ids)
+
+    def prompt_context(self):
+        """
+        Get the history to include in the prompt.
+
+        Returns:
+            Dict with 'summary' text and 'turns' list, or None if empty
+        """
+        with self._lock:
+            if not self.turns and not self.summary_lines:
+                return None
+            return {
+                'summary': '\n'.join(self.summary_lines),
+                'turns': [
+                    {'user': turn['user'], 'assistant': turn['assistant']}
+                    for turn in self.turns
+                ]
+            }
+
+    def add_turn(self, user_query, response, chunk_ids, retrieval_reused):
+        """
+        Record a completed turn and compact history to fit the budget.
+
+        Args:
+            user_query: The user's question
+            response: The assistant's answer
+            chunk_ids: IDs of the chunks used for this turn
+            retrieval_reused: Whether the chunks came from an earlier turn
+        """
+        terms = content_terms(user_query)
+        with self._lock:
+            self.turns.append({
+                'user': user_query,
+                'assistant': response,
+                'tokens': estimate_tokens(user_query) + estimate_tokens(response)
+            })
+            self.turn_count += 1
+            self.last_used = time.time()
+
+            if retrieval_reused:
+                self.topic_terms |= terms
+            else:
+                self.topic_terms = terms
+                self.last_chunk_ids = list(chunk_ids)
+
+            self._compact()
+
+    def _compact(self):
+        """Fold the oldest turns into the summary until the budget fits (lock held)."""
+        budget = Config.CONVERSATION_TOKEN_BUDGET
+        while self.turns and (
+            len(self.turns) > Config.CONVERSATION_MAX_RECENT_TURNS
+            or sum(turn['tokens'] for turn in self.turns) > budget
+        ):
+            turn = self.turns.popleft()
+            self.summary_lines.append(self._summarise_turn(turn))
+
+        # The summary gets whatever the recent turns leave, oldest lines go first
+        summary_budget = max(
+            0, budget - sum(turn['tokens'] for turn in self.turns)
+        )
+        while (self.summary_lines and
+               estimate_tokens('\n'.join(self.summary_lines)) > summary_budget):
+            self.summary_lines.popleft()
+
+    def _summarise_turn(self, turn):
+        """Compress a turn to its question and the start of its answer."""
+        question = ' '.join(turn['user'].split())[:150]
+        answer = ' '.join(turn['assistant'].split())
+        first_sentence = re.split(r'(?<=[.!?])\s', answer, maxsplit=1)[0]
+        return f"- Q: {question} | A: {first_sentence[:200]}"
+
+
+class ConversationStore:
+    """Thread-safe LRU store of conversations."""
+
+    def __init__(self, max_sessions=None):
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions: Sessions kept before the least recently used is
+                evicted (defaults to Config.CONVERSATION_MAX_SESSIONS)
+        """
+        self.max_sessions = max_sessions or Config.CONVERSATION_MAX_SESSIONS
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted_count = 0
+
+    def get(self, session_id):
+        """
+        Get an existing session.
+
+        Args:
+            session_id: Session ID issued by create()
+
+        Returns:
+            Conversation instance, or None if unknown or evicted
+        """
+        with self._lock:
+            conversation = self._sessions.get(session_id)
+            if conversation is not None:
+                self._sessions.move_to_end(session_id)
+            return conversation
+
+    def create(self):
+        """
+        Start a session under a new server-generated ID.
+
+        Returns:
+            Conversation instance
+        """
+        with self._lock:
+            session_id = uuid.uuid4().hex
+            conversation = Conversation(session_id)
+            self._sessions[session_id] = conversation
+
+            while len(self._sessions) > self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                self.evicted_count += 1
+                logger.info(f"Evicted conversation {evicted_id}")
+
+            return conversation
+
+    def delete(self, session_id):
+        """
+        Delete a session.
+
+        Returns:
+            True if the session existed
+        """
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def get_stats(self):
+        """Get store statistics."""
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'evicted': self.evicted_count
+            }
@@ -2,9 +2,25 @@
 Gemini API client for chat functionality.
 Handles query processing with RAG context and GitHub data.
 """
+import asyncio
+import threading
+import time
+from collections import namedtuple
 import google.generativeai as genai
+from google.api_core.exceptions import DeadlineExceeded
 from logger import logger
 from config import Config
+from prompt_budget import PromptBudget
+from async_runtime import async_runtime
+from query_classifier import QueryClassifier
+from latency_stats import LatencyTracker
+from circuit_breaker import CircuitBreaker
+
+# Immutable snapshot of everything a single generation call needs
+ModelSettings = namedtuple(
+    'ModelSettings',
+    ['model', 'system_prompt', 'generation_config', 'route_models']
+)
 
 class GeminiClient:
     """Client for interacting with Gemini API."""
@@ -13,20 +29,193 @@ class GeminiClient:
         """Initialize Gemini client."""
         try:
             genai.configure(api_key=Config.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
             
-            # Configure generation settings
-            self.generation_config = {
-                'temperature': Config.TEMPERATURE,
-                'max_output_tokens': Config.MAX_OUTPUT_TOKENS,
+            # Compile the query-type matcher once from the template keywords
+            self.query_classifier = QueryClassifier.from_templates_file()
+            
+            # Per-route latency statistics
+            self.route_latency = {
+                route: LatencyTracker() for route in Config.MODEL_ROUTES
             }
             
+            # Deadline, hedging and circuit breaker state
+            self.circuit_breaker = CircuitBreaker(
+                'gemini',
+                failure_threshold=Config.GEMINI_BREAKER_FAILURES,
+                reset_timeout=Config.GEMINI_BREAKER_RESET_SECONDS
+            )
+            self.deadline_exceeded_count = 0
+            self.hedged_count = 0
+            self.degraded_count = 0
+            
+            self._settings_lock = threading.Lock()
+            self._settings = None
+            
+            # Build the models with the system prompt and generation settings
+            self.update_settings(
+                system_prompt=Config.get_system_prompt(),
+                temperature=Config.TEMPERATURE,
+                max_output_tokens=Config.MAX_OUTPUT_TOKENS
+            )
+            
             logger.info("Gemini client initialized successfully")
             
         except Exception as e:
             logger.error(f"Failed to initialize Gemini client: {e}")
             raise
     
+    @property
+    def settings(self):
+        """Current ModelSettings snapshot."""
+        return self._settings
+    
+    @property
+    def model(self):
+        """Default-route model bound to the current system prompt."""
+        return self._settings.model
+    
+    @property
+    def generation_config(self):
+        """Current generation settings."""
+        return self._settings.generation_config
+    
+    def update_settings(self, system_prompt=None, temperature=None,
+                        max_output_tokens=None):
+        """
+        Atomically swap the system prompt and/or generation settings.
+        
+        The system prompt is passed through the model's native system
+        instruction slot, so it is not re-sent as part of every prompt body.
+        In-flight requests keep using the snapshot they started with; new
+        requests pick up the new one. The API client itself is not
+        reconfigured.
+        
+        Args:
+            system_prompt: New system prompt (unchanged if None)
+            temperature: New sampling temperature (unchanged if None)
+            max_output_tokens: New output token limit (unchanged if None)
+        
+        Returns:
+            The new ModelSettings snapshot
+        """
+        with self._settings_lock:
+            current = self._settings
+            generation_config = dict(current.generation_config) if current else {}
+            if temperature is not None:
+                generation_config['temperature'] = float(temperature)
+            if max_output_tokens is not None:
+                generation_config['max_output_tokens'] = int(max_output_tokens)
+            
+            if system_prompt is None and current:
+                system_prompt = current.system_prompt
+                route_models = current.route_models
+            else:
+                # One model object per route, all sharing the system prompt
+                route_models = {
+                    route: genai.GenerativeModel(
+                        spec['model'],
+                        system_instruction=system_prompt
+                    )
+                    for route, spec in Config.MODEL_ROUTES.items()
+                }
+            
+            self._settings = ModelSettings(
+                model=route_models[Config.DEFAULT_MODEL_ROUTE],
+                system_prompt=system_prompt,
+                generation_config=generation_config,
+                route_models=route_models
+            )
+        
+        logger.info("Gemini settings updated")
+        return self._settings
+    
+    def choose_route(self, query_type, prompt_tokens, route_hint=None):
+        """
+        Choose the model route for a request.
+        
+        A valid caller hint wins. Otherwise the detected query type selects
+        the route from Config.MODEL_ROUTE_BY_QUERY_TYPE (the fast tier only
+        where the operator opted in), and prompts too large for the fast
+        tier are moved up to the default route.
+        
+        Args:
+            query_type: Detected query type
+            prompt_tokens: Estimated input tokens of the assembled prompt
+            route_hint: Optional route name requested by the caller
+        
+        Returns:
+            Route name (a key of Config.MODEL_ROUTES)
+        """
+        if route_hint in Config.MODEL_ROUTES:
+            return route_hint
+        
+        if not Config.MODEL_ROUTING_ENABLED:
+            return Config.DEFAULT_MODEL_ROUTE
+        
+        route = Config.MODEL_ROUTE_BY_QUERY_TYPE.get(
+            query_type, Config.DEFAULT_MODEL_ROUTE
+        )
+        if route == 'fast' and prompt_tokens > Config.FAST_ROUTE_MAX_PROMPT_TOKENS:
+            route = Config.DEFAULT_MODEL_ROUTE
+        
+        if route not in Config.MODEL_ROUTES:
+            route = Config.DEFAULT_MODEL_ROUTE
+        return route
+    
+    def _prepare_request(self, user_query, rag_context, github_data,
+                         route_hint=None, conversation=None):
+        """
+        Build the prompt and pick the route, model and generation config.
+        
+        Takes one settings snapshot so a concurrent settings update cannot
+        mix the old model with the new configuration.
+        
+        Returns:
+            Tuple of (prompt, prompt report, route name, model, generation config)
+        """
+        settings = self._settings
+        prompt, prompt_report = self._build_prompt(
+            user_query, rag_context, github_data,
+            system_prompt=settings.system_prompt,
+            conversation=conversation
+        )
+        
+        route = self.choose_route(
+            prompt_report['query_type'],
+            prompt_report['estimated_tokens'],
+            route_hint
+        )
+        
+        generation_config = dict(settings.generation_config)
+        route_cap = Config.MODEL_ROUTES[route].get('max_output_tokens')
+        if route_cap:
+            generation_config['max_output_tokens'] = min(
+                route_cap,
+                generation_config.get('max_output_tokens', route_cap)
+            )
+        
+        return (
+            prompt, prompt_report, route,
+            settings.route_models[route], generation_config
+        )
+    
+    @staticmethod
+    def _hit_token_limit(response):
+        """Whether generation stopped at the output token cap."""
+        try:
+            reason = response.candidates[0].finish_reason
+        except (AttributeError, IndexError, TypeError):
+            return False
+        return getattr(reason, 'name', reason) == 'MAX_TOKENS'
+    
+    def _route_info(self, route, generation_config):
+        """Describe the route used for a response."""
+        return {
+            'name': route,
+            'model': Config.MODEL_ROUTES[route]['model'],
+            'max_output_tokens': generation_config.get('max_output_tokens')
+        }
+    
     def generate_response(self, user_query, rag_context=None, github_data=None):
         """
         Generate response using Gemini with RAG context and GitHub data.
@@ -39,108 +228,543 @@ class GeminiClient:
         Returns:
             Generated response text
         """
+        result = self.generate_detailed_response(
+            user_query, rag_context, github_data
+        )
+        return result['response']
+    
+    def generate_detailed_response(self, user_query, rag_context=None,
+                                   github_data=None, route_hint=None,
+                                   conversation=None):
+        """
+        Generate a response and report how it was produced.
+        
+        The call is bounded by Config.GEMINI_REQUEST_DEADLINE. When the
+        circuit breaker is open, or the call fails or times out, a degraded
+        response built from the retrieved context is returned instead.
+        
+        Args:
+            user_query: User's question/query
+            rag_context: List of relevant document chunks from RAG
+            github_data: Relevant GitHub repository data
+            route_hint: Optional model route requested by the caller
+            conversation: Earlier turns of this session, if any
+        
+        Returns:
+            Dictionary with the response text, prompt budget report, route
+            and degraded/hedged/truncated flags (truncated: the answer hit
+            the route's output token cap)
+        """
+        try:
+            # Build comprehensive prompt within the token budget
+            prompt, prompt_report, route, model, generation_config = (
+                self._prepare_request(
+                    user_query, rag_context, github_data, route_hint,
+                    conversation
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error generating response: {e}")
+            return self._degraded_result(rag_context, github_data, str(e))
+        route_info = self._route_info(route, generation_config)
+        
+        if not self.circuit_breaker.allow_request():
+            return self._degraded_result(
+                rag_context, github_data, 'model backend unavailable',
+                prompt_report, route_info
+            )
+        
+        logger.info(
+            f"Generating response via '{route}' route for query: "
+            f"{user_query[:100]}..."
+        )
+        
+        started = time.monotonic()
         try:
-            # Build comprehensive prompt
-            prompt = self._build_prompt(user_query, rag_context, github_data)
-            
-            logger.info(f"Generating response for query: {user_query[:100]}...")
-            
             # Generate response
-            response = self.model.generate_content(
+            response = model.generate_content(
                 prompt,
-                generation_config=self.generation_config
+                generation_config=generation_config,
+                request_options={'timeout': Config.GEMINI_REQUEST_DEADLINE}
             )
-            
             # Extract text from response
             response_text = response.text
-            
-            logger.info("Response generated successfully")
-            return response_text
-            
+            truncated = self._hit_token_limit(response)
+        except Exception as e:
+            elapsed = time.monotonic() - started
+            self.route_latency[route].record(elapsed, success=False)
+            self.circuit_breaker.record_failure()
+            if (isinstance(e, (DeadlineExceeded, TimeoutError))
+                    or elapsed >= Config.GEMINI_REQUEST_DEADLINE):
+                self.deadline_exceeded_count += 1
+                reason = (
+                    f"no response within {Config.GEMINI_REQUEST_DEADLINE:g}s"
+                )
+            else:
+                reason = str(e)
+            logger.error(f"Error generating response: {reason}")
+            return self._degraded_result(
+                rag_context, github_data, reason, prompt_report, route_info
+            )
+        
+        self.route_latency[route].record(time.monotonic() - started)
+        self.circuit_breaker.record_success()
+        logger.info("Response generated successfully")
+        
+        return {
+            'response': response_text,
+            'prompt_budget': prompt_report,
+            'route': route_info,
+            'degraded': False,
+            'hedged': False,
+            'truncated': truncated
+        }
+    
+    async def generate_detailed_response_async(self, user_query,
+                                               rag_context=None,
+                                               github_data=None,
+                                               route_hint=None,
+                                               conversation=None):
+        """
+        Async variant of generate_detailed_response.
+        
+        Must run on the shared async runtime; each model call holds one of
+        the runtime's bounded concurrency slots while it is in flight. If
+        the call is still running after the route's hedge delay, a second
+        identical call is sent and whichever finishes first is used.
+        
+        Args:
+            user_query: User's question/query
+            rag_context: List of relevant document chunks from RAG
+            github_data: Relevant GitHub repository data
+            route_hint: Optional model route requested by the caller
+            conversation: Earlier turns of this session, if any
+        
+        Returns:
+            Dictionary with the response text, prompt budget report, route
+            and degraded/hedged/truncated flags (truncated: the answer hit
+            the route's output token cap)
+        """
+        try:
+            prompt, prompt_report, route, model, generation_config = (
+                self._prepare_request(
+                    user_query, rag_context, github_data, route_hint,
+                    conversation
+                )
+            )
         except Exception as e:
             logger.error(f"Error generating response: {e}")
-            return f"I apologize, but I encountered an error: {str(e)}"
+            return self._degraded_result(rag_context, github_data, str(e))
+        route_info = self._route_info(route, generation_config)
+        
+        if not self.circuit_breaker.allow_request():
+            return self._degraded_result(
+                rag_context, github_data, 'model backend unavailable',
+                prompt_report, route_info
+            )
+        
+        logger.info(
+            f"Generating response via '{route}' route for query: "
+            f"{user_query[:100]}..."
+        )
+        
+        started = time.monotonic()
+        try:
+            response, hedged = await self._call_with_hedging(
+                route,
+                lambda: model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config,
+                    request_options={'timeout': Config.GEMINI_REQUEST_DEADLINE}
+                )
+            )
+            response_text = response.text
+            truncated = self._hit_token_limit(response)
+        except Exception as e:
+            self.route_latency[route].record(
+                time.monotonic() - started, success=False
+            )
+            self.circuit_breaker.record_failure()
+            if isinstance(e, (asyncio.TimeoutError, DeadlineExceeded)):
+                self.deadline_exceeded_count += 1
+                reason = (
+                    f"no response within {Config.GEMINI_REQUEST_DEADLINE:g}s"
+                )
+            else:
+                reason = str(e)
+            logger.error(f"Error generating response: {reason}")
+            return self._degraded_result(
+                rag_context, github_data, reason, prompt_report, route_info
+            )
+        
+        self.route_latency[route].record(time.monotonic() - started)
+        self.circuit_breaker.record_success()
+        logger.info("Response generated successfully")
+        
+        return {
+            'response': response_text,
+            'prompt_budget': prompt_report,
+            'route': route_info,
+            'degraded': False,
+            'hedged': hedged,
+            'truncated': truncated
+        }
+    
+    def _hedge_delay(self, route):
+        """
+        Delay after which a hedged duplicate request is sent.
+        
+        Returns:
+            Seconds, or None if hedging is disabled or there are too few
+            latency samples for the route yet
+        """
+        tracker = self.route_latency[route]
+        # Only successful calls are sampled: failures and timeouts would
+        # drag the percentile to the deadline and disable hedging
+        if (not Config.GEMINI_HEDGE_ENABLED
+                or tracker.successes < Config.GEMINI_HEDGE_MIN_SAMPLES):
+            return None
+        delay = tracker.percentile(Config.GEMINI_HEDGE_PERCENTILE)
+        if delay is None or delay >= Config.GEMINI_REQUEST_DEADLINE:
+            return None
+        return delay
+    
+    async def _call_with_hedging(self, route, make_call):
+        """
+        Run a model call with a deadline and optional hedging.
+        
+        Args:
+            route: Route name (selects the hedge delay)
+            make_call: Zero-argument callable returning the call coroutine
+        
+        Returns:
+            Tuple of (response, whether a hedged request was sent)
+        
+        Raises:
+            asyncio.TimeoutError: If no call finished before the deadline
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + Config.GEMINI_REQUEST_DEADLINE
+        hedge_delay = self._hedge_delay(route)
+        
+        tasks = [asyncio.ensure_future(async_runtime.call_model(make_call))]
+        hedged = False
+        last_error = None
+        try:
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    hedged = True
+                    self.hedged_count += 1
+                    logger.info(
+                        f"Hedging '{route}' request after {hedge_delay:.2f}s"
+                    )
+                    tasks.append(
+                        asyncio.ensure_future(async_runtime.call_model(make_call))
+                    )
+            
+            pending = set(tasks)
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), hedged
+                    last_error = task.exception()
+            
+            if last_error is not None and not pending:
+                raise last_error
+            raise asyncio.TimeoutError()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def _degraded_result(self, rag_context, github_data, reason,
+                         prompt_report=None, route_info=None):
+        """
+        Build a response from retrieved context alone.
+        
+        Args:
+            rag_context: Retrieved document chunks
+            github_data: GitHub repository data
+            reason: Why the model could not be used
+            prompt_report: Prompt budget report, if the prompt was built
+            route_info: Route information, if a route was chosen
+        
+        Returns:
+            Result dictionary flagged as degraded
+        """
+        self.degraded_count += 1
+        parts = [
+            "I apologize, but I encountered an error: "
+            f"{reason}. Here is the most relevant information I retrieved "
+            "for your question."
+        ]
+        
+        for i, chunk in enumerate((rag_context or [])[:3], 1):
+            filename = chunk.get('metadata', {}).get('filename', 'Unknown')
+            excerpt = chunk.get('text', '').strip()
+            if len(excerpt) > 500:
+                excerpt = excerpt[:500].rstrip() + ' ...'
+            parts.append(f"\n[Document {i}: {filename}]\n{excerpt}")
+        
+        if github_data:
+            if github_data.get('digest'):
+                parts.append(f"\n{github_data['digest']}")
+            info = github_data.get('repository_info') or {}
+            if info:
+                parts.append(
+                    f"\nRepository: {info.get('name', 'N/A')} - "
+                    f"{info.get('description') or 'No description'}"
+                )
+            for pr in (github_data.get('pull_requests') or [])[:5]:
+                parts.append(f"- PR #{pr.get('number')}: {pr.get('title')}")
+            for issue in (github_data.get('issues') or [])[:5]:
+                parts.append(f"- Issue #{issue.get('number')}: {issue.get('title')}")
+        
+        if len(parts) == 1:
+            parts.append("\nNo reference documents matched this question.")
+        
+        return {
+            'response': "\n".join(parts),
+            'prompt_budget': prompt_report,
+            'route': route_info,
+            'degraded': True,
+            'hedged': False,
+            'truncated': False
+        }
+    
+    def get_resilience_stats(self):
+        """
+        Get deadline, hedging and circuit breaker statistics.
+        
+        Returns:
+            Dictionary of counters and breaker state
+        """
+        return {
+            'deadline_seconds': Config.GEMINI_REQUEST_DEADLINE,
+            'deadline_exceeded': self.deadline_exceeded_count,
+            'hedged_requests': self.hedged_count,
+            'degraded_responses': self.degraded_count,
+            'circuit_breaker': self.circuit_breaker.get_stats()
+        }
+    
+    def get_route_stats(self):
+        """
+        Get per-route latency statistics.
+        
+        Returns:
+            Dictionary mapping route name to model and latency stats
+        """
+        return {
+            route: dict(
+                model=Config.MODEL_ROUTES[route]['model'],
+                **tracker.get_stats()
+            )
+            for route, tracker in self.route_latency.items()
+        }
     
-    def _build_prompt(self, user_query, rag_context=None, github_data=None):
+    def _build_prompt(self, user_query, rag_context=None, github_data=None,
+                      max_tokens=None, system_prompt=None, conversation=None):
         """
-        Build comprehensive prompt with context.
+        Build comprehensive prompt with context within a token budget.
+        
+        Mandatory parts (system prompt, structure instructions and the user
+        question) are always accounted for. GitHub data is added next, then
+        RAG chunks in rank order; the lowest-ranked chunks are truncated or
+        dropped first when the budget runs out. The system prompt travels in
+        the model's system instruction, so it counts against the budget but
+        is not part of the returned text.
         
         Args:
             user_query: User's question
-            rag_context: RAG document chunks
+            rag_context: RAG document chunks, best match first
             github_data: GitHub repository data
+            max_tokens: Input token budget (defaults to Config.PROMPT_TOKEN_BUDGET)
+            system_prompt: System instruction in use (defaults to the active one)
+            conversation: Earlier turns of this session ('summary' and
+                'turns'), already compacted to the conversation budget
         
         Returns:
-            Formatted prompt string
+            Tuple of (formatted prompt string, budget report dict)
         """
-        prompt_parts = []
+        budget = PromptBudget(max_tokens)
         
         # Detect query type for structured responses
         query_type = self._detect_query_type(user_query)
         
-        # Get system prompt from configuration
-        system_instruction = Config.get_system_prompt()
-        prompt_parts.append(system_instruction)
+        # System prompt is sent separately but still consumes input tokens
+        if system_prompt is None:
+            system_prompt = self._settings.system_prompt
+        budget.reserve(system_prompt, 'system')
         
         # Add type-specific instructions for structured responses
+        type_instructions = None
         if query_type == 'sox_audit':
-            prompt_parts.append(self._get_sox_audit_instructions())
+            type_instructions = self._get_sox_audit_instructions()
         elif query_type == 'mlops_workflow':
-            prompt_parts.append(self._get_mlops_instructions())
+            type_instructions = self._get_mlops_instructions()
         elif query_type == 'devops_pipeline':
-            prompt_parts.append(self._get_devops_instructions())
+            type_instructions = self._get_devops_instructions()
         # For 'generic' type, no special structure needed
+        if type_instructions:
+            budget.reserve(type_instructions, 'instructions')
         
-        # Add RAG context if available
-        if rag_context and len(rag_context) > 0:
-            prompt_parts.append("\n\n=== REFERENCE DOCUMENTS ===")
+        question = budget.reserve(
+            f"\n\n=== USER QUESTION ===\n{user_query}", 'question'
+        )
+        closing = budget.reserve(
+            "\n\nPlease provide a helpful and accurate response based on the information above. "
+            "Cite specific documents or GitHub data when relevant.",
+            'question'
+        )
+        
+        # Conversation history is bounded by its own budget, so it is kept whole
+        history_parts = []
+        if conversation:
+            if conversation.get('summary'):
+                history_parts.append(
+                    f"\nEarlier in this conversation:\n{conversation['summary']}"
+                )
+            for turn in conversation.get('turns', []):
+                history_parts.append(
+                    f"\nUser: {turn['user']}\nAssistant: {turn['assistant']}"
+                )
+            for part in history_parts:
+                budget.reserve(part, 'conversation')
+        
+        # GitHub context is compact and bounded, so it is placed before chunks
+        github_parts = self._build_github_parts(github_data, budget)
+        
+        # RAG chunks fill the remaining budget in rank order
+        document_parts = []
+        if rag_context:
             for i, chunk in enumerate(rag_context, 1):
                 filename = chunk.get('metadata', {}).get('filename', 'Unknown')
-                text = chunk.get('text', '')
-                prompt_parts.append(f"\n[Document {i}: {filename}]\n{text}")
+                text = budget.fit(
+                    f"\n[Document {i}: {filename}]\n{chunk.get('text', '')}",
+                    'rag',
+                    label=f"{filename} (rank {i})",
+                    allow_truncate=True
+                )
+                if text:
+                    document_parts.append(text)
         
-        # Add GitHub context if available
-        if github_data:
+        prompt_parts = []
+        if type_instructions:
+            prompt_parts.append(type_instructions)
+        if document_parts:
+            prompt_parts.append("\n\n=== REFERENCE DOCUMENTS ===")
+            prompt_parts.extend(document_parts)
+        if github_parts:
             prompt_parts.append("\n\n=== GITHUB REPOSITORY DATA ===")
-            
-            if 'repository_info' in github_data:
-                info = github_data['repository_info']
-                prompt_parts.append(f"\nRepository: {info.get('name', 'N/A')}")
-                prompt_parts.append(f"Description: {info.get('description', 'N/A')}")
-                prompt_parts.append(f"Stars: {info.get('stars', 'N/A')}")
-            
-            if 'pull_requests' in github_data:
-                prs = github_data['pull_requests']
-                prompt_parts.append(f"\n\nRecent Pull Requests ({len(prs)}):")
-                for pr in prs[:5]:  # Limit to 5 PRs
-                    prompt_parts.append(f"- #{pr.get('number')}: {pr.get('title')} ({pr.get('state')})")
-            
-            if 'issues' in github_data:
-                issues = github_data['issues']
-                prompt_parts.append(f"\n\nRecent Issues ({len(issues)}):")
-                for issue in issues[:5]:  # Limit to 5 issues
-                    prompt_parts.append(f"- #{issue.get('number')}: {issue.get('title')} ({issue.get('state')})")
-            
-            if 'workflows' in github_data:
-                workflows = github_data['workflows']
-                prompt_parts.append(f"\n\nWorkflow Runs ({len(workflows)}):")
-                for wf in workflows[:3]:  # Limit to 3 workflows
-                    prompt_parts.append(f"- {wf.get('name')}: {wf.get('conclusion', 'running')}")
-            
-            if 'files' in github_data:
-                files = github_data['files']
-                prompt_parts.append(f"\n\nRepository Files: {', '.join(files[:10])}")
+            prompt_parts.extend(github_parts)
+        if history_parts:
+            prompt_parts.append("\n\n=== CONVERSATION SO FAR ===")
+            prompt_parts.extend(history_parts)
+        prompt_parts.append(question)
+        prompt_parts.append(closing)
         
-        # Add user query
-        prompt_parts.append(f"\n\n=== USER QUESTION ===\n{user_query}")
+        report = budget.report()
+        report['query_type'] = query_type
+        if github_data and github_data.get('digest_omitted'):
+            # Digest sections left out because related items replace them
+            report['replaced'] = [
+                {'section': 'github', 'item': f"digest {name}", 'replaced_by': 'related_items'}
+                for name in github_data['digest_omitted']
+            ]
+        if report['dropped'] or report['truncated']:
+            logger.info(
+                f"Prompt budget applied: {len(report['dropped'])} item(s) dropped, "
+                f"{len(report['truncated'])} truncated "
+                f"({report['estimated_tokens']}/{report['budget_tokens']} tokens)"
+            )
         
-        # Add instruction for response
-        prompt_parts.append(
-            "\n\nPlease provide a helpful and accurate response based on the information above. "
-            "Cite specific documents or GitHub data when relevant."
-        )
+        return "\n".join(prompt_parts).lstrip(), report
+    
+    def _build_github_parts(self, github_data, budget):
+        """
+        Format GitHub data as prompt lines that fit the budget.
+        
+        Args:
+            github_data: GitHub repository data
+            budget: PromptBudget tracking the remaining tokens
+        
+        Returns:
+            List of prompt lines
+        """
+        if not github_data:
+            return []
         
-        return "\n".join(prompt_parts)
+        lines = []
+        
+        def add(text, label):
+            text = budget.fit(text, 'github', label=label)
+            if text:
+                lines.append(text)
+        
+        if github_data.get('digest'):
+            # Precomputed in the background, already compact and formatted
+            add(f"\n{github_data['digest']}", 'digest')
+        
+        if github_data.get('repository_info'):
+            info = github_data['repository_info']
+            add(
+                f"\nRepository: {info.get('name', 'N/A')}\n"
+                f"Description: {info.get('description', 'N/A')}\n"
+                f"Stars: {info.get('stars', 'N/A')}",
+                'repository_info'
+            )
+        
+        if 'pull_requests' in github_data:
+            prs = github_data['pull_requests']
+            add(f"\n\nRecent Pull Requests ({len(prs)}):", 'pull_requests')
+            for pr in prs[:5]:  # Limit to 5 PRs
+                add(
+                    f"- #{pr.get('number')}: {pr.get('title')} ({pr.get('state')})",
+                    f"PR #{pr.get('number')}"
+                )
+        
+        if 'issues' in github_data:
+            issues = github_data['issues']
+            add(f"\n\nRecent Issues ({len(issues)}):", 'issues')
+            for issue in issues[:5]:  # Limit to 5 issues
+                add(
+                    f"- #{issue.get('number')}: {issue.get('title')} ({issue.get('state')})",
+                    f"Issue #{issue.get('number')}"
+                )
+        
+        if 'related_items' in github_data:
+            items = github_data['related_items']
+            add(f"\n\nRelated Issues and Pull Requests ({len(items)}):", 'related_items')
+            for item in items:
+                label = 'PR' if item.get('kind') == 'pull_request' else 'Issue'
+                add(
+                    f"- {label} #{item.get('number')}: {item.get('title')} ({item.get('state')})",
+                    f"{label} #{item.get('number')}"
+                )
+        
+        if 'workflows' in github_data:
+            workflows = github_data['workflows']
+            add(f"\n\nWorkflow Runs ({len(workflows)}):", 'workflows')
+            for wf in workflows[:3]:  # Limit to 3 workflows
+                add(
+                    f"- {wf.get('name')}: {wf.get('conclusion', 'running')}",
+                    f"Workflow run {wf.get('id')}"
+                )
+        
+        if 'files' in github_data:
+            files = github_data['files']
+            add(f"\n\nRepository Files: {', '.join(files[:10])}", 'files')
+        
+        return lines
     
     def test_connection(self):
         """
@@ -164,35 +788,12 @@ class GeminiClient:
         """
         Detect the type of query to apply appropriate response structure.
         
+        Uses the keyword matcher compiled from document_templates.json.
+        
         Returns:
             str: 'sox_audit', 'mlops_workflow', 'devops_pipeline', or 'generic'
         """
-        query_lower = query.lower()
-        
-        # SOX/Audit keywords
-        sox_keywords = ['sox control', 'control analysis', 'control objective', 
-                       'testing procedure', 'sox', 'control test', 'audit', 
-                       'compliance', 'internal control']
-        
-        # MLOps keywords
-        mlops_keywords = ['model', 'mlops', 'machine learning', 'training', 
-                         'inference', 'dataset', 'ml pipeline', 'model deployment',
-                         'feature engineering', 'hyperparameter', 'ml workflow']
-        
-        # DevOps keywords
-        devops_keywords = ['pipeline', 'ci/cd', 'deployment', 'build', 'release',
-                          'devops', 'kubernetes', 'docker', 'container', 'jenkins',
-                          'gitlab ci', 'github actions']
-        
-        # Check for each type
-        if any(keyword in query_lower for keyword in sox_keywords):
-            return 'sox_audit'
-        elif any(keyword in query_lower for keyword in mlops_keywords):
-            return 'mlops_workflow'
-        elif any(keyword in query_lower for keyword in devops_keywords):
-            return 'devops_pipeline'
-        else:
-            return 'generic'
+        return self.query_classifier.detect(query)
     
     def _get_sox_audit_instructions(self):
         """SOX audit structured response instructions."""
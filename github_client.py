@@ -2,28 +2,181 @@
 GitHub API client for repository integration.
 Handles authentication and data retrieval from GitHub repositories.
 """
+import contextvars
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from github import Github, GithubException
 from logger import logger
 from config import Config
+from github_http import GitHubHTTP
+from github_mirror import GitHubMirror, PULL_REQUESTS, ISSUES, WORKFLOW_RUNS
+from github_rate_limit import github_priority, BACKGROUND
+
+# Repository metadata, open PRs, open issues and recent workflow runs in
+# one round trip. Workflow runs come from the check suites of the default
+# branch head, the only place GraphQL exposes Actions runs.
+REPOSITORY_CONTEXT_QUERY = """
+query RepositoryContext($owner: String!, $name: String!, $prs: Int!, $issues: Int!, $runs: Int!) {
+  repository(owner: $owner, name: $name) {
+    nameWithOwner
+    description
+    stargazerCount
+    forkCount
+    primaryLanguage { name }
+    createdAt
+    updatedAt
+    openIssues: issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN, first: $prs, orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      nodes { number title state author { login } createdAt updatedAt url }
+    }
+    issues(states: OPEN, first: $issues, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes {
+        number title state author { login } createdAt updatedAt url
+        labels(first: 20) { nodes { name } }
+      }
+    }
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: $runs) {
+            nodes {
+              checkSuites(first: 10) {
+                nodes {
+                  status conclusion createdAt updatedAt
+                  workflowRun { databaseId url workflow { name } }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Repository selected for the current request (owner/name), if any
+_request_repo = contextvars.ContextVar('github_request_repo', default=None)
+
+RepoHandle = namedtuple('RepoHandle', ['full_name', 'repo', 'connected_at'])
+
+
+def parse_repo_name(repo_url):
+    """
+    Get 'owner/name' from a repository URL or an 'owner/name' string.
+    
+    Args:
+        repo_url: Repository URL (https://github.com/owner/repo) or owner/repo
+    
+    Returns:
+        Repository full name
+    """
+    parts = repo_url.strip().rstrip('/').removesuffix('.git').split('/')
+    return f"{parts[-2]}/{parts[-1]}"
+
+
+def pull_request_to_dict(pr):
+    """Map a REST/webhook pull request object to the client's dict shape."""
+    return {
+        'number': pr['number'],
+        'title': pr['title'],
+        'state': pr['state'],
+        'author': pr['user']['login'],
+        'created_at': pr['created_at'],
+        'updated_at': pr['updated_at'],
+        'url': pr['html_url']
+    }
+
+
+def issue_to_dict(issue):
+    """Map a REST/webhook issue object to the client's dict shape."""
+    return {
+        'number': issue['number'],
+        'title': issue['title'],
+        'state': issue['state'],
+        'author': issue['user']['login'],
+        'created_at': issue['created_at'],
+        'updated_at': issue['updated_at'],
+        'labels': [label['name'] for label in issue['labels']],
+        'url': issue['html_url']
+    }
+
+
+def workflow_run_to_dict(run):
+    """Map a REST/webhook workflow run object to the client's dict shape."""
+    return {
+        'id': run['id'],
+        'name': run['name'],
+        'status': run['status'],
+        'conclusion': run['conclusion'],
+        'created_at': run['created_at'],
+        'updated_at': run['updated_at'],
+        'url': run['html_url']
+    }
+
 
 class GitHubClient:
     """Client for interacting with GitHub API."""
     
-    def __init__(self):
-        """Initialize GitHub client."""
+    def __init__(self, connect=True):
+        """
+        Initialize GitHub client.
+        
+        Args:
+            connect: Authenticate and connect the configured repository now;
+                pass False to do it later with initialize() (e.g. in the
+                background at startup)
+        """
         self.github = None
-        self.repo = None
+        self.default_repo = None
+        self.default_full_name = None
+        self.http = None
+        
+        # Connected repositories other than the default, least recently
+        # used first
+        self._repo_pool = OrderedDict()
+        self._pool_lock = threading.Lock()
+        # Per-repository locks held while a repository is being opened, so
+        # concurrent add_repository calls open it only once
+        self._opening_locks = {}
+        self.pool_evictions = 0
+        
+        # Webhook-fed local mirror of PRs, issues and workflow runs
+        self.mirror = GitHubMirror() if Config.GITHUB_WEBHOOK_SECRET else None
+        self._mirror_backfills = set()  # Repositories being backfilled
         self.token = Config.GITHUB_TOKEN
         self.repo_url = Config.GITHUB_REPO_URL
         
+        if connect:
+            self.initialize()
+    
+    def initialize(self):
+        """
+        Authenticate and connect the configured default repository.
+        
+        Makes blocking API calls.
+        
+        Returns:
+            This client
+        """
         # Skip GitHub initialization if token is invalid/placeholder
         if self.token and self.token != 'your_github_personal_access_token_here':
             try:
                 self.github = Github(self.token)
+                self.http = GitHubHTTP(self.token)
                 
                 # Test authentication
                 user = self.github.get_user()
                 logger.info(f"GitHub authenticated as: {user.login}")
+                self._observe_pygithub()
                 
                 # Connect to repository if URL is configured
                 if self.repo_url:
@@ -34,32 +187,186 @@ class GitHubClient:
                 self.github = None
         else:
             logger.warning("GitHub token not configured. GitHub features will be unavailable.")
+        
+        return self
+    
+    @property
+    def full_name(self):
+        """Full name of the repository for the current request."""
+        return _request_repo.get() or self.default_full_name
+    
+    @property
+    def repo(self):
+        """PyGithub repository for the current request, or None."""
+        full_name = _request_repo.get()
+        if full_name is None or full_name == self.default_full_name:
+            return self.default_repo
+        handle = self._repo_pool.get(full_name)
+        return handle.repo if handle else None
+    
+    def _observe_pygithub(self):
+        """
+        Share the core budget PyGithub last saw with the request scheduler.
+        
+        PyGithub requests bypass GitHubHTTP, so their rate-limit headers
+        would otherwise never reach it.
+        """
+        if not self.github or not self.http:
+            return
+        try:
+            remaining, limit = self.github.rate_limiting
+            self.http.scheduler.observe(
+                remaining, limit, self.github.rate_limiting_resettime
+            )
+        except Exception as e:
+            logger.warning(f"Could not read PyGithub rate limit: {e}")
     
     def _connect_repository(self, repo_url):
         """
-        Connect to a GitHub repository.
+        Connect the default repository.
         
         Args:
             repo_url: Repository URL (https://github.com/owner/repo)
         """
         try:
-            # Extract owner and repo name from URL
-            parts = repo_url.rstrip('/').split('/')
-            owner = parts[-2]
-            repo_name = parts[-1]
-            
-            full_name = f"{owner}/{repo_name}"
-            self.repo = self.github.get_repo(full_name)
-            
-            logger.info(f"Connected to repository: {full_name}")
+            handle = self._open_repository(parse_repo_name(repo_url))
+            self.default_repo = handle.repo
+            self.default_full_name = handle.full_name
             
         except Exception as e:
             logger.error(f"Failed to connect to repository {repo_url}: {e}")
             raise
     
+    def _open_repository(self, full_name):
+        """
+        Fetch a repository handle and start its mirror backfill.
+        
+        Args:
+            full_name: Repository full name (owner/name)
+        
+        Returns:
+            RepoHandle
+        """
+        repo = self.github.get_repo(full_name)
+        self._observe_pygithub()
+        logger.info(f"Connected to repository: {full_name}")
+        
+        if self.mirror:
+            self._start_mirror_backfill(full_name)
+        
+        return RepoHandle(full_name, repo, time.time())
+    
+    def add_repository(self, repo_url):
+        """
+        Connect a repository into the pool without changing the default.
+        
+        Pooled repositories are reused across requests; the least recently
+        used one is dropped once the pool is full.
+        
+        Args:
+            repo_url: Repository URL or owner/name
+        
+        Returns:
+            Repository full name
+        
+        Raises:
+            Exception: If the repository cannot be opened
+        """
+        if not self.github:
+            raise Exception("GitHub token not configured")
+        
+        full_name = parse_repo_name(repo_url)
+        if full_name == self.default_full_name:
+            return full_name
+        
+        with self._pool_lock:
+            if full_name in self._repo_pool:
+                self._repo_pool.move_to_end(full_name)
+                return full_name
+            opening = self._opening_locks.setdefault(full_name, threading.Lock())
+        
+        with opening:
+            # Another caller may have opened it while this one waited
+            with self._pool_lock:
+                if full_name in self._repo_pool:
+                    self._repo_pool.move_to_end(full_name)
+                    return full_name
+            
+            try:
+                handle = self._open_repository(full_name)
+            except Exception:
+                with self._pool_lock:
+                    self._opening_locks.pop(full_name, None)
+                raise
+            
+            with self._pool_lock:
+                self._repo_pool[full_name] = handle
+                self._repo_pool.move_to_end(full_name)
+                self._opening_locks.pop(full_name, None)
+                while len(self._repo_pool) > Config.GITHUB_REPO_POOL_SIZE:
+                    evicted, _ = self._repo_pool.popitem(last=False)
+                    self.pool_evictions += 1
+                    logger.info(f"Evicted repository from pool: {evicted}")
+        
+        return full_name
+    
+    def set_request_repository(self, full_name, strict=False):
+        """
+        Select the repository used by the current request (context).
+        
+        Args:
+            full_name: Repository full name, or None for the default
+            strict: Raise if the repository cannot be opened instead of
+                falling back to the default (for user requests, which
+                must not be answered with another repository's data)
+        
+        Returns:
+            Token for reset_request_repository
+        
+        Raises:
+            Exception: If strict and the repository cannot be opened
+        """
+        if full_name:
+            try:
+                full_name = self.add_repository(full_name)
+            except Exception as e:
+                if strict:
+                    raise
+                logger.warning(f"Using default repository; cannot open {full_name}: {e}")
+                full_name = None
+        return _request_repo.set(full_name)
+    
+    def reset_request_repository(self, token):
+        """Restore the repository selection from before set_request_repository."""
+        _request_repo.reset(token)
+    
+    @contextmanager
+    def use_repository(self, full_name):
+        """
+        Run the block against a given repository.
+        
+        Args:
+            full_name: Repository full name, or None for the default
+        """
+        token = self.set_request_repository(full_name)
+        try:
+            yield
+        finally:
+            self.reset_request_repository(token)
+    
+    def get_pool_stats(self):
+        """Get repository pool statistics."""
+        with self._pool_lock:
+            return {
+                'default': self.default_full_name,
+                'pooled': list(self._repo_pool),
+                'max_size': Config.GITHUB_REPO_POOL_SIZE,
+                'evictions': self.pool_evictions
+            }
+    
     def connect_to_repo(self, repo_url):
         """
-        Connect to a different repository.
+        Connect to a different default repository.
         
         Args:
             repo_url: Repository URL
@@ -75,10 +382,13 @@ class GitHubClient:
             logger.error(f"Error connecting to repository: {e}")
             return False
     
-    def get_repository_info(self):
+    def get_repository_info(self, strict=False):
         """
         Get basic repository information.
         
+        Args:
+            strict: Raise API errors instead of returning None
+        
         Returns:
             Dictionary with repository metadata
         """
@@ -86,27 +396,31 @@ class GitHubClient:
             return None
         
         try:
+            repo = self.http.get_json(f"/repos/{self.full_name}")
             return {
-                'name': self.repo.full_name,
-                'description': self.repo.description,
-                'stars': self.repo.stargazers_count,
-                'forks': self.repo.forks_count,
-                'open_issues': self.repo.open_issues_count,
-                'language': self.repo.language,
-                'created_at': str(self.repo.created_at),
-                'updated_at': str(self.repo.updated_at)
+                'name': repo['full_name'],
+                'description': repo['description'],
+                'stars': repo['stargazers_count'],
+                'forks': repo['forks_count'],
+                'open_issues': repo['open_issues_count'],
+                'language': repo['language'],
+                'created_at': repo['created_at'],
+                'updated_at': repo['updated_at']
             }
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error getting repository info: {e}")
             return None
     
-    def get_pull_requests(self, state='open', limit=10):
+    def get_pull_requests(self, state='open', limit=10, strict=False):
         """
         Get pull requests from repository.
         
         Args:
             state: PR state ('open', 'closed', 'all')
             limit: Maximum number of PRs to retrieve
+            strict: Raise API errors instead of returning an empty list
         
         Returns:
             List of pull request data
@@ -114,35 +428,35 @@ class GitHubClient:
         if not self.repo:
             return []
         
+        if self._mirror_ready(PULL_REQUESTS):
+            return self.mirror.list(self.full_name, PULL_REQUESTS, state, limit)
+        
         try:
-            prs = self.repo.get_pulls(state=state)
-            pr_list = []
-            
-            for pr in prs[:limit]:
-                pr_list.append({
-                    'number': pr.number,
-                    'title': pr.title,
-                    'state': pr.state,
-                    'author': pr.user.login,
-                    'created_at': str(pr.created_at),
-                    'updated_at': str(pr.updated_at),
-                    'url': pr.html_url
-                })
-            
+            pr_list = self._fetch_pull_requests(self.full_name, state, limit)
             logger.info(f"Retrieved {len(pr_list)} pull requests")
             return pr_list
             
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error getting pull requests: {e}")
             return []
     
-    def get_issues(self, state='open', limit=10):
+    def _fetch_pull_requests(self, full_name, state, limit):
+        """Fetch pull requests from the REST API."""
+        return self._list_items(
+            f"/repos/{full_name}/pulls", {'state': state}, limit,
+            pull_request_to_dict
+        )
+    
+    def get_issues(self, state='open', limit=10, strict=False):
         """
         Get issues from repository.
         
         Args:
             state: Issue state ('open', 'closed', 'all')
             limit: Maximum number of issues to retrieve
+            strict: Raise API errors instead of returning an empty list
         
         Returns:
             List of issue data
@@ -150,39 +464,209 @@ class GitHubClient:
         if not self.repo:
             return []
         
+        if self._mirror_ready(ISSUES):
+            return self.mirror.list(self.full_name, ISSUES, state, limit)
+        
         try:
-            issues = self.repo.get_issues(state=state)
-            issue_list = []
-            
-            for issue in issues[:limit]:
-                # Skip pull requests (they appear in issues API)
-                if issue.pull_request:
-                    continue
-                
-                issue_list.append({
-                    'number': issue.number,
-                    'title': issue.title,
-                    'state': issue.state,
-                    'author': issue.user.login,
-                    'created_at': str(issue.created_at),
-                    'updated_at': str(issue.updated_at),
-                    'labels': [label.name for label in issue.labels],
-                    'url': issue.html_url
-                })
-            
+            issue_list = self._fetch_issues(self.full_name, state, limit)
             logger.info(f"Retrieved {len(issue_list)} issues")
             return issue_list
             
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error getting issues: {e}")
             return []
     
-    def get_workflow_runs(self, limit=5):
+    def _fetch_issues(self, full_name, state, limit):
+        """Fetch issues (excluding pull requests) from the REST API."""
+        # Skip pull requests (they appear in issues API); later pages are
+        # read until enough real issues are collected
+        return self._list_items(
+            f"/repos/{full_name}/issues", {'state': state}, limit,
+            issue_to_dict,
+            include=lambda issue: not issue.get('pull_request')
+        )
+    
+    def get_repository_context(self, pr_limit=5, issue_limit=5, run_limit=5,
+                               strict=False):
+        """
+        Get repository info, open PRs, open issues and recent workflow runs
+        (those of the latest default-branch commits) with a single GraphQL
+        query.
+        
+        Uses the webhook mirror instead once it is backfilled, and falls
+        back to the REST methods if the GraphQL query fails.
+        
+        Args:
+            pr_limit: Maximum number of open PRs
+            issue_limit: Maximum number of open issues
+            run_limit: Maximum number of workflow runs
+            strict: Report a source whose REST fallback failed as None
+                instead of an empty default
+        
+        Returns:
+            Dictionary with 'repository_info', 'pull_requests', 'issues' and
+            'workflows' in the same shapes as the individual getters
+        """
+        if not self.repo:
+            return None
+        
+        # The webhook mirror answers PR, issue and run listings locally
+        if all(self._mirror_ready(kind) for kind in (PULL_REQUESTS, ISSUES, WORKFLOW_RUNS)):
+            return self._repository_context_from_getters(
+                pr_limit, issue_limit, run_limit, strict
+            )
+        
+        try:
+            owner, name = self.full_name.split('/')
+            data = self.http.post_graphql(REPOSITORY_CONTEXT_QUERY, {
+                'owner': owner,
+                'name': name,
+                'prs': pr_limit,
+                'issues': issue_limit,
+                'runs': run_limit
+            })
+            return self._map_repository_context(data['repository'], run_limit)
+        
+        except Exception as e:
+            logger.warning(f"GraphQL repository context failed, using REST: {e}")
+            return self._repository_context_from_getters(
+                pr_limit, issue_limit, run_limit, strict
+            )
+    
+    def _repository_context_from_getters(self, pr_limit, issue_limit, run_limit,
+                                         strict=False):
+        """
+        Build the repository context from the individual getters.
+        
+        The four REST calls run concurrently, so the fallback costs about
+        one round trip of latency, like the GraphQL query it replaces. In
+        strict mode a failed source is None, and the others are kept.
+        """
+        fetches = {
+            'repository_info': lambda: self.get_repository_info(strict=strict),
+            'pull_requests': lambda: self.get_pull_requests(
+                state='open', limit=pr_limit, strict=strict
+            ),
+            'issues': lambda: self.get_issues(
+                state='open', limit=issue_limit, strict=strict
+            ),
+            'workflows': lambda: self.get_workflow_runs(limit=run_limit, strict=strict)
+        }
+        with ThreadPoolExecutor(max_workers=len(fetches)) as pool:
+            # Worker threads do not inherit the request's repository context
+            futures = {
+                key: pool.submit(contextvars.copy_context().run, fetch)
+                for key, fetch in fetches.items()
+            }
+            context = {}
+            for key, future in futures.items():
+                try:
+                    context[key] = future.result()
+                except Exception as e:
+                    logger.error(f"Error getting {key}: {e}")
+                    context[key] = None
+            return context
+    
+    def _map_repository_context(self, repo, run_limit):
+        """
+        Map a GraphQL repository object to the REST-style dict shapes.
+        
+        Args:
+            repo: 'repository' object from REPOSITORY_CONTEXT_QUERY
+            run_limit: Maximum number of workflow runs
+        
+        Returns:
+            Repository context dictionary
+        """
+        def login(node):
+            # Deleted accounts come back as a null author
+            return node['author']['login'] if node.get('author') else 'ghost'
+        
+        def lower(value):
+            return value.lower() if value else None
+        
+        pull_requests = repo['pullRequests']
+        language = repo.get('primaryLanguage')
+        
+        repository_info = {
+            'name': repo['nameWithOwner'],
+            'description': repo['description'],
+            'stars': repo['stargazerCount'],
+            'forks': repo['forkCount'],
+            # REST's open_issues_count includes open pull requests
+            'open_issues': repo['openIssues']['totalCount'] + pull_requests['totalCount'],
+            'language': language['name'] if language else None,
+            'created_at': repo['createdAt'],
+            'updated_at': repo['updatedAt']
+        }
+        
+        pr_list = [{
+            'number': pr['number'],
+            'title': pr['title'],
+            'state': lower(pr['state']),
+            'author': login(pr),
+            'created_at': pr['createdAt'],
+            'updated_at': pr['updatedAt'],
+            'url': pr['url']
+        } for pr in pull_requests['nodes']]
+        
+        issue_list = [{
+            'number': issue['number'],
+            'title': issue['title'],
+            'state': lower(issue['state']),
+            'author': login(issue),
+            'created_at': issue['createdAt'],
+            'updated_at': issue['updatedAt'],
+            'labels': [label['name'] for label in issue['labels']['nodes']],
+            'url': issue['url']
+        } for issue in repo['issues']['nodes']]
+        
+        workflow_list = []
+        target = (repo.get('defaultBranchRef') or {}).get('target') or {}
+        commits = (target.get('history') or {}).get('nodes', [])
+        # Check suites of the latest default-branch commits, newest first
+        # like the REST listing (suites of other apps have no workflow run)
+        suites = sorted(
+            (
+                suite for commit in commits
+                for suite in (commit.get('checkSuites') or {}).get('nodes', [])
+                if suite.get('workflowRun')
+            ),
+            key=lambda suite: suite['createdAt'],
+            reverse=True
+        )
+        for suite in suites[:run_limit]:
+            run = suite['workflowRun']
+            workflow_list.append({
+                'id': run['databaseId'],
+                'name': run['workflow']['name'],
+                'status': lower(suite['status']),
+                'conclusion': lower(suite['conclusion']),
+                'created_at': suite['createdAt'],
+                'updated_at': suite['updatedAt'],
+                'url': run['url']
+            })
+        
+        logger.info(
+            f"Retrieved repository context via GraphQL: {len(pr_list)} PRs, "
+            f"{len(issue_list)} issues, {len(workflow_list)} workflow runs"
+        )
+        return {
+            'repository_info': repository_info,
+            'pull_requests': pr_list,
+            'issues': issue_list,
+            'workflows': workflow_list
+        }
+    
+    def get_workflow_runs(self, limit=5, strict=False):
         """
         Get recent workflow runs.
         
         Args:
             limit: Maximum number of workflow runs to retrieve
+            strict: Raise API errors instead of returning an empty list
         
         Returns:
             List of workflow run data
@@ -190,48 +674,281 @@ class GitHubClient:
         if not self.repo:
             return []
         
+        if self._mirror_ready(WORKFLOW_RUNS):
+            return self.mirror.list(self.full_name, WORKFLOW_RUNS, limit=limit)
+        
         try:
-            workflows = self.repo.get_workflow_runs()
-            workflow_list = []
-            
-            for wf in workflows[:limit]:
-                workflow_list.append({
-                    'id': wf.id,
-                    'name': wf.name,
-                    'status': wf.status,
-                    'conclusion': wf.conclusion,
-                    'created_at': str(wf.created_at),
-                    'updated_at': str(wf.updated_at),
-                    'url': wf.html_url
-                })
-            
+            workflow_list = self._fetch_workflow_runs(self.full_name, limit)
             logger.info(f"Retrieved {len(workflow_list)} workflow runs")
             return workflow_list
             
         except Exception as e:
+            if strict:
+                raise
             logger.error(f"Error getting workflow runs: {e}")
             return []
     
+    def _fetch_workflow_runs(self, full_name, limit):
+        """Fetch workflow runs from the REST API."""
+        return self._list_items(
+            f"/repos/{full_name}/actions/runs", {}, limit,
+            workflow_run_to_dict, items_key='workflow_runs'
+        )
+    
+    def iter_issues_updated_since(self, since):
+        """
+        Page through issues and pull requests updated since a timestamp,
+        oldest update first.
+        
+        The issues API returns pull requests too (marked by a
+        'pull_request' key), so one listing covers both.
+        
+        Args:
+            since: ISO 8601 timestamp (e.g. '2024-01-01T00:00:00Z')
+        
+        Yields:
+            Raw issue objects from the REST API
+        """
+        if not self.repo:
+            return
+        
+        params = {
+            'state': 'all',
+            'sort': 'updated',
+            'direction': 'asc',
+            'since': since,
+            'per_page': Config.GITHUB_MAX_PER_PAGE
+        }
+        for page in self.http.iter_pages(f"/repos/{self.full_name}/issues", params):
+            yield from page
+    
+    def iter_open_issues(self):
+        """
+        Page through every open issue and pull request, however old.
+        
+        Yields:
+            Raw issue objects from the REST API
+        """
+        if not self.repo:
+            return
+        
+        params = {'state': 'open', 'per_page': Config.GITHUB_MAX_PER_PAGE}
+        for page in self.http.iter_pages(f"/repos/{self.full_name}/issues", params):
+            yield from page
+    
+    def iter_workflow_run_pages(self, created_since, created_until):
+        """
+        Page through the workflow runs created in a time window.
+        
+        GitHub returns at most 1,000 runs for a filtered listing; callers
+        compare each page's 'total_count' with that cap and narrow the
+        window when it is exceeded.
+        
+        Args:
+            created_since: ISO 8601 start of the window (inclusive)
+            created_until: ISO 8601 end of the window (inclusive)
+        
+        Yields:
+            Raw listing pages ({'total_count': ..., 'workflow_runs': [...]})
+        """
+        if not self.repo:
+            return
+        
+        params = {
+            'created': f'{created_since}..{created_until}',
+            'per_page': Config.GITHUB_MAX_PER_PAGE
+        }
+        yield from self.http.iter_pages(f"/repos/{self.full_name}/actions/runs", params)
+    
+    def _list_items(self, path, params, limit, to_dict, include=None,
+                    items_key=None):
+        """
+        Collect up to `limit` items from a paginated REST listing.
+        
+        Pages are requested only until enough items are collected, and
+        fields are read from the raw payload, so there are no lazy
+        per-item requests.
+        
+        Args:
+            path: Listing API path
+            params: Query parameters (per_page is added)
+            limit: Maximum number of items to return (None for all)
+            to_dict: Maps a raw item to the client's dict shape
+            include: Optional predicate selecting which raw items count
+            items_key: Key holding the items when the page is an object
+        
+        Returns:
+            List of item dicts
+        """
+        # A filtered listing interleaves items that do not count (e.g. pull
+        # requests in the issues API), so small pages would cost extra
+        # requests; request full pages for it
+        per_page = (Config.GITHUB_MAX_PER_PAGE if include is not None or limit is None
+                    else min(limit, Config.GITHUB_MAX_PER_PAGE))
+        params = dict(params, per_page=per_page)
+        items = []
+        
+        for page in self.http.iter_pages(path, params):
+            raw_items = page[items_key] if items_key else page
+            for raw in raw_items:
+                if include is None or include(raw):
+                    items.append(to_dict(raw))
+                    if limit is not None and len(items) >= limit:
+                        return items
+            if len(raw_items) < params['per_page']:
+                break
+        
+        return items
+    
+    def _mirror_ready(self, kind):
+        """
+        Check whether reads of one kind can be served by the mirror.
+        
+        A backfill older than GITHUB_MIRROR_RESYNC_INTERVAL starts a resync
+        in the background; the mirror keeps serving reads meanwhile.
+        """
+        if self.mirror is None:
+            return False
+        
+        backfilled_at = self.mirror.backfilled_at(self.full_name, kind)
+        if backfilled_at is None:
+            return False
+        if time.time() - backfilled_at > Config.GITHUB_MIRROR_RESYNC_INTERVAL:
+            self._start_mirror_backfill(self.full_name)
+        return True
+    
+    def _start_mirror_backfill(self, full_name):
+        """Backfill a repository's mirror in the background, once at a time."""
+        with self._pool_lock:
+            if full_name in self._mirror_backfills:
+                return
+            self._mirror_backfills.add(full_name)
+        
+        def run():
+            try:
+                self.backfill_mirror(full_name)
+            finally:
+                with self._pool_lock:
+                    self._mirror_backfills.discard(full_name)
+        
+        threading.Thread(target=run, name='github-mirror-backfill', daemon=True).start()
+    
+    def backfill_mirror(self, full_name=None):
+        """
+        Load existing PRs, issues and workflow runs into the mirror.
+        
+        Every open PR and issue is loaded, plus the most recent
+        GITHUB_MIRROR_BACKFILL_LIMIT items of any state. Mirrored open items
+        that GitHub no longer lists as open are removed. Runs when a
+        repository is connected, and again once the previous backfill is
+        older than GITHUB_MIRROR_RESYNC_INTERVAL, so webhook events missed
+        while the app was down are repaired.
+        
+        Args:
+            full_name: Repository full name (defaults to the connected repo)
+        """
+        if not self.mirror:
+            return
+        
+        full_name = full_name or self.full_name
+        limit = Config.GITHUB_MIRROR_BACKFILL_LIMIT
+        fetchers = {
+            PULL_REQUESTS: (
+                lambda state, count: self._fetch_pull_requests(full_name, state, count),
+                'number'
+            ),
+            ISSUES: (
+                lambda state, count: self._fetch_issues(full_name, state, count),
+                'number'
+            ),
+            WORKFLOW_RUNS: (
+                lambda state, count: self._fetch_workflow_runs(full_name, count), 'id'
+            )
+        }
+        
+        for kind, (fetch, key_field) in fetchers.items():
+            backfilled_at = self.mirror.backfilled_at(full_name, kind)
+            if (backfilled_at is not None and
+                    time.time() - backfilled_at <= Config.GITHUB_MIRROR_RESYNC_INTERVAL):
+                continue
+            try:
+                started = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                with github_priority(BACKGROUND):
+                    items = fetch('all', limit)
+                    open_items = fetch('open', None) if kind != WORKFLOW_RUNS else []
+                self.mirror.upsert_many(full_name, kind, items + open_items, key_field)
+                removed = 0
+                if kind != WORKFLOW_RUNS:
+                    removed = self.mirror.prune_open(
+                        full_name, kind,
+                        [item[key_field] for item in open_items], started
+                    )
+                self.mirror.mark_backfilled(full_name, kind)
+                logger.info(
+                    f"Backfilled {len(items) + len(open_items)} {kind} for {full_name}"
+                    f" ({removed} no longer open removed)"
+                )
+            except Exception as e:
+                logger.error(f"Error backfilling {kind} for {full_name}: {e}")
+    
+    def apply_webhook_event(self, event, payload):
+        """
+        Apply a GitHub webhook event to the mirror.
+        
+        Args:
+            event: Value of the X-GitHub-Event header
+            payload: Parsed event payload
+        
+        Returns:
+            True if the event changed the mirror, False if it was ignored
+        """
+        if not self.mirror or 'repository' not in payload:
+            return False
+        
+        full_name = payload['repository']['full_name']
+        action = payload.get('action')
+        
+        if event == 'pull_request':
+            pr = pull_request_to_dict(payload['pull_request'])
+            self.mirror.upsert(full_name, PULL_REQUESTS, pr['number'], pr)
+        elif event == 'issues':
+            issue = payload['issue']
+            # A transferred issue now belongs to another repository
+            if action in ('deleted', 'transferred'):
+                self.mirror.delete(full_name, ISSUES, issue['number'])
+            elif not issue.get('pull_request'):
+                self.mirror.upsert(
+                    full_name, ISSUES, issue['number'], issue_to_dict(issue)
+                )
+        elif event == 'workflow_run':
+            run = workflow_run_to_dict(payload['workflow_run'])
+            self.mirror.upsert(full_name, WORKFLOW_RUNS, run['id'], run)
+        else:
+            return False
+        
+        self.mirror.events_applied += 1
+        return True
+    
     def get_repository_files(self, path='', limit=20):
         """
-        Get files from repository.
+        Get files from repository, including subdirectories.
         
         Args:
             path: Directory path in repository
             limit: Maximum number of files to retrieve
         
         Returns:
-            List of file names
+            List of file paths
         """
         if not self.repo:
             return []
         
         try:
-            contents = self.repo.get_contents(path)
-            file_list = []
-            
-            for content in contents[:limit]:
-                file_list.append(content.path)
+            prefix = f"{path.strip('/')}/" if path.strip('/') else ''
+            file_list = [
+                entry['path'] for entry in self.get_tree()
+                if entry['path'].startswith(prefix)
+            ][:limit]
             
             logger.info(f"Retrieved {len(file_list)} files from repository")
             return file_list
@@ -240,6 +957,51 @@ class GitHubClient:
             logger.error(f"Error getting repository files: {e}")
             return []
     
+    def get_tree(self, ref='HEAD'):
+        """
+        List every file in the repository with one recursive Git Trees call.
+        
+        The response is cached with its ETag, so an unchanged tree costs a
+        304 on the next call.
+        
+        Args:
+            ref: Branch, tag or commit SHA
+        
+        Returns:
+            List of dictionaries with path, sha and size of each blob
+        
+        Raises:
+            Exception: If not connected or the API call fails
+        """
+        if not self.repo:
+            raise Exception("Not connected to a repository")
+        
+        data = self.http.get_json(
+            f"/repos/{self.full_name}/git/trees/{ref}",
+            params={'recursive': '1'}
+        )
+        if data.get('truncated'):
+            logger.warning(f"Git tree of {self.full_name} is truncated; some files are not listed")
+        
+        return [
+            {'path': entry['path'], 'sha': entry['sha'], 'size': entry.get('size', 0)}
+            for entry in data.get('tree', [])
+            if entry['type'] == 'blob'
+        ]
+    
+    def get_blob_text(self, sha):
+        """
+        Download a Git blob as text.
+        
+        Args:
+            sha: Blob SHA
+        
+        Returns:
+            Decoded file content
+        """
+        content = self.http.get_raw(f"/repos/{self.full_name}/git/blobs/{sha}")
+        return content.decode('utf-8', errors='replace')
+    
     def trigger_workflow(self, workflow_id, ref='main', inputs=None):
         """
         Manually trigger a GitHub Actions workflow.
@@ -259,6 +1021,7 @@ class GitHubClient:
         try:
             workflow = self.repo.get_workflow(workflow_id)
             result = workflow.create_dispatch(ref=ref, inputs=inputs or {})
+            self._observe_pygithub()
             
             logger.info(f"Triggered workflow: {workflow_id} on {ref}")
             return True
@@ -288,6 +1051,7 @@ class GitHubClient:
                     'path': wf.path,
                     'state': wf.state
                 })
+            self._observe_pygithub()
             
             logger.info(f"Retrieved {len(workflow_list)} workflows")
             return workflow_list
@@ -300,50 +1064,59 @@ class GitHubClient:
         """Check if GitHub client is connected to a repository."""
         return self.github is not None and self.repo is not None
     
-    def trigger_process_workflow(self, process_name, process_data, analysis_type='standard', workflow_file='process-analysis-doc.yml'):
+    def get_rate_limit_stats(self):
+        """Get GitHub rate-limit budget state."""
+        return self.http.scheduler.get_stats() if self.http else None
+    
+    def get_cache_stats(self):
+        """Get GitHub response cache statistics."""
+        return self.http.get_stats() if self.http else None
+    
+    def get_mirror_stats(self):
+        """Get local mirror statistics."""
+        return self.mirror.get_stats() if self.mirror else None
+    
+    def trigger_process_workflow(self, process_name, process_data, analysis_type='standard', workflow_file='process-analysis-doc.yml', correlation_id=None):
         """
         Trigger the Process Analysis workflow.
         
+        Returns as soon as the dispatch is accepted. The run ID is resolved
+        afterwards by matching correlation_id, which the workflow echoes
+        into its run name (see workflow_dispatch.DispatchTracker).
+        
         Args:
             process_name: Name of the process/control/workflow
             process_data: Process data and context
             analysis_type: Type of analysis (standard, detailed, summary)
             workflow_file: Workflow filename (default: process-analysis-doc.yml)
+            correlation_id: Token identifying this dispatch's run
         
         Returns:
-            Dictionary with workflow run information
+            Dictionary with dispatch information
         """
         if not self.repo:
             logger.error("No repository connected")
             raise Exception("GitHub repository not connected")
         
         try:
-            workflow = self.repo.get_workflow(workflow_file)
-            
             # Prepare inputs
             inputs = {
                 'process_name': process_name,
                 'process_data': process_data,
                 'analysis_type': analysis_type
             }
+            if correlation_id:
+                inputs['correlation_id'] = correlation_id
             
-            # Trigger workflow
-            result = workflow.create_dispatch(ref='main', inputs=inputs)
+            # Trigger workflow (a single API call)
+            self.dispatch_workflow(workflow_file, inputs)
             
             logger.info(f"Triggered process workflow for: {process_name}")
             
-            # Get the latest run ID (this is approximate)
-            import time
-            time.sleep(2)  # Wait for workflow to start
-            
-            runs = workflow.get_runs()
-            latest_run = runs[0] if runs.totalCount > 0 else None
-            
             return {
                 'success': True,
-                'workflow_name': workflow.name,
-                'run_id': latest_run.id if latest_run else None,
-                'run_url': latest_run.html_url if latest_run else None
+                'workflow_file': workflow_file,
+                'correlation_id': correlation_id
             }
             
         except Exception as e:
@@ -360,10 +1133,67 @@ class GitHubClient:
             else:
                 raise
     
+    def dispatch_workflow(self, workflow_file, inputs, ref='main'):
+        """
+        Create a workflow_dispatch event with one REST call.
+        
+        Args:
+            workflow_file: Workflow filename or ID
+            inputs: Workflow inputs
+            ref: Git reference to run on
+        """
+        self.http.post_json(
+            f"/repos/{self.full_name}/actions/workflows/{workflow_file}/dispatches",
+            {'ref': ref, 'inputs': inputs}
+        )
+    
+    def list_dispatched_runs(self, workflow_file, created_since, correlation_ids=None):
+        """
+        List a workflow's dispatched runs created since a given time.
+        
+        Always revalidates (304s are free) so new runs show up promptly.
+        Pages are followed until every correlation ID has been seen in a
+        run's title, or the created window runs out.
+        
+        Args:
+            workflow_file: Workflow filename or ID
+            created_since: ISO 8601 timestamp
+            correlation_ids: Tokens being looked for; without them every
+                page in the window is read
+        
+        Returns:
+            List of raw run objects (including 'display_title')
+        """
+        missing = set(correlation_ids or ())
+        runs = []
+        for page in self.http.iter_pages(
+            f"/repos/{self.full_name}/actions/workflows/{workflow_file}/runs",
+            params={
+                'event': 'workflow_dispatch',
+                'created': f'>={created_since}',
+                'per_page': Config.GITHUB_MAX_PER_PAGE
+            },
+            revalidate=True
+        ):
+            runs.extend(page['workflow_runs'])
+            if missing:
+                titles = [run.get('display_title') or '' for run in page['workflow_runs']]
+                missing = {
+                    token for token in missing
+                    if not any(token in title for title in titles)
+                }
+                if not missing:
+                    break
+        return runs
+    
     def check_and_download_artifact(self, run_id, artifact_name='process-report'):
         """
         Check for workflow artifacts and download if available.
         
+        The archive is streamed to a temporary file (resuming interrupted
+        transfers) and only the report entry is extracted, so memory use
+        stays bounded regardless of artifact size.
+        
         Args:
             run_id: GitHub Actions workflow run ID
             artifact_name: Name of the artifact to download
@@ -375,40 +1205,53 @@ class GitHubClient:
             logger.error("No repository connected")
             return {'success': False, 'error': 'GitHub repository not connected'}
         
+        # Artifact polling is background work: skip this poll rather than
+        # wait when the budget is reserved for chat (a read-only check; the
+        # requests below are counted when they are sent)
+        wait = self.http.scheduler.would_block(BACKGROUND)
+        if wait is not None:
+            return {
+                'success': False,
+                'status': 'rate_limited',
+                'message': (
+                    f'GitHub rate limit: background request deferred for '
+                    f'{wait:.0f}s. Please try again shortly.'
+                )
+            }
+        
+        archive_path = None
         try:
-            import os
-            import requests
-            import zipfile
-            import io
-            
-            # Get the workflow run
-            run = self.repo.get_workflow_run(run_id)
+            # Get the workflow run (revalidated, since polling waits for changes)
+            run = self.http.get_json(
+                f"/repos/{self.full_name}/actions/runs/{run_id}", revalidate=True
+            )
             
             # Check run status
-            if run.status != 'completed':
+            if run['status'] != 'completed':
                 return {
                     'success': False,
-                    'status': run.status,
-                    'message': f'Workflow is {run.status}. Please wait for completion.'
+                    'status': run['status'],
+                    'message': f"Workflow is {run['status']}. Please wait for completion."
                 }
             
             # Check if run was successful
-            if run.conclusion != 'success':
+            if run['conclusion'] != 'success':
                 return {
                     'success': False,
-                    'status': run.status,
-                    'conclusion': run.conclusion,
-                    'message': f'Workflow {run.conclusion}. No artifact available.'
+                    'status': run['status'],
+                    'conclusion': run['conclusion'],
+                    'message': f"Workflow {run['conclusion']}. No artifact available."
                 }
             
             # Get artifacts
-            artifacts = run.get_artifacts()
+            artifacts = self.http.get_json(
+                f"/repos/{self.full_name}/actions/runs/{run_id}/artifacts",
+                params={'name': artifact_name}
+            )['artifacts']
             
-            target_artifact = None
-            for artifact in artifacts:
-                if artifact.name == artifact_name:
-                    target_artifact = artifact
-                    break
+            target_artifact = next(
+                (a for a in artifacts if a['name'] == artifact_name), None
+            )
             
             if not target_artifact:
                 return {
@@ -416,32 +1259,22 @@ class GitHubClient:
                     'message': f'Artifact "{artifact_name}" not found in workflow run.'
                 }
             
-            # Download artifact
-            # Note: PyGithub doesn't directly support artifact download, need to use API
-            headers = {
-                'Authorization': f'token {self.token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            
-            download_url = target_artifact.archive_download_url
-            response = requests.get(download_url, headers=headers)
-            
-            if response.status_code != 200:
-                return {
-                    'success': False,
-                    'message': f'Failed to download artifact: HTTP {response.status_code}'
-                }
-            
-            # Extract zip file
+            # Stream the archive to disk
             os.makedirs('generated_reports', exist_ok=True)
+            fd, archive_path = tempfile.mkstemp(suffix='.zip', dir='generated_reports')
+            os.close(fd)
+            self.http.download(target_artifact['archive_download_url'], archive_path)
             
-            with zipfile.ZipFile(io.BytesIO(response.content)) as zip_ref:
-                # Extract all files from the artifact
-                for file_info in zip_ref.filelist:
+            # Extract only the report entry; the run ID keeps reports of the
+            # same process generated in the same second apart
+            with zipfile.ZipFile(archive_path) as zip_ref:
+                for file_info in zip_ref.infolist():
                     if file_info.filename.endswith('.docx'):
-                        # Extract to generated_reports folder
-                        zip_ref.extract(file_info.filename, 'generated_reports')
-                        extracted_filename = file_info.filename
+                        stem = os.path.splitext(os.path.basename(file_info.filename))[0]
+                        extracted_filename = f"{stem}_run{run_id}.docx"
+                        with zip_ref.open(file_info) as src, open(
+                                os.path.join('generated_reports', extracted_filename), 'wb') as dst:
+                            shutil.copyfileobj(src, dst)
                         
                         logger.info(f"Downloaded artifact: {extracted_filename}")
                         
@@ -464,6 +1297,9 @@ class GitHubClient:
                 'success': False,
                 'error': str(e)
             }
+        finally:
+            if archive_path and os.path.exists(archive_path):
+                os.remove(archive_path)
     
     # Backward compatibility alias
     def trigger_sox_workflow(self, control_name, control_data, analysis_type='standard'):
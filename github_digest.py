@@ -0,0 +1,247 @@
+"""
+Prompt-ready GitHub digest of each connected repository.
+A background thread periodically fetches repository metadata, open pull
+requests and issues, and the recent workflow run history, and formats them
+once into a compact text block. Chat requests read the block from memory
+instead of fetching and formatting GitHub data per request.
+"""
+import threading
+import time
+from datetime import datetime
+from logger import logger
+from config import Config
+from github_rate_limit import github_priority, BACKGROUND
+from workflow_history import FAILED_CONCLUSIONS, IGNORED_CONCLUSIONS
+
+# Sections that related items from the issue/PR index can stand in for
+INDEXED_SECTIONS = ('pull_requests', 'issues')
+
+
+def workflow_health(runs):
+    """
+    Summarize recent workflow runs per workflow.
+
+    Args:
+        runs: Workflow run dicts, newest first
+
+    Returns:
+        List of dicts with workflow name, completed runs, failures and the
+        latest conclusion (None while the latest run is in progress)
+    """
+    health = {}
+    for run in runs:
+        entry = health.setdefault(run['name'], {
+            'workflow': run['name'], 'runs': 0, 'failed': 0,
+            'latest': run['conclusion'] if run['status'] == 'completed' else None
+        })
+        if run['status'] != 'completed' or run['conclusion'] in IGNORED_CONCLUSIONS:
+            continue
+        entry['runs'] += 1
+        if run['conclusion'] in FAILED_CONCLUSIONS:
+            entry['failed'] += 1
+    return list(health.values())
+
+
+def format_digest_sections(context):
+    """
+    Format repository context as compact prompt blocks, one per section.
+
+    Args:
+        context: Dictionary from GitHubClient.get_repository_context, with
+            'workflows' holding the recent workflow runs, newest first
+
+    Returns:
+        Dict of section name ('repository', 'pull_requests', 'issues',
+        'workflows') to text, in prompt order
+    """
+    sections = {}
+    info = context.get('repository_info') or {}
+    if info:
+        sections['repository'] = (
+            f"Repository: {info.get('name', 'N/A')} - "
+            f"{info.get('description') or 'No description'}\n"
+            f"Language: {info.get('language') or 'N/A'} | "
+            f"Stars: {info.get('stars', 'N/A')} | "
+            f"Forks: {info.get('forks', 'N/A')} | "
+            f"Open issues: {info.get('open_issues', 'N/A')}"
+        )
+
+    prs = context.get('pull_requests') or []
+    lines = [f"\nOpen Pull Requests ({len(prs)}):"]
+    lines.extend(
+        f"- #{pr['number']}: {pr['title']} (by {pr.get('author', 'unknown')})"
+        for pr in prs
+    )
+    sections['pull_requests'] = "\n".join(lines)
+
+    issues = context.get('issues') or []
+    lines = [f"\nOpen Issues ({len(issues)}):"]
+    for issue in issues:
+        labels = f" [{', '.join(issue['labels'])}]" if issue.get('labels') else ''
+        lines.append(f"- #{issue['number']}: {issue['title']}{labels}")
+    sections['issues'] = "\n".join(lines)
+
+    runs = context.get('workflows') or []
+    lines = [f"\nWorkflow Health (last {len(runs)} runs):"]
+    for entry in workflow_health(runs):
+        rate = f"{entry['failed'] / entry['runs']:.0%}" if entry['runs'] else 'n/a'
+        lines.append(
+            f"- {entry['workflow']}: {entry['failed']}/{entry['runs']} failed "
+            f"({rate}), latest: {entry['latest'] or 'running'}"
+        )
+    sections['workflows'] = "\n".join(lines)
+
+    return sections
+
+
+def format_digest(context, omit=()):
+    """
+    Format repository context as a compact prompt block.
+
+    Args:
+        context: Dictionary from GitHubClient.get_repository_context, with
+            'workflows' holding the recent workflow runs, newest first
+        omit: Section names to leave out
+
+    Returns:
+        Digest text
+    """
+    return join_sections(format_digest_sections(context), omit)
+
+
+def join_sections(sections, omit=()):
+    """Join digest sections into one block, leaving out the omitted ones."""
+    return "\n".join(
+        text for name, text in sections.items() if name not in omit
+    )
+
+
+class GitHubDigest:
+    """In-memory digests of every connected repository, kept fresh in the background."""
+
+    def __init__(self, github_client):
+        """
+        Initialize the digest store (the refresher starts with start()).
+
+        Args:
+            github_client: GitHubClient the digests are built from
+        """
+        self.github_client = github_client
+        self._digests = {}  # Repository -> (sections, refreshed_at epoch)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {'refreshes': 0, 'hits': 0, 'misses': 0, 'errors': 0}
+
+    def start(self):
+        """Start the background refresher."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._refresh_loop, name='github-digest', daemon=True
+            )
+            self._thread.start()
+
+    def _refresh_loop(self):
+        """Refresh every connected repository once per interval."""
+        next_full = 0.0
+        while True:
+            self._wake.clear()
+            pool = self.github_client.get_pool_stats()
+            repositories = [pool['default']] + pool['pooled'] if pool['default'] else pool['pooled']
+
+            # Between full refreshes only repositories without a digest are
+            # built (a chat request for one wakes the loop early)
+            full = time.monotonic() >= next_full
+            for repository in repositories:
+                if not full and repository in self._digests:
+                    continue
+                try:
+                    with github_priority(BACKGROUND), \
+                            self.github_client.use_repository(repository):
+                        self.refresh()
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    logger.error(f"Error refreshing GitHub digest of {repository}: {e}")
+
+            if full and repositories:
+                next_full = time.monotonic() + Config.GITHUB_DIGEST_REFRESH
+            # Retry soon while GitHub is still connecting at startup
+            self._wake.wait(max(next_full - time.monotonic(), 0) if repositories else 5)
+
+    def refresh(self):
+        """
+        Rebuild the digest of the current repository.
+
+        Returns:
+            Digest text, or None if GitHub is not connected
+        """
+        repository = self.github_client.full_name
+        if not repository or not self.github_client.is_connected():
+            return None
+
+        # One GraphQL round trip, including the run history of the latest
+        # default-branch commits; REST is only used if GraphQL fails
+        context = self.github_client.get_repository_context(
+            pr_limit=Config.GITHUB_DIGEST_ITEMS,
+            issue_limit=Config.GITHUB_DIGEST_ITEMS,
+            run_limit=Config.GITHUB_DIGEST_RUNS,
+            strict=True
+        )
+        if not context:
+            return None
+        # A failed fetch keeps the previous digest rather than replacing it
+        # with one that shows no pull requests or issues
+        failed = [source for source, data in context.items() if data is None]
+        if failed:
+            raise RuntimeError(f"Could not fetch {', '.join(failed)}")
+
+        sections = format_digest_sections(context)
+        with self._lock:
+            self._digests[repository] = (sections, time.time())
+            self.stats['refreshes'] += 1
+        return join_sections(sections)
+
+    def get(self, repository):
+        """
+        Get the digest of a repository.
+
+        Args:
+            repository: Repository full name
+
+        Returns:
+            Dict with the digest 'text', its 'sections' (for callers that
+            leave some out), 'refreshed_at', 'age_seconds' and 'stale'
+            (older than Config.GITHUB_DIGEST_MAX_AGE), or None if the
+            repository has no digest yet
+        """
+        with self._lock:
+            digest = self._digests.get(repository)
+            if digest is None:
+                self.stats['misses'] += 1
+            else:
+                self.stats['hits'] += 1
+
+        if digest is None:
+            self._wake.set()
+            return None
+
+        sections, refreshed_at = digest
+        age = time.time() - refreshed_at
+        return {
+            'text': join_sections(sections),
+            'sections': sections,
+            'refreshed_at': datetime.fromtimestamp(refreshed_at).isoformat(),
+            'age_seconds': round(age, 1),
+            'stale': age > Config.GITHUB_DIGEST_MAX_AGE
+        }
+
+    def get_stats(self):
+        """Get refresh and lookup statistics with each digest's age."""
+        now = time.time()
+        with self._lock:
+            return dict(self.stats, repositories={
+                repository: round(now - refreshed_at, 1)
+                for repository, (_, refreshed_at) in self._digests.items()
+            })
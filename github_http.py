@@ -0,0 +1,345 @@
+"""
+HTTP layer for GitHub REST and GraphQL reads.
+Caches responses with their ETag/Last-Modified validators, serves them
+without a request while fresh, and revalidates with conditional requests
+afterwards (304 responses do not count against the rate limit). Also sends
+GraphQL queries, whose results are cached for the freshness TTL only.
+"""
+import threading
+import time
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+from logger import logger
+from config import Config
+from github_rate_limit import (
+    RateLimitScheduler, GitHubRateLimitError, GRAPHQL, resource_for
+)
+
+
+class GitHubHTTP:
+    """Pooled REST session with a conditional-request response cache."""
+
+    def __init__(self, token, base_url=None, graphql_url=None, ttl=None,
+                 max_entries=None, scheduler=None):
+        """
+        Initialize the HTTP layer.
+
+        Args:
+            token: GitHub token used for authentication
+            base_url: REST API root (defaults to Config.GITHUB_API_URL)
+            graphql_url: GraphQL endpoint (defaults to Config.GITHUB_GRAPHQL_URL)
+            ttl: Seconds a cached response is served without revalidating
+                (defaults to Config.GITHUB_CACHE_TTL)
+            max_entries: Cached responses kept before the least recently
+                used is dropped (defaults to Config.GITHUB_CACHE_MAX_ENTRIES)
+            scheduler: RateLimitScheduler gating outgoing requests
+        """
+        self.base_url = (base_url or Config.GITHUB_API_URL).rstrip('/')
+        self.graphql_url = graphql_url or Config.GITHUB_GRAPHQL_URL
+        self.ttl = Config.GITHUB_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or Config.GITHUB_CACHE_MAX_ENTRIES
+
+        # One keep-alive connection pool shared by API and artifact traffic
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=Config.GITHUB_HTTP_POOL_SIZE
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'token {token}',
+            'Accept': 'application/vnd.github.v3+json'
+        })
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'fresh_hits': 0,
+            'not_modified': 0,
+            'fetched': 0,
+            'graphql_requests': 0,
+            'stale_served': 0
+        }
+        self.scheduler = scheduler or RateLimitScheduler()
+
+    def get_json(self, path, params=None, revalidate=False):
+        """
+        GET a REST resource, using the cache where possible.
+
+        Args:
+            path: API path (e.g. '/repos/owner/name') or absolute URL
+            params: Optional query parameters
+            revalidate: Skip the freshness TTL and always send a
+                conditional request (for callers polling for changes)
+
+        Returns:
+            Decoded JSON body
+
+        Raises:
+            requests.HTTPError: If GitHub returns an error status
+        """
+        return self._get(path, params, revalidate)['data']
+
+    def post_json(self, path, payload):
+        """
+        POST to a REST endpoint (never cached).
+
+        Args:
+            path: API path or absolute URL
+            payload: JSON request body
+
+        Returns:
+            requests.Response
+
+        Raises:
+            requests.HTTPError: If GitHub returns an error status
+        """
+        url = path if path.startswith('http') else f"{self.base_url}{path}"
+        self.scheduler.acquire(resource=resource_for(url))
+        response = self.session.post(url, json=payload, timeout=30)
+        self.scheduler.update(response.headers, response.status_code, resource_for(url))
+        with self._lock:
+            self.stats['requests'] += 1
+        response.raise_for_status()
+        return response
+
+    def get_raw(self, path):
+        """
+        GET a resource's raw content (never cached; meant for immutable
+        objects such as Git blobs, which would only crowd the cache).
+
+        Args:
+            path: API path or absolute URL
+
+        Returns:
+            Response body as bytes
+
+        Raises:
+            requests.HTTPError: If GitHub returns an error status
+        """
+        url = path if path.startswith('http') else f"{self.base_url}{path}"
+        self.scheduler.acquire(resource=resource_for(url))
+        response = self.session.get(
+            url, headers={'Accept': 'application/vnd.github.raw+json'}, timeout=30
+        )
+        self.scheduler.update(response.headers, response.status_code, resource_for(url))
+        with self._lock:
+            self.stats['requests'] += 1
+        response.raise_for_status()
+        return response.content
+
+    def iter_pages(self, path, params=None, revalidate=False):
+        """
+        GET a paginated REST listing page by page.
+
+        Follows the Link header's rel="next" URL; each page goes through
+        the cache like any other request. Callers stop iterating as soon as
+        they have what they need, so later pages are never requested.
+
+        Args:
+            path: API path or absolute URL of the first page
+            params: Query parameters for the first page
+            revalidate: Revalidate every page even if its cache entry is fresh
+
+        Yields:
+            Decoded JSON body of each page
+        """
+        entry = self._get(path, params, revalidate)
+        yield entry['data']
+        while entry['next']:
+            # The next URL already carries every query parameter
+            entry = self._get(entry['next'], revalidate=revalidate)
+            yield entry['data']
+
+    def download(self, url, dest_path, chunk_size=None, max_retries=None):
+        """
+        Stream a file to disk, resuming after dropped connections.
+
+        The body is written in fixed-size chunks, so memory use does not
+        grow with the file. After a connection error the transfer resumes
+        from the bytes already written using a Range request.
+
+        Args:
+            url: Download URL (API redirects to storage are followed)
+            dest_path: File to write
+            chunk_size: Bytes per chunk (defaults to Config.ARTIFACT_CHUNK_SIZE)
+            max_retries: Resume attempts (defaults to Config.ARTIFACT_DOWNLOAD_RETRIES)
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            requests.HTTPError: If the server returns an error status
+            requests.RequestException: If the transfer still fails after
+                all resume attempts
+        """
+        chunk_size = chunk_size or Config.ARTIFACT_CHUNK_SIZE
+        max_retries = Config.ARTIFACT_DOWNLOAD_RETRIES if max_retries is None else max_retries
+        written = 0
+        attempt = 0
+
+        with open(dest_path, 'wb') as f:
+            while True:
+                headers = {'Range': f'bytes={written}-'} if written else {}
+                try:
+                    with self.session.get(url, headers=headers, stream=True,
+                                          timeout=60) as response:
+                        self.scheduler.update(
+                            response.headers, response.status_code, resource_for(url)
+                        )
+                        response.raise_for_status()
+
+                        if written and response.status_code != 206:
+                            # Server ignored the range; start over
+                            f.seek(0)
+                            f.truncate()
+                            written = 0
+
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+                            written += len(chunk)
+                    return written
+
+                except (requests.ConnectionError, requests.Timeout,
+                        requests.exceptions.ChunkedEncodingError) as e:
+                    attempt += 1
+                    if attempt > max_retries:
+                        raise
+                    logger.warning(
+                        f"Download interrupted after {written} bytes ({e}); "
+                        f"resuming (attempt {attempt}/{max_retries})"
+                    )
+                    time.sleep(min(2 ** attempt, 10))
+
+    def _get(self, path, params=None, revalidate=False):
+        """GET through the cache, returning the cache entry."""
+        url = path if path.startswith('http') else f"{self.base_url}{path}"
+        key = (url, tuple(sorted((params or {}).items())))
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                if (not revalidate
+                        and time.monotonic() - entry['fetched_at'] < self.ttl):
+                    self.stats['fresh_hits'] += 1
+                    return entry
+
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            self.scheduler.acquire(resource=resource_for(url))
+        except GitHubRateLimitError as e:
+            if entry is None:
+                raise
+            # Out of budget: a stale answer beats losing the context
+            logger.warning(f"Serving stale GitHub response for {url}: {e}")
+            with self._lock:
+                self.stats['stale_served'] += 1
+            return entry
+
+        response = self.session.get(url, params=params, headers=headers, timeout=30)
+        self.scheduler.update(response.headers, response.status_code, resource_for(url))
+
+        with self._lock:
+            self.stats['requests'] += 1
+
+            if response.status_code == 304 and entry is not None:
+                self.stats['not_modified'] += 1
+                entry['fetched_at'] = time.monotonic()
+                return entry
+
+            response.raise_for_status()
+            self.stats['fetched'] += 1
+
+            entry = {
+                'data': response.json(),
+                'next': response.links.get('next', {}).get('url'),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': time.monotonic()
+            }
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+            return entry
+
+    def post_graphql(self, query, variables=None):
+        """
+        Run a GraphQL query, reusing a cached result while it is fresh.
+
+        GraphQL responses carry no validators, so there is no revalidation
+        step: after the TTL the query is simply sent again.
+
+        Args:
+            query: GraphQL query document
+            variables: Optional query variables
+
+        Returns:
+            The response's 'data' object
+
+        Raises:
+            requests.HTTPError: If GitHub returns an error status
+            RuntimeError: If the response contains GraphQL errors
+        """
+        variables = variables or {}
+        key = (self.graphql_url, query, tuple(sorted(variables.items())))
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                if time.monotonic() - entry['fetched_at'] < self.ttl:
+                    self.stats['fresh_hits'] += 1
+                    return entry['data']
+
+        self.scheduler.acquire(resource=GRAPHQL)
+        response = self.session.post(
+            self.graphql_url,
+            json={'query': query, 'variables': variables},
+            timeout=30
+        )
+        self.scheduler.update(response.headers, response.status_code, GRAPHQL)
+        response.raise_for_status()
+        body = response.json()
+
+        if body.get('errors'):
+            messages = '; '.join(err.get('message', '') for err in body['errors'])
+            raise RuntimeError(f"GraphQL query failed: {messages}")
+
+        with self._lock:
+            self.stats['graphql_requests'] += 1
+            self._cache[key] = {
+                'data': body['data'],
+                'next': None,
+                'etag': None,
+                'last_modified': None,
+                'fetched_at': time.monotonic()
+            }
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return body['data']
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self):
+        """Get cache statistics."""
+        with self._lock:
+            return dict(
+                self.stats,
+                cached_entries=len(self._cache),
+                ttl_seconds=self.ttl
+            )
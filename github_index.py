@@ -0,0 +1,295 @@
+"""
+Similarity index of GitHub issues and pull requests.
+Titles and bodies are embedded into a dedicated ChromaDB collection and
+refreshed incrementally by updated_at in the background, so a chat request
+retrieves only the items relevant to its question, without a GitHub call.
+A periodic full resync re-lists open and recent items and drops the ones
+GitHub no longer has (deleted or transferred to another repository).
+"""
+import asyncio
+import itertools
+import threading
+import time
+from logger import logger
+from config import Config
+from github_rate_limit import github_priority, BACKGROUND
+from workflow_history import to_epoch, to_iso
+
+COLLECTION_NAME = 'github_items'
+
+# Item kinds
+PULL_REQUEST = 'pull_request'
+ISSUE = 'issue'
+
+
+def item_kind(issue):
+    """Kind of a raw issues-API object (pull requests carry 'pull_request')."""
+    return PULL_REQUEST if issue.get('pull_request') else ISSUE
+
+
+def item_document(issue):
+    """Text embedded for an issue or pull request: title, state and body."""
+    label = 'Pull request' if item_kind(issue) == PULL_REQUEST else 'Issue'
+    text = f"{label} #{issue['number']}: {issue['title']} ({issue['state']})"
+    if issue.get('body'):
+        text += f"\n\n{issue['body']}"
+    return text[:Config.GITHUB_INDEX_MAX_CHARS]
+
+
+class GitHubIndex:
+    """Embedded issues and pull requests of every connected repository."""
+
+    def __init__(self, github_client, rag_engine):
+        """
+        Initialize the index (the refresher starts with start()).
+
+        Args:
+            github_client: GitHubClient listing issues and pull requests
+            rag_engine: RAGEngine providing the ChromaDB client and embeddings
+        """
+        self.github_client = github_client
+        self.rag_engine = rag_engine
+        self._collection = None
+        self._watermarks = {}  # Repository -> newest indexed updated_at (epoch)
+        self._resynced = {}  # Repository -> monotonic time of the last full resync
+        self._lock = threading.Lock()
+        self._thread = None
+        self.stats = {
+            'refreshes': 0, 'resyncs': 0, 'embedded': 0, 'removed': 0,
+            'searches': 0, 'errors': 0
+        }
+
+    @property
+    def collection(self):
+        """Dedicated ChromaDB collection, opened on first use."""
+        if self._collection is None:
+            with self._lock:
+                if self._collection is None:
+                    self._collection = self.rag_engine.client.get_or_create_collection(
+                        name=COLLECTION_NAME,
+                        metadata={"description": "GitHub issue and pull request embeddings"}
+                    )
+        return self._collection
+
+    def start(self):
+        """Start the background refresher."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._refresh_loop, name='github-index', daemon=True
+            )
+            self._thread.start()
+
+    def _refresh_loop(self):
+        """Refresh every connected repository, then sleep for the interval."""
+        while True:
+            pool = self.github_client.get_pool_stats()
+            repositories = [pool['default']] + pool['pooled'] if pool['default'] else pool['pooled']
+
+            for repository in repositories:
+                try:
+                    with github_priority(BACKGROUND), \
+                            self.github_client.use_repository(repository):
+                        self.refresh()
+                except Exception as e:
+                    with self._lock:
+                        self.stats['errors'] += 1
+                    logger.error(f"Error refreshing GitHub index of {repository}: {e}")
+
+            # Retry soon while GitHub is still connecting at startup
+            time.sleep(Config.GITHUB_INDEX_REFRESH if repositories else 5)
+
+    def refresh(self):
+        """
+        Embed issues and pull requests of the current repository updated
+        since the last refresh, or run a full resync if one is due.
+
+        Returns:
+            Number of items embedded
+        """
+        repository = self.github_client.full_name
+        if not repository or not self.github_client.is_connected():
+            return 0
+
+        watermark = self._watermark(repository)
+        with self._lock:
+            resynced = self._resynced.get(repository)
+        if (watermark is None or resynced is None
+                or time.monotonic() - resynced >= Config.GITHUB_INDEX_RESYNC_INTERVAL):
+            return self.resync()
+
+        embedded = self._index_all(
+            repository, self.github_client.iter_issues_updated_since(to_iso(watermark))
+        )
+        with self._lock:
+            self.stats['refreshes'] += 1
+        if embedded:
+            logger.info(f"Indexed {embedded} updated issues/PRs of {repository}")
+        return embedded
+
+    def resync(self):
+        """
+        Index every open item plus everything updated within the backfill
+        window, then remove indexed items neither listing returned.
+
+        Only open items and items inside the window are removed when
+        missing: older closed items are not re-listed, so their absence
+        says nothing.
+
+        Returns:
+            Number of items embedded
+        """
+        repository = self.github_client.full_name
+        cutoff = int(time.time() - Config.GITHUB_INDEX_BACKFILL_DAYS * 86400)
+        listed = set()
+
+        def unique(issues):
+            # Open items updated inside the window come back from both listings
+            for issue in issues:
+                item_id = f"{repository}#{issue['number']}"
+                if item_id not in listed:
+                    listed.add(item_id)
+                    yield issue
+
+        embedded = self._index_all(repository, unique(itertools.chain(
+            self.github_client.iter_open_issues(),
+            self.github_client.iter_issues_updated_since(to_iso(cutoff))
+        )))
+
+        existing = self.collection.get(
+            where={"repository": repository}, include=["metadatas"]
+        )
+        removed = [
+            item_id for item_id, metadata in zip(existing['ids'], existing['metadatas'])
+            if item_id not in listed
+            and (metadata['state'] == 'open' or metadata['updated_at'] >= cutoff)
+        ]
+        if removed:
+            self.collection.delete(ids=removed)
+
+        with self._lock:
+            # An empty repository is still ready: there is nothing to retrieve
+            self._watermarks.setdefault(repository, cutoff)
+            self._resynced[repository] = time.monotonic()
+            self.stats['resyncs'] += 1
+            self.stats['removed'] += len(removed)
+        logger.info(f"Resynced GitHub index of {repository}: {embedded} embedded, "
+                    f"{len(removed)} removed")
+        return embedded
+
+    def _index_all(self, repository, issues):
+        """Index an iterable of issues in page-sized batches."""
+        embedded = 0
+        batch = []
+        for issue in issues:
+            batch.append(issue)
+            if len(batch) >= Config.GITHUB_MAX_PER_PAGE:
+                embedded += self._index(repository, batch)
+                batch = []
+        return embedded + self._index(repository, batch)
+
+    def _watermark(self, repository):
+        """Newest indexed updated_at, recovered from the collection after a restart."""
+        with self._lock:
+            if repository in self._watermarks:
+                return self._watermarks[repository]
+
+        results = self.collection.get(
+            where={"repository": repository}, include=["metadatas"]
+        )
+        if not results['metadatas']:
+            return None
+        watermark = max(metadata['updated_at'] for metadata in results['metadatas'])
+        with self._lock:
+            self._watermarks[repository] = watermark
+        return watermark
+
+    def _index(self, repository, issues):
+        """Embed and upsert the items whose updated_at changed."""
+        if not issues:
+            return 0
+
+        ids = [f"{repository}#{issue['number']}" for issue in issues]
+        existing = self.collection.get(ids=ids, include=["metadatas"])
+        known = {
+            item_id: metadata['updated_at']
+            for item_id, metadata in zip(existing['ids'], existing['metadatas'])
+        }
+        changed = [
+            (item_id, issue) for item_id, issue in zip(ids, issues)
+            if known.get(item_id) != to_epoch(issue['updated_at'])
+        ]
+
+        if changed:
+            documents = [item_document(issue) for _, issue in changed]
+            self.collection.upsert(
+                ids=[item_id for item_id, _ in changed],
+                documents=documents,
+                embeddings=self.rag_engine.generate_embeddings(documents),
+                metadatas=[
+                    {
+                        'repository': repository,
+                        'kind': item_kind(issue),
+                        'number': issue['number'],
+                        'title': issue['title'],
+                        'state': issue['state'],
+                        'url': issue['html_url'],
+                        'updated_at': to_epoch(issue['updated_at'])
+                    }
+                    for _, issue in changed
+                ]
+            )
+
+        newest = max(to_epoch(issue['updated_at']) for issue in issues)
+        with self._lock:
+            self._watermarks[repository] = max(self._watermarks.get(repository) or 0, newest)
+            self.stats['embedded'] += len(changed)
+        return len(changed)
+
+    def is_ready(self, repository):
+        """Whether a repository has been indexed and can be searched."""
+        return repository in self._watermarks
+
+    async def search_async(self, query_embedding, repository, top_k=None):
+        """
+        Find the issues and pull requests most similar to a query.
+
+        Args:
+            query_embedding: Query embedding (shared with RAG retrieval)
+            repository: Repository full name
+            top_k: Number of items (defaults to Config.GITHUB_INDEX_TOP_K)
+
+        Returns:
+            List of item dicts (kind, number, title, state, url, distance),
+            best match first
+        """
+        def query():
+            # Opening the collection on first use blocks too, so it is
+            # resolved in the worker thread rather than on the event loop
+            return self.collection.query(
+                query_embeddings=[query_embedding],
+                n_results=top_k or Config.GITHUB_INDEX_TOP_K,
+                where={"repository": repository},
+                include=["metadatas", "distances"]
+            )
+
+        results = await asyncio.to_thread(query)
+        with self._lock:
+            self.stats['searches'] += 1
+        return [
+            {
+                'kind': metadata['kind'],
+                'number': metadata['number'],
+                'title': metadata['title'],
+                'state': metadata['state'],
+                'url': metadata['url'],
+                'distance': distance
+            }
+            for metadata, distance in zip(results['metadatas'][0], results['distances'][0])
+        ]
+
+    def get_stats(self):
+        """Get refresh and search statistics."""
+        with self._lock:
+            return dict(self.stats, repositories=sorted(self._watermarks))
@@ -0,0 +1,249 @@
+"""
+Local mirror of GitHub pull requests, issues and workflow runs.
+A SQLite store kept current by webhook events after a backfill, and
+resynced periodically to repair events missed while the app was down, so
+hot-path reads need no GitHub API calls.
+"""
+import hashlib
+import hmac
+import json
+import sqlite3
+import threading
+import time
+from logger import logger
+from config import Config
+
+# Item kinds held by the mirror
+PULL_REQUESTS = 'pull_requests'
+ISSUES = 'issues'
+WORKFLOW_RUNS = 'workflow_runs'
+KINDS = (PULL_REQUESTS, ISSUES, WORKFLOW_RUNS)
+
+
+def verify_signature(secret, body, signature_header):
+    """
+    Verify a GitHub webhook HMAC signature.
+
+    Args:
+        secret: Webhook secret configured on GitHub
+        body: Raw request body bytes
+        signature_header: Value of the X-Hub-Signature-256 header
+
+    Returns:
+        True if the signature matches
+    """
+    if not secret or not signature_header:
+        return False
+    expected = 'sha256=' + hmac.new(
+        secret.encode(), body, hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(expected, signature_header)
+
+
+class GitHubMirror:
+    """SQLite-backed store of repository items, keyed by repository."""
+
+    # Webhooks can arrive out of order and overlap the backfill, so an
+    # item is only replaced by a version at least as recent
+    UPSERT_SQL = (
+        "INSERT INTO mirror_items "
+        "(repo, kind, item_key, state, created_at, updated_at, data) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (repo, kind, item_key) DO UPDATE SET "
+        "state = excluded.state, created_at = excluded.created_at, "
+        "updated_at = excluded.updated_at, data = excluded.data "
+        "WHERE excluded.updated_at >= mirror_items.updated_at"
+    )
+
+    def __init__(self, db_path=None):
+        """
+        Initialize the mirror.
+
+        Args:
+            db_path: SQLite database path (defaults to Config.GITHUB_STATE_DB)
+        """
+        self.db_path = db_path or Config.GITHUB_STATE_DB
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.events_applied = 0
+
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS mirror_items (
+                    repo TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    item_key INTEGER NOT NULL,
+                    state TEXT,
+                    created_at TEXT,
+                    updated_at TEXT,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (repo, kind, item_key)
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_mirror_items_listing
+                ON mirror_items (repo, kind, state, created_at)
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS mirror_backfills (
+                    repo TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    completed_at REAL NOT NULL,
+                    PRIMARY KEY (repo, kind)
+                )
+            """)
+
+        logger.info(f"GitHub mirror opened at {self.db_path}")
+
+    def upsert(self, repo, kind, item_key, item):
+        """
+        Insert or update one item, unless the stored version is newer.
+
+        Args:
+            repo: Repository full name
+            kind: One of KINDS
+            item_key: PR/issue number or workflow run ID
+            item: Item dict in the GitHubClient shape
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                self.UPSERT_SQL, self._row(repo, kind, item_key, item)
+            )
+
+    def upsert_many(self, repo, kind, items, key_field):
+        """
+        Insert or update several items in one transaction.
+
+        Args:
+            repo: Repository full name
+            kind: One of KINDS
+            items: Item dicts in the GitHubClient shape
+            key_field: Item field used as the key ('number' or 'id')
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(self.UPSERT_SQL, [
+                self._row(repo, kind, item[key_field], item) for item in items
+            ])
+
+    def _row(self, repo, kind, item_key, item):
+        return (
+            repo, kind, item_key, item.get('state'),
+            item.get('created_at'), item.get('updated_at') or '',
+            json.dumps(item)
+        )
+
+    def delete(self, repo, kind, item_key):
+        """Remove one item."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM mirror_items WHERE repo = ? AND kind = ? AND item_key = ?",
+                (repo, kind, item_key)
+            )
+
+    def list(self, repo, kind, state='open', limit=10):
+        """
+        List items, newest first.
+
+        Args:
+            repo: Repository full name
+            kind: One of KINDS
+            state: 'open', 'closed' or 'all' (ignored for workflow runs)
+            limit: Maximum number of items
+
+        Returns:
+            List of item dicts
+        """
+        query = "SELECT data FROM mirror_items WHERE repo = ? AND kind = ?"
+        params = [repo, kind]
+        if kind != WORKFLOW_RUNS and state != 'all':
+            query += " AND state = ?"
+            params.append(state)
+        query += " ORDER BY created_at DESC, item_key DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def mark_backfilled(self, repo, kind):
+        """Record that a repository's items of one kind have been backfilled."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mirror_backfills (repo, kind, completed_at) "
+                "VALUES (?, ?, ?)",
+                (repo, kind, time.time())
+            )
+
+    def backfilled_at(self, repo, kind):
+        """
+        Get when a repository's items of one kind were last backfilled.
+
+        Returns:
+            Epoch seconds, or None if never backfilled
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT completed_at FROM mirror_backfills WHERE repo = ? AND kind = ?",
+                (repo, kind)
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_ready(self, repo, kind):
+        """
+        Check whether reads for a repository and kind can use the mirror.
+
+        Returns:
+            True once the kind has been backfilled for the repository
+        """
+        return self.backfilled_at(repo, kind) is not None
+
+    def prune_open(self, repo, kind, open_keys, updated_before):
+        """
+        Remove open items that a full listing of open items no longer has.
+
+        Such items were closed, deleted or transferred while a webhook was
+        missed. Items updated after the listing started are kept, since a
+        webhook may have added them meanwhile.
+
+        Args:
+            repo: Repository full name
+            kind: PULL_REQUESTS or ISSUES
+            open_keys: Keys of every item GitHub lists as open
+            updated_before: ISO 8601 time the listing started
+
+        Returns:
+            Number of items removed
+        """
+        open_keys = set(open_keys)
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT item_key FROM mirror_items "
+                "WHERE repo = ? AND kind = ? AND state = 'open' AND updated_at <= ?",
+                (repo, kind, updated_before)
+            ).fetchall()
+            stale = [(repo, kind, key) for (key,) in rows if key not in open_keys]
+            self._conn.executemany(
+                "DELETE FROM mirror_items WHERE repo = ? AND kind = ? AND item_key = ?",
+                stale
+            )
+        return len(stale)
+
+    def get_stats(self):
+        """Get mirror statistics."""
+        with self._lock:
+            counts = self._conn.execute(
+                "SELECT repo, kind, COUNT(*) FROM mirror_items GROUP BY repo, kind"
+            ).fetchall()
+            backfilled = self._conn.execute(
+                "SELECT repo, kind FROM mirror_backfills"
+            ).fetchall()
+
+        repos = {}
+        for repo, kind, count in counts:
+            repos.setdefault(repo, {})[kind] = count
+        return {
+            'db_path': self.db_path,
+            'events_applied': self.events_applied,
+            'items': repos,
+            'backfilled': [f"{repo}:{kind}" for repo, kind in backfilled]
+        }
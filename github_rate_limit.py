@@ -0,0 +1,263 @@
+"""
+Rate-limit-aware scheduling for GitHub API requests.
+Tracks the remaining request budget of each rate-limit resource (REST
+core, GraphQL, search) from response headers, keeps a reserve for
+interactive (chat) requests, delays background work as a budget runs low,
+and honours secondary-rate-limit backoff.
+"""
+import contextvars
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from logger import logger
+from config import Config
+
+# Request priorities
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+_priority = contextvars.ContextVar('github_priority', default=INTERACTIVE)
+
+# Rate-limit resources (separate budgets, named as in X-RateLimit-Resource)
+CORE = 'core'
+GRAPHQL = 'graphql'
+SEARCH = 'search'
+
+# Paths relative to the API root; GitHub Enterprise serves REST under
+# /api/v3 and GraphQL at /api/graphql
+_GRAPHQL_PATH = re.compile(r'^(/api)?/graphql/?$')
+_SEARCH_PATH = re.compile(r'^(/api/v3)?/search/')
+
+
+def resource_for(url):
+    """
+    Rate-limit resource a request URL is charged to.
+
+    Args:
+        url: Absolute request URL
+
+    Returns:
+        CORE, GRAPHQL or SEARCH
+    """
+    path = urlparse(url).path
+    if _GRAPHQL_PATH.match(path):
+        return GRAPHQL
+    if _SEARCH_PATH.match(path):
+        return SEARCH
+    return CORE
+
+
+@contextmanager
+def github_priority(priority):
+    """
+    Run GitHub requests made inside the block at the given priority.
+
+    Args:
+        priority: INTERACTIVE or BACKGROUND
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class GitHubRateLimitError(Exception):
+    """Raised when a request cannot be made within the rate limit."""
+
+
+class _Budget:
+    """Request budget of one rate-limit resource."""
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None  # Epoch seconds
+
+    def as_dict(self, now):
+        return {
+            'limit': self.limit,
+            'remaining': self.remaining,
+            'reset_in_seconds': (
+                max(0, round(self.reset_at - now)) if self.reset_at else None
+            )
+        }
+
+
+class RateLimitScheduler:
+    """Shared view of the GitHub rate limits that gates outgoing requests."""
+
+    def __init__(self, reserve=None, max_wait=None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            reserve: Requests kept back for interactive calls
+                (defaults to Config.GITHUB_RATE_LIMIT_RESERVE)
+            max_wait: Longest a background call waits, in seconds
+                (defaults to Config.GITHUB_BACKGROUND_MAX_WAIT)
+        """
+        self.reserve = Config.GITHUB_RATE_LIMIT_RESERVE if reserve is None else reserve
+        self.max_wait = Config.GITHUB_BACKGROUND_MAX_WAIT if max_wait is None else max_wait
+        self._lock = threading.Lock()
+        self._budgets = {CORE: _Budget(), GRAPHQL: _Budget(), SEARCH: _Budget()}
+        self.backoff_until = 0.0  # Epoch seconds (secondary limits are global)
+        self.counts = {
+            INTERACTIVE: 0,
+            BACKGROUND: 0,
+            'delayed': 0,
+            'rejected': 0,
+            'secondary_limits': 0
+        }
+
+    def acquire(self, priority=None, max_wait=None, resource=CORE):
+        """
+        Wait until a request may be sent.
+
+        Interactive requests go ahead unless the resource's budget is
+        exhausted or a backoff is in force, in which case they fail fast.
+        Background requests also yield the reserve to interactive ones and
+        wait (up to max_wait) for the window to reset.
+
+        Args:
+            priority: INTERACTIVE or BACKGROUND (defaults to the current
+                github_priority context)
+            max_wait: Override for the longest background wait, in seconds
+            resource: Rate-limit resource the request is charged to
+
+        Raises:
+            GitHubRateLimitError: If the request cannot be made in time
+        """
+        priority = priority or _priority.get()
+        deadline = time.time() + (self.max_wait if max_wait is None else max_wait)
+        delayed = False
+
+        while True:
+            with self._lock:
+                wait_until = self._blocked_until(priority, resource)
+                if wait_until is None:
+                    self.counts[priority] += 1
+                    return
+
+                if priority == INTERACTIVE or wait_until > deadline:
+                    self.counts['rejected'] += 1
+                    raise GitHubRateLimitError(
+                        f"GitHub {resource} rate limit: {priority} request deferred for "
+                        f"{max(0, wait_until - time.time()):.0f}s"
+                    )
+                if not delayed:
+                    self.counts['delayed'] += 1
+                    delayed = True
+
+            logger.info(
+                f"Delaying background GitHub request for "
+                f"{wait_until - time.time():.0f}s (rate limit)"
+            )
+            time.sleep(max(0.0, min(wait_until - time.time(), 60)))
+
+    def _blocked_until(self, priority, resource=CORE):
+        """Epoch time a request of this priority must wait for, or None."""
+        now = time.time()
+        if now < self.backoff_until:
+            return self.backoff_until
+
+        budget = self._budgets[resource]
+        if budget.remaining is None or budget.reset_at is None or now >= budget.reset_at:
+            return None
+
+        # An exhausted budget (remaining 0) blocks every priority until reset
+        floor = self.reserve if priority == BACKGROUND else 0
+        if budget.remaining <= floor:
+            return budget.reset_at
+        return None
+
+    def would_block(self, priority=None, resource=CORE):
+        """
+        Check, without counting a request, whether one would be held back.
+
+        Args:
+            priority: INTERACTIVE or BACKGROUND (defaults to the current
+                github_priority context)
+            resource: Rate-limit resource the request would be charged to
+
+        Returns:
+            Seconds the request would wait, or None if it may go ahead
+        """
+        priority = priority or _priority.get()
+        with self._lock:
+            wait_until = self._blocked_until(priority, resource)
+        return None if wait_until is None else max(0.0, wait_until - time.time())
+
+    def update(self, headers, status_code=200, resource=CORE):
+        """
+        Record rate-limit state from a response.
+
+        Args:
+            headers: Response headers
+            status_code: Response status code
+            resource: Resource the request was charged to; the response's
+                X-RateLimit-Resource header takes precedence
+        """
+        resource = headers.get('X-RateLimit-Resource') or resource
+        with self._lock:
+            budget = self._budgets.setdefault(resource, _Budget())
+            if headers.get('X-RateLimit-Remaining') is not None:
+                budget.remaining = int(headers['X-RateLimit-Remaining'])
+            if headers.get('X-RateLimit-Limit') is not None:
+                budget.limit = int(headers['X-RateLimit-Limit'])
+            if headers.get('X-RateLimit-Reset') is not None:
+                budget.reset_at = float(headers['X-RateLimit-Reset'])
+
+            if status_code in (403, 429):
+                retry_after = headers.get('Retry-After')
+                if retry_after is not None:
+                    # Secondary rate limit
+                    self.counts['secondary_limits'] += 1
+                    self.backoff_until = time.time() + float(retry_after)
+                    wait = self.backoff_until - time.time()
+                elif budget.remaining == 0 and budget.reset_at:
+                    # Primary limit: only this resource waits for its reset
+                    wait = budget.reset_at - time.time()
+                else:
+                    return
+                logger.warning(
+                    f"GitHub {resource} rate limited (HTTP {status_code}); "
+                    f"backing off for {wait:.0f}s"
+                )
+
+    def observe(self, remaining, limit, reset_at, resource=CORE):
+        """
+        Record rate-limit state reported by another client (e.g. PyGithub).
+
+        Args:
+            remaining: Requests left in the window
+            limit: Window size
+            reset_at: Epoch seconds when the window resets
+            resource: Rate-limit resource the state belongs to
+        """
+        if remaining is None or remaining < 0:
+            # PyGithub reports -1 before it has seen any rate-limit headers
+            return
+        with self._lock:
+            budget = self._budgets[resource]
+            budget.remaining = remaining
+            budget.limit = limit
+            budget.reset_at = reset_at
+
+    def get_stats(self):
+        """Get each resource's budget state and the request counts."""
+        now = time.time()
+        with self._lock:
+            core = self._budgets[CORE].as_dict(now)
+            return dict(
+                self.counts,
+                **core,
+                reserve=self.reserve,
+                backoff_seconds=max(0, round(self.backoff_until - now)),
+                resources={
+                    resource: budget.as_dict(now)
+                    for resource, budget in self._budgets.items()
+                }
+            )
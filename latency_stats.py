@@ -0,0 +1,79 @@
+"""
+Rolling latency statistics.
+Keeps a bounded window of recent successful call durations and reports
+percentiles. Failed and timed-out calls are only counted: their durations
+say when the call was abandoned, not how long a response takes.
+"""
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of call latencies."""
+
+    def __init__(self, window=500):
+        """
+        Initialize the tracker.
+
+        Args:
+            window: Number of most recent samples to keep
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+
+    @property
+    def successes(self):
+        """Number of successful calls recorded."""
+        return self.count - self.errors
+
+    def record(self, seconds, success=True):
+        """
+        Record one call.
+
+        Args:
+            seconds: Call duration in seconds
+            success: Whether the call succeeded
+        """
+        with self._lock:
+            self.count += 1
+            if success:
+                self._samples.append(seconds)
+            else:
+                self.errors += 1
+
+    def percentile(self, pct):
+        """
+        Get a latency percentile of the recent successful calls.
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None if there are no samples
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def get_stats(self):
+        """
+        Summarise the window.
+
+        Returns:
+            Dictionary with call/error counts and p50/p95/p99 in milliseconds
+        """
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'p50_ms': ms(self.percentile(50)),
+            'p95_ms': ms(self.percentile(95)),
+            'p99_ms': ms(self.percentile(99))
+        }
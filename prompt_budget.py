@@ -0,0 +1,133 @@
+"""
+Token budgeting for prompt assembly.
+Provides a fast local token estimator and a budget tracker that decides
+which prompt sections fit and records what had to be dropped or truncated.
+"""
+from config import Config
+
+
+def estimate_tokens(text):
+    """
+    Estimate the number of tokens in a piece of text.
+
+    Uses a characters-per-token ratio instead of a real tokenizer so the
+    estimate costs a single len() call.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    chars_per_token = Config.PROMPT_CHARS_PER_TOKEN
+    return (len(text) + chars_per_token - 1) // chars_per_token
+
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Truncate text so it fits within max_tokens, cutting at a word boundary.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Maximum number of tokens to keep
+
+    Returns:
+        Truncated text (with a trailing ellipsis marker)
+    """
+    max_chars = max(0, max_tokens * Config.PROMPT_CHARS_PER_TOKEN - 4)
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max_chars]
+    last_space = cut.rfind(' ')
+    if last_space > max_chars * 0.5:
+        cut = cut[:last_space]
+    return cut.rstrip() + ' ...'
+
+
+class PromptBudget:
+    """Tracks token usage against a fixed input budget."""
+
+    def __init__(self, max_tokens=None):
+        """
+        Initialize the budget.
+
+        Args:
+            max_tokens: Input token budget (defaults to Config.PROMPT_TOKEN_BUDGET)
+        """
+        self.max_tokens = max_tokens or Config.PROMPT_TOKEN_BUDGET
+        self.used = 0
+        self.sections = {}
+        self.dropped = []
+        self.truncated = []
+
+    @property
+    def remaining(self):
+        """Tokens still available."""
+        return max(0, self.max_tokens - self.used)
+
+    def reserve(self, text, section):
+        """
+        Account for text that must always be included.
+
+        Args:
+            text: Mandatory prompt text
+            section: Section name for the report
+
+        Returns:
+            The text, unchanged
+        """
+        tokens = estimate_tokens(text)
+        self.used += tokens
+        self.sections[section] = self.sections.get(section, 0) + tokens
+        return text
+
+    def fit(self, text, section, label=None, allow_truncate=False):
+        """
+        Try to fit optional text into the remaining budget.
+
+        Args:
+            text: Candidate prompt text
+            section: Section name for the report
+            label: Human-readable identifier of the item (e.g. filename)
+            allow_truncate: Whether the text may be shortened to fit
+
+        Returns:
+            The text (possibly truncated), or None if it was dropped
+        """
+        tokens = estimate_tokens(text)
+        item = {'section': section, 'item': label, 'tokens': tokens}
+
+        if tokens <= self.remaining:
+            self.used += tokens
+            self.sections[section] = self.sections.get(section, 0) + tokens
+            return text
+
+        if allow_truncate and self.remaining >= Config.PROMPT_MIN_CHUNK_TOKENS:
+            text = truncate_to_tokens(text, self.remaining)
+            kept = estimate_tokens(text)
+            self.used += kept
+            self.sections[section] = self.sections.get(section, 0) + kept
+            item['kept_tokens'] = kept
+            self.truncated.append(item)
+            return text
+
+        self.dropped.append(item)
+        return None
+
+    def report(self):
+        """
+        Summarise how the budget was spent.
+
+        Returns:
+            Dictionary with budget, usage per section and dropped/truncated items
+        """
+        return {
+            'budget_tokens': self.max_tokens,
+            'estimated_tokens': self.used,
+            'sections': dict(self.sections),
+            'dropped': list(self.dropped),
+            'truncated': list(self.truncated)
+        }
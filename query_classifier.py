@@ -0,0 +1,220 @@
+"""
+Keyword-based query classification.
+Compiles the template keywords from document_templates.json into a single
+regular expression so a query is classified in one pass.
+
+Scores are the same as scanning the query for every keyword separately:
+overlapping keywords ("sox control" and "control objective") and keywords
+nested in longer ones ("model" in "model deployment") all count. The
+compiled matcher's main benefit is that behaviour-preserving single pass;
+benchmark_query_classifier.py shows little speed difference from the old
+first-match scan until the keyword count reaches the thousands.
+"""
+import json
+import os
+import re
+from logger import logger
+from config import Config
+
+# Used only when the template file is missing or has no keywords
+DEFAULT_KEYWORDS = {
+    'sox_audit': [
+        'sox control', 'control analysis', 'control objective',
+        'testing procedure', 'sox', 'control test', 'audit',
+        'compliance', 'internal control'
+    ],
+    'mlops_workflow': [
+        'model', 'mlops', 'machine learning', 'training', 'inference',
+        'dataset', 'ml pipeline', 'model deployment',
+        'feature engineering', 'hyperparameter', 'ml workflow'
+    ],
+    'devops_pipeline': [
+        'pipeline', 'ci/cd', 'deployment', 'build', 'release', 'devops',
+        'kubernetes', 'docker', 'container', 'jenkins', 'gitlab ci',
+        'github actions'
+    ]
+}
+
+
+def _build_trie(keywords):
+    """Build a character trie; the '' key marks the end of a keyword."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+
+def _trie_pattern(node):
+    """
+    Convert a trie into a regex with shared prefixes factored out.
+
+    A flat "a|b|c" alternation makes the regex engine try every keyword at
+    every position. The factored form branches on one character at a time,
+    so the cost per position no longer grows with the number of keywords.
+    Optional tails are greedy, which makes each match the longest keyword
+    starting at that position ("model deployment" over "model"); shorter
+    keywords at the same position are prefixes of it.
+    """
+    terminal = '' in node
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ''
+
+    if len(branches) == 1:
+        body = branches[0]
+        pattern = f'(?:{body})?' if terminal else body
+    else:
+        pattern = f"(?:{'|'.join(branches)})"
+        if terminal:
+            pattern += '?'
+    return pattern
+
+
+class QueryClassifier:
+    """Classifies queries into template types using one compiled matcher."""
+
+    def __init__(self, keywords_by_type, default_type='generic'):
+        """
+        Compile the keyword matcher.
+
+        Args:
+            keywords_by_type: Dict mapping template type to a list of keywords,
+                in priority order (earlier types win ties)
+            default_type: Type returned when nothing matches
+        """
+        self.default_type = default_type
+        self.type_order = list(keywords_by_type.keys())
+        self._keyword_types = {}
+
+        for template_type, keywords in keywords_by_type.items():
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                if not keyword:
+                    continue
+                types = self._keyword_types.setdefault(keyword, [])
+                if template_type not in types:
+                    types.append(template_type)
+
+        keywords = list(self._keyword_types)
+        # Keywords that also match wherever a keyword matches, longest first
+        self._prefix_keywords = {
+            keyword: sorted(
+                (k for k in keywords if keyword.startswith(k)),
+                key=len, reverse=True
+            )
+            for keyword in keywords
+        }
+        # A lookahead consumes nothing, so a match is tried at every
+        # position and overlapping keywords are all found
+        self._pattern = (
+            re.compile(f'(?=({_trie_pattern(_build_trie(keywords))}))')
+            if keywords else None
+        )
+
+        logger.info(
+            f"Compiled query classifier with {len(keywords)} keywords "
+            f"across {len(self.type_order)} templates"
+        )
+
+    @classmethod
+    def from_templates_file(cls, path=None):
+        """
+        Build a classifier from the keywords in the document templates file.
+
+        Args:
+            path: Path to document_templates.json
+                (defaults to Config.DOCUMENT_TEMPLATES_PATH)
+
+        Returns:
+            QueryClassifier instance
+        """
+        path = path or Config.DOCUMENT_TEMPLATES_PATH
+        keywords_by_type = {}
+
+        try:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    templates = json.load(f).get('templates', {})
+                for template_type, template in templates.items():
+                    if template.get('keywords'):
+                        keywords_by_type[template_type] = template['keywords']
+            else:
+                logger.warning(
+                    f"Template file not found: {path}. Using default keywords."
+                )
+        except Exception as e:
+            logger.error(f"Error loading template keywords: {e}")
+
+        return cls(keywords_by_type or DEFAULT_KEYWORDS)
+
+    def find_matches(self, query):
+        """
+        Find every keyword occurrence in a query, overlapping ones included.
+
+        Args:
+            query: Query text
+
+        Returns:
+            List of dicts with keyword, start, end and matching types,
+            ordered by start position (longest keyword first)
+        """
+        if not self._pattern or not query:
+            return []
+
+        return [
+            {
+                'keyword': keyword,
+                'start': match.start(),
+                'end': match.start() + len(keyword),
+                'types': self._keyword_types[keyword]
+            }
+            for match in self._pattern.finditer(query.lower())
+            for keyword in self._prefix_keywords[match.group(1)]
+        ]
+
+    def classify(self, query):
+        """
+        Score every template type in a single pass over the query.
+
+        Each match adds one point per word in the keyword to each type it
+        belongs to, so multi-word phrases outweigh single generic words.
+
+        Args:
+            query: Query text
+
+        Returns:
+            Tuple of (best type, scores dict, matches list)
+        """
+        matches = self.find_matches(query)
+        scores = {}
+        for match in matches:
+            weight = match['keyword'].count(' ') + 1
+            for template_type in match['types']:
+                scores[template_type] = scores.get(template_type, 0) + weight
+
+        if not scores:
+            return self.default_type, scores, matches
+
+        best_type = max(
+            scores,
+            key=lambda t: (scores[t], -self.type_order.index(t))
+        )
+        return best_type, scores, matches
+
+    def detect(self, query):
+        """
+        Return the best-scoring template type for a query.
+
+        Args:
+            query: Query text
+
+        Returns:
+            str: Template type, or the default type if nothing matches
+        """
+        return self.classify(query)[0]
@@ -3,6 +3,7 @@ RAG (Retrieval-Augmented Generation) Engine using ChromaDB.
 Handles document processing, embedding generation, and context retrieval.
 """
 import os
+import asyncio
 import chromadb
 from chromadb.config import Settings
 import google.generativeai as genai
@@ -10,6 +11,7 @@ from docx import Document
 from PyPDF2 import PdfReader
 from logger import logger
 from config import Config
+from async_runtime import async_runtime
 
 class RAGEngine:
     """RAG engine for document processing and retrieval."""
@@ -135,6 +137,27 @@ class RAGEngine:
             logger.error(f"Error generating embedding: {e}")
             raise
     
+    def generate_embeddings(self, texts):
+        """
+        Generate document embeddings for several texts in one request.
+        
+        Args:
+            texts: List of texts to embed
+        
+        Returns:
+            List of embedding vectors, in input order
+        """
+        try:
+            result = genai.embed_content(
+                model=Config.GEMINI_EMBEDDING_MODEL,
+                content=list(texts),
+                task_type="retrieval_document"
+            )
+            return result['embedding']
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            raise
+    
     def add_document(self, file_path, filename):
         """
         Process and add document to ChromaDB.
@@ -157,11 +180,33 @@ class RAGEngine:
             if not text.strip():
                 raise ValueError("No text content found in document")
             
+            return self.add_text(text, filename)
+            
+        except Exception as e:
+            logger.error(f"Error adding document {filename}: {e}")
+            raise
+    
+    def add_text(self, text, filename, metadata=None):
+        """
+        Chunk, embed and add text to ChromaDB.
+        
+        Args:
+            text: Text content
+            filename: Source name stored with each chunk (and used in chunk IDs)
+            metadata: Extra metadata stored with each chunk
+        
+        Returns:
+            Number of chunks added
+        """
+        try:
             # Chunk text
             logger.info(f"Chunking document {filename}")
             chunks = self.chunk_text(text)
             logger.info(f"Created {len(chunks)} chunks from {filename}")
             
+            if not chunks:
+                return 0
+            
             # Generate embeddings and add to ChromaDB
             documents = []
             metadatas = []
@@ -175,11 +220,12 @@ class RAGEngine:
                 embedding = self.generate_embedding(chunk)
                 
                 documents.append(chunk)
-                metadatas.append({
-                    "filename": filename,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks)
-                })
+                metadatas.append(dict(
+                    metadata or {},
+                    filename=filename,
+                    chunk_index=i,
+                    total_chunks=len(chunks)
+                ))
                 ids.append(chunk_id)
                 embeddings.append(embedding)
             
@@ -198,6 +244,35 @@ class RAGEngine:
             logger.error(f"Error adding document {filename}: {e}")
             raise
     
+    def delete_source(self, filename):
+        """
+        Remove every chunk of a source from ChromaDB.
+        
+        Args:
+            filename: Source name the chunks were added under
+        """
+        try:
+            self.collection.delete(where={"filename": filename})
+        except Exception as e:
+            logger.error(f"Error deleting {filename} from RAG database: {e}")
+            raise
+    
+    def get_indexed_sources(self, where):
+        """
+        Get the metadata of indexed sources matching a filter.
+        
+        Args:
+            where: ChromaDB metadata filter (e.g. {"repository": "owner/name"})
+        
+        Returns:
+            Dictionary mapping filename to the metadata of its chunks
+        """
+        results = self.collection.get(where=where, include=["metadatas"])
+        return {
+            metadata["filename"]: metadata
+            for metadata in results["metadatas"] or []
+        }
+    
     def retrieve_context(self, query, top_k=None):
         """
         Retrieve relevant context for a query.
@@ -226,15 +301,7 @@ class RAGEngine:
             )
             
             # Format results
-            context_chunks = []
-            if results and results['documents']:
-                for i, doc in enumerate(results['documents'][0]):
-                    metadata = results['metadatas'][0][i] if results['metadatas'] else {}
-                    context_chunks.append({
-                        'text': doc,
-                        'metadata': metadata,
-                        'distance': results['distances'][0][i] if results['distances'] else None
-                    })
+            context_chunks = self._format_results(results)
             
             logger.info(f"Retrieved {len(context_chunks)} context chunks for query")
             return context_chunks
@@ -243,6 +310,114 @@ class RAGEngine:
             logger.error(f"Error retrieving context: {e}")
             return []
     
+    async def embed_query_async(self, query):
+        """
+        Embed a query with the async Gemini API, under the shared runtime's
+        concurrency limit.
+        
+        Args:
+            query: User query
+        
+        Returns:
+            Query embedding vector
+        """
+        result = await async_runtime.call_model(
+            lambda: genai.embed_content_async(
+                model=Config.GEMINI_EMBEDDING_MODEL,
+                content=query,
+                task_type="retrieval_query"
+            )
+        )
+        return result['embedding']
+    
+    async def retrieve_context_async(self, query, top_k=None, query_embedding=None):
+        """
+        Async variant of retrieve_context.
+        
+        The query embedding uses the async Gemini API under the shared
+        runtime's concurrency limit; the local ChromaDB lookup runs in a
+        worker thread so it does not block the event loop.
+        
+        Args:
+            query: User query
+            top_k: Number of results to retrieve
+            query_embedding: Precomputed query embedding, when the caller
+                shares one embedding between several lookups
+        
+        Returns:
+            List of relevant text chunks with metadata
+        
+        Raises:
+            Exception: If the embedding or the ChromaDB lookup fails; unlike
+                retrieve_context, errors propagate so the chat pipeline can
+                report the RAG stage as skipped instead of as no matches
+        """
+        top_k = top_k or Config.TOP_K_RESULTS
+        
+        if query_embedding is None:
+            query_embedding = await self.embed_query_async(query)
+        
+        results = await asyncio.to_thread(
+            self.collection.query,
+            query_embeddings=[query_embedding],
+            n_results=top_k
+        )
+        
+        context_chunks = self._format_results(results)
+        logger.info(f"Retrieved {len(context_chunks)} context chunks for query")
+        return context_chunks
+    
+    def _format_results(self, results):
+        """
+        Convert a ChromaDB query result into context chunk dicts.
+        
+        Args:
+            results: Raw result from collection.query
+        
+        Returns:
+            List of text chunks with metadata and distance
+        """
+        context_chunks = []
+        if results and results['documents']:
+            for i, doc in enumerate(results['documents'][0]):
+                metadata = results['metadatas'][0][i] if results['metadatas'] else {}
+                context_chunks.append({
+                    'id': results['ids'][0][i],
+                    'text': doc,
+                    'metadata': metadata,
+                    'distance': results['distances'][0][i] if results['distances'] else None
+                })
+        return context_chunks
+    
+    def get_chunks(self, chunk_ids):
+        """
+        Fetch previously retrieved chunks by ID, keeping their order.
+        
+        Args:
+            chunk_ids: List of chunk IDs
+        
+        Returns:
+            List of text chunks with metadata (missing IDs are skipped)
+        """
+        if not chunk_ids:
+            return []
+        
+        try:
+            results = self.collection.get(ids=list(chunk_ids))
+            by_id = {
+                chunk_id: {
+                    'id': chunk_id,
+                    'text': results['documents'][i],
+                    'metadata': results['metadatas'][i] if results['metadatas'] else {},
+                    'distance': None
+                }
+                for i, chunk_id in enumerate(results['ids'])
+            }
+            return [by_id[chunk_id] for chunk_id in chunk_ids if chunk_id in by_id]
+        except Exception as e:
+            logger.error(f"Error fetching chunks by ID: {e}")
+            return []
+    
     def get_stats(self):
         """Get statistics about the RAG database."""
         try:
@@ -0,0 +1,165 @@
+"""
+Incremental sync of repository documentation into the RAG index.
+One recursive Git Trees call lists every file; only blobs whose SHA differs
+from the one recorded with the indexed chunks are downloaded and embedded,
+so a sync costs API calls in proportion to what changed, not repo size.
+"""
+import os
+import threading
+from datetime import datetime
+from logger import logger
+from config import Config
+from github_rate_limit import github_priority, BACKGROUND
+
+SOURCE = 'github'
+
+
+def source_name(full_name, path):
+    """RAG source name of a repository file (e.g. 'owner/name:docs/setup.md')."""
+    return f"{full_name}:{path}"
+
+
+class RepoSync:
+    """Syncs markdown and text files of a repository into the RAG engine."""
+
+    def __init__(self, github_client, rag_engine):
+        """
+        Initialize the syncer.
+
+        Args:
+            github_client: GitHubClient used to read the tree and blobs
+            rag_engine: RAGEngine the files are indexed into
+        """
+        self.github_client = github_client
+        self.rag_engine = rag_engine
+        self._status = {}
+        self._lock = threading.Lock()
+
+    def start(self, ref='HEAD'):
+        """
+        Sync the current request's repository in the background.
+
+        Args:
+            ref: Branch, tag or commit SHA to sync
+
+        Returns:
+            Status dict for the repository, or None if a sync of it is
+            already running
+        """
+        full_name = self.github_client.full_name
+        with self._lock:
+            current = self._status.get(full_name)
+            if current and current['state'] == 'running':
+                return None
+            self._status[full_name] = status = {
+                'repository': full_name,
+                'ref': ref,
+                'state': 'running',
+                'started_at': datetime.now().isoformat(),
+                'finished_at': None,
+                'result': None,
+                'error': None
+            }
+
+        threading.Thread(
+            target=self._run,
+            args=(full_name, ref),
+            name='repo-sync',
+            daemon=True
+        ).start()
+        return dict(status)
+
+    def _run(self, full_name, ref):
+        """Background sync of one repository."""
+        try:
+            with github_priority(BACKGROUND), self.github_client.use_repository(full_name):
+                result = self.sync(ref)
+            update = {'state': 'completed', 'result': result}
+        except Exception as e:
+            logger.error(f"Repository sync of {full_name} failed: {e}")
+            update = {'state': 'failed', 'error': str(e)}
+
+        with self._lock:
+            self._status[full_name].update(
+                update, finished_at=datetime.now().isoformat()
+            )
+
+    def sync(self, ref='HEAD'):
+        """
+        Sync the current repository's documentation files.
+
+        Args:
+            ref: Branch, tag or commit SHA to sync
+
+        Returns:
+            Dictionary with counts of files added, updated, removed and
+            unchanged, and the GitHub API calls made
+        """
+        full_name = self.github_client.full_name
+        requests_before = self.github_client.http.get_stats()['requests']
+
+        files = {
+            entry['path']: entry for entry in self.github_client.get_tree(ref)
+            if self._wanted(entry)
+        }
+        indexed = {
+            metadata['path']: metadata['blob_sha']
+            for metadata in self.rag_engine.get_indexed_sources(
+                {'repository': full_name}
+            ).values()
+        }
+
+        result = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0,
+                  'failed': 0, 'chunks': 0}
+
+        for path in indexed.keys() - files.keys():
+            self.rag_engine.delete_source(source_name(full_name, path))
+            result['removed'] += 1
+
+        for path, entry in sorted(files.items()):
+            if indexed.get(path) == entry['sha']:
+                result['unchanged'] += 1
+                continue
+
+            try:
+                text = self.github_client.get_blob_text(entry['sha'])
+                name = source_name(full_name, path)
+                self.rag_engine.delete_source(name)
+                result['chunks'] += self.rag_engine.add_text(
+                    text,
+                    name,
+                    metadata={
+                        'source': SOURCE,
+                        'repository': full_name,
+                        'path': path,
+                        'blob_sha': entry['sha']
+                    }
+                )
+                result['updated' if path in indexed else 'added'] += 1
+            except Exception as e:
+                logger.error(f"Failed to index {full_name}:{path}: {e}")
+                result['failed'] += 1
+
+        result['api_calls'] = self.github_client.http.get_stats()['requests'] - requests_before
+        logger.info(f"Synced {full_name}@{ref} into RAG: {result}")
+        return result
+
+    def _wanted(self, entry):
+        """Whether a tree entry is a documentation file worth indexing."""
+        extension = os.path.splitext(entry['path'])[1].lower()
+        return (extension in Config.REPO_SYNC_EXTENSIONS
+                and 0 < entry['size'] <= Config.REPO_SYNC_MAX_FILE_SIZE)
+
+    def get_status(self, full_name=None):
+        """
+        Get the last sync status of a repository.
+
+        Args:
+            full_name: Repository full name (defaults to the current one)
+
+        Returns:
+            Status dict, or None if the repository was never synced
+        """
+        with self._lock:
+            status = self._status.get(full_name or self.github_client.full_name)
+            return dict(status) if status else None
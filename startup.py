@@ -0,0 +1,175 @@
+"""
+Background initialisation of application components.
+Expensive clients are created concurrently in threads so the web server can
+serve requests immediately; a component is waited for only when it is first
+used, and /health reports the state of each one.
+"""
+import asyncio
+import threading
+import time
+from logger import logger
+from config import Config
+
+# Component states
+STARTING = 'starting'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class ComponentUnavailable(Exception):
+    """Raised when a component failed to start or is not ready in time."""
+
+
+class Components:
+    """Registry of components initialised in background threads."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._components = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, factory, required=True):
+        """
+        Register a component.
+
+        Args:
+            name: Component name reported by /health
+            factory: Callable returning the component instance
+            required: Whether the application is unhealthy without it
+
+        Returns:
+            LazyComponent standing in for the instance until it is ready
+        """
+        with self._lock:
+            self._components[name] = {
+                'factory': factory,
+                'required': required,
+                'state': STARTING,
+                'instance': None,
+                'error': None,
+                'seconds': None,
+                'ready': threading.Event()
+            }
+        return LazyComponent(self, name)
+
+    def start(self):
+        """Initialise all registered components concurrently."""
+        for name in list(self._components):
+            threading.Thread(
+                target=self._initialize,
+                args=(name,),
+                name=f'startup-{name}',
+                daemon=True
+            ).start()
+
+    def _initialize(self, name):
+        """Run one component's factory and record the outcome."""
+        component = self._components[name]
+        started = time.perf_counter()
+        try:
+            instance = component['factory']()
+            with self._lock:
+                component['instance'] = instance
+                component['state'] = READY
+        except Exception as e:
+            logger.error(f"Failed to initialize {name}: {e}")
+            with self._lock:
+                component['error'] = str(e)
+                component['state'] = FAILED
+        finally:
+            component['seconds'] = round(time.perf_counter() - started, 3)
+            component['ready'].set()
+
+        logger.info(f"Component {name} {component['state']} in {component['seconds']}s")
+
+    def get(self, name, timeout=None):
+        """
+        Get a component instance, waiting for it to finish starting.
+
+        Args:
+            name: Component name
+            timeout: Seconds to wait (defaults to Config.STARTUP_WAIT_TIMEOUT)
+
+        Returns:
+            Component instance
+
+        Raises:
+            ComponentUnavailable: If the component failed or is still starting
+        """
+        component = self._components[name]
+        if timeout is None:
+            timeout = Config.STARTUP_WAIT_TIMEOUT
+
+        if not component['ready'].wait(timeout):
+            raise ComponentUnavailable(f"{name} is still starting, please retry shortly")
+        if component['state'] == FAILED:
+            raise ComponentUnavailable(f"{name} failed to start: {component['error']}")
+        return component['instance']
+
+    def is_ready(self, name):
+        """Check whether a component has started successfully."""
+        return self._components[name]['state'] == READY
+
+    def wait(self, timeout=None):
+        """
+        Wait for every component to finish starting.
+
+        Args:
+            timeout: Seconds to wait in total, or None to wait indefinitely
+
+        Returns:
+            True if all components finished (ready or failed) in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for component in list(self._components.values()):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not component['ready'].wait(remaining):
+                return False
+        return True
+
+    def get_status(self):
+        """
+        Get the overall status and the state of each component.
+
+        Returns:
+            Tuple of (status, components) where status is 'healthy',
+            'starting' or 'unhealthy' based on the required components
+        """
+        with self._lock:
+            components = {
+                name: {
+                    'state': c['state'],
+                    'required': c['required'],
+                    'seconds': c['seconds'],
+                    'error': c['error']
+                }
+                for name, c in self._components.items()
+            }
+
+        required = [c['state'] for c in components.values() if c['required']]
+        if FAILED in required:
+            status = 'unhealthy'
+        elif STARTING in required:
+            status = 'starting'
+        else:
+            status = 'healthy'
+        return status, components
+
+
+class LazyComponent:
+    """Stand-in that forwards attribute access to a component once ready."""
+
+    __slots__ = ('_components', '_name')
+
+    def __init__(self, components, name):
+        self._components = components
+        self._name = name
+
+    def __getattr__(self, attr):
+        # Never block an event loop thread; fail fast there instead
+        try:
+            asyncio.get_running_loop()
+            timeout = 0
+        except RuntimeError:
+            timeout = None
+        return getattr(self._components.get(self._name, timeout), attr)
@@ -5,7 +5,7 @@ Generates professionally formatted .docx files with structured sections.
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from datetime import datetime
+from datetime import datetime, timezone
 import os
 import re
 import json
@@ -285,6 +285,108 @@ def create_process_document(analysis_text, process_name='Process Analysis', meta
         raise
 
 
+def create_process_analysis_report(process_name='Process Analysis', process_data='', analysis_type='standard', source='Local Report Generator', suffix=None):
+    """
+    Generate the process analysis report locally.
+    
+    Builds the same document as the process-analysis-doc.yml workflow from
+    the same inputs, in milliseconds instead of an Actions run; only the
+    source labels differ. Keep the two in step (see check_report_parity.py).
+    
+    Args:
+        process_name: Name of the process
+        process_data: Process data and context for analysis
+        analysis_type: 'standard', 'detailed' or 'summary'
+        source: Generator named in the header, metadata and footer
+        suffix: Optional filename suffix making concurrent reports of the
+            same process distinct (e.g. a batch ID and item index)
+        
+    Returns:
+        str: Filename of the generated document
+    """
+    try:
+        os.makedirs('generated_reports', exist_ok=True)
+        
+        doc = Document()
+        
+        # Set default font to Calibri
+        style = doc.styles['Normal']
+        style.font.name = 'Calibri'
+        style.font.size = Pt(11)
+        
+        # Header
+        header_para = doc.sections[0].header.paragraphs[0]
+        header_para.text = f'GitHub Process Manager | Process Documentation - {source}'
+        header_para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        header_run = header_para.runs[0]
+        header_run.font.size = Pt(10)
+        header_run.font.color.rgb = RGBColor(74, 144, 226)
+        
+        # Title and process name
+        title = doc.add_heading('Process Analysis Report', 0)
+        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        title_run = title.runs[0]
+        title_run.font.color.rgb = RGBColor(74, 144, 226)
+        title_run.font.size = Pt(18)
+        
+        process_heading = doc.add_heading(process_name, level=2)
+        process_heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        
+        doc.add_paragraph()
+        
+        # Metadata
+        info_para = doc.add_paragraph()
+        info_para.add_run(f"Generated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}\n").bold = True
+        info_para.add_run(f"Analysis Type: {analysis_type.title()}\n").bold = True
+        info_para.add_run(f"Source: {source}\n").bold = True
+        
+        doc.add_paragraph('_' * 80)
+        doc.add_paragraph()
+        
+        sections = [
+            ('1. Overview',
+             'This section provides an overview of the process, its objectives, and scope.'),
+            ('2. Key Components',
+             '• Component 1: Primary process elements\n• Component 2: Supporting infrastructure\n• Component 3: Integration points'),
+            ('3. Procedures',
+             '1. Step-by-step process execution\n2. Quality checks and validation points\n3. Documentation and evidence collection\n4. Review and approval steps\n5. Monitoring and continuous improvement'),
+            ('4. Analysis Results',
+             f'Analysis Type: {analysis_type.title()}\n\nProcess Data Analyzed:\n{process_data}\n\nFindings:\n• Sample size: To be determined based on requirements\n• Observations: To be documented during analysis\n• Process effectiveness: To be assessed upon completion'),
+            ('5. Conclusion and Recommendations',
+             'This report provides the framework for process analysis. Actual results and conclusions should be documented based on specific analysis performed. Recommendations will be provided based on findings.')
+        ]
+        
+        for section_title, section_content in sections:
+            heading = doc.add_heading(section_title, level=1)
+            heading_run = heading.runs[0]
+            heading_run.font.color.rgb = RGBColor(74, 144, 226)
+            heading_run.font.size = Pt(14)
+            
+            doc.add_paragraph(section_content)
+            doc.add_paragraph()
+        
+        # Footer
+        footer_para = doc.sections[0].footer.paragraphs[0]
+        footer_para.text = f'Page | Confidential | Generated by {source}'
+        footer_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        footer_run = footer_para.runs[0]
+        footer_run.font.size = Pt(9)
+        footer_run.font.color.rgb = RGBColor(128, 128, 128)
+        
+        # Same naming as the workflow artifact
+        safe_name = ''.join(c for c in process_name if c.isalnum() or c in (' ', '_')).replace(' ', '_')
+        filename = f'Process_Analysis_{safe_name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+        filename += f'_{suffix}.docx' if suffix else '.docx'
+        doc.save(os.path.join('generated_reports', filename))
+        logger.info(f"Generated process analysis report locally: {filename}")
+        
+        return filename
+        
+    except Exception as e:
+        logger.error(f"Error generating process analysis report: {e}")
+        raise
+
+
 def list_generated_reports():
     """
     List all generated Word documents in the generated_reports folder.
@@ -338,7 +440,7 @@ def cleanup_old_reports(hours=24):
         cutoff_time = current_time - (hours * 3600)
         
         for filename in os.listdir(reports_dir):
-            if filename.endswith('.docx'):
+            if filename.endswith(('.docx', '.zip')):
                 filepath = os.path.join(reports_dir, filename)
                 file_time = os.path.getmtime(filepath)
                 
@@ -0,0 +1,208 @@
+"""
+Tracking for dispatched GitHub Actions workflows.
+Each dispatch gets a correlation token that the workflow echoes into its
+run name; a background resolver matches the token to find the run ID, so
+the web request returns immediately and concurrent dispatches never mix
+up their runs.
+"""
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logger import logger
+from config import Config
+from github_rate_limit import github_priority, BACKGROUND
+
+PENDING = 'pending'
+RESOLVED = 'resolved'
+UNRESOLVED = 'unresolved'
+
+# Artifact each report workflow uploads (see .github/workflows)
+WORKFLOW_ARTIFACTS = {
+    'process-analysis-doc.yml': 'process-report',
+    'sox-analysis-doc.yml': 'sox-report'
+}
+
+
+class DispatchTracker:
+    """Pending workflow dispatches and the background run resolver."""
+
+    def __init__(self, github_client):
+        """
+        Initialize the tracker.
+
+        Args:
+            github_client: GitHubClient used to list workflow runs
+        """
+        self.github_client = github_client
+        self._dispatches = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def register(self, workflow_file, **details):
+        """
+        Create a pending dispatch handle.
+
+        Call before dispatching so the run can be matched as soon as it
+        appears.
+
+        Args:
+            workflow_file: Workflow filename
+            **details: Extra fields kept on the handle (e.g. process_name)
+
+        Returns:
+            Dispatch dict with its 'dispatch_id' correlation token and the
+            'artifact_name' the workflow uploads
+        """
+        now = time.time()
+        dispatch = dict(
+            details,
+            dispatch_id=uuid.uuid4().hex,
+            workflow_file=workflow_file,
+            artifact_name=WORKFLOW_ARTIFACTS.get(workflow_file),
+            repository=self.github_client.full_name,
+            status=PENDING,
+            run_id=None,
+            run_url=None,
+            dispatched_at=datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            _created=now
+        )
+        with self._lock:
+            self._prune(now)
+            self._dispatches[dispatch['dispatch_id']] = dispatch
+        return self._public(dispatch)
+
+    def start(self, dispatch_id):
+        """Begin resolving a dispatch whose workflow was triggered."""
+        self._ensure_resolver()
+        self._wakeup.set()
+
+    def discard(self, dispatch_id):
+        """Forget a dispatch whose trigger failed."""
+        with self._lock:
+            self._dispatches.pop(dispatch_id, None)
+
+    def get(self, dispatch_id):
+        """
+        Get a dispatch's current state.
+
+        Returns:
+            Dispatch dict, or None if unknown
+        """
+        with self._lock:
+            dispatch = self._dispatches.get(dispatch_id)
+            return self._public(dispatch) if dispatch else None
+
+    def artifact_name_for_run(self, run_id):
+        """
+        Get the artifact name of the dispatch a run was resolved to.
+
+        Returns:
+            Artifact name, or None if no tracked dispatch has that run
+        """
+        with self._lock:
+            for dispatch in self._dispatches.values():
+                if dispatch['run_id'] == run_id:
+                    return dispatch['artifact_name']
+        return None
+
+    def _public(self, dispatch):
+        return {k: v for k, v in dispatch.items() if not k.startswith('_')}
+
+    def _prune(self, now):
+        """Drop finished dispatches older than the retention window."""
+        cutoff = now - Config.WORKFLOW_DISPATCH_RETENTION
+        for dispatch_id, dispatch in list(self._dispatches.items()):
+            if dispatch['status'] != PENDING and dispatch['_created'] < cutoff:
+                del self._dispatches[dispatch_id]
+
+    def _ensure_resolver(self):
+        """Start the resolver thread if it is not running."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._resolve_loop,
+                name='workflow-dispatch-resolver',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _resolve_loop(self):
+        """Poll for the runs of pending dispatches until none are left."""
+        while True:
+            self._wakeup.wait(Config.WORKFLOW_RESOLVE_INTERVAL)
+            self._wakeup.clear()
+
+            with self._lock:
+                pending = [d for d in self._dispatches.values() if d['status'] == PENDING]
+                if not pending:
+                    # Decided under the lock so a new dispatch restarts the thread
+                    self._thread = None
+                    return
+
+            try:
+                with github_priority(BACKGROUND):
+                    self._resolve(pending)
+            except Exception as e:
+                logger.error(f"Error resolving workflow dispatches: {e}")
+
+            self._expire(pending)
+
+    def _resolve(self, pending):
+        """Match pending dispatches to runs by their correlation token."""
+        by_workflow = {}
+        for dispatch in pending:
+            key = (dispatch['repository'], dispatch['workflow_file'])
+            by_workflow.setdefault(key, []).append(dispatch)
+
+        for (repository, workflow_file), dispatches in by_workflow.items():
+            since = min(d['dispatched_at'] for d in dispatches)
+            # Allow for clock skew between this host and GitHub
+            since = datetime.fromisoformat(since).timestamp() - 60
+            with self.github_client.use_repository(repository):
+                runs = self.github_client.list_dispatched_runs(
+                    workflow_file,
+                    datetime.fromtimestamp(since, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    correlation_ids=[d['dispatch_id'] for d in dispatches]
+                )
+
+            with self._lock:
+                for dispatch in dispatches:
+                    run = next(
+                        (r for r in runs
+                         if dispatch['dispatch_id'] in (r.get('display_title') or '')),
+                        None
+                    )
+                    if run:
+                        dispatch.update(
+                            status=RESOLVED,
+                            run_id=run['id'],
+                            run_url=run['html_url']
+                        )
+                        logger.info(
+                            f"Resolved dispatch {dispatch['dispatch_id']} to run {run['id']}"
+                        )
+
+    def _expire(self, pending):
+        """Give up on dispatches whose run never appeared."""
+        now = time.time()
+        with self._lock:
+            for dispatch in pending:
+                if (dispatch['status'] == PENDING
+                        and now - dispatch['_created'] > Config.WORKFLOW_RESOLVE_TIMEOUT):
+                    dispatch['status'] = UNRESOLVED
+                    logger.warning(
+                        f"No run found for dispatch {dispatch['dispatch_id']} "
+                        f"of {dispatch['workflow_file']}; does the workflow "
+                        f"declare the correlation_id input?"
+                    )
+
+    def get_stats(self):
+        """Get dispatch counts by status."""
+        with self._lock:
+            counts = {PENDING: 0, RESOLVED: 0, UNRESOLVED: 0}
+            for dispatch in self._dispatches.values():
+                counts[dispatch['status']] += 1
+            return counts
@@ -0,0 +1,294 @@
+"""
+Workflow run history and duration analytics.
+Completed workflow runs are collected incrementally (only runs created
+since the last watermark are paged through) into a compact SQLite table,
+and per-workflow duration, queue time and failure statistics are computed
+with NumPy.
+"""
+import itertools
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+from logger import logger
+from config import Config
+from github_rate_limit import github_priority, BACKGROUND
+
+# Conclusions counted as failures; cancelled and skipped runs are left out
+# of the failure rate and the timings
+FAILED_CONCLUSIONS = ('failure', 'timed_out', 'startup_failure')
+IGNORED_CONCLUSIONS = ('cancelled', 'skipped', 'neutral', 'stale')
+
+# Most results GitHub returns for a filtered runs listing; fuller windows
+# are split until they fit, down to a minimum window length
+RUNS_LISTING_CAP = 1000
+MIN_WINDOW_SECONDS = 60
+
+
+def to_epoch(timestamp):
+    """Convert a GitHub ISO 8601 timestamp to epoch seconds (or None)."""
+    if not timestamp:
+        return None
+    return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp())
+
+
+def to_iso(epoch):
+    """Convert epoch seconds to the timestamp format GitHub filters accept."""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class WorkflowHistory:
+    """SQLite store of completed workflow runs, keyed by repository."""
+
+    def __init__(self, db_path=None):
+        """
+        Initialize the history store.
+
+        Args:
+            db_path: SQLite database path (defaults to Config.GITHUB_STATE_DB)
+        """
+        self.db_path = db_path or Config.GITHUB_STATE_DB
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._collecting = set()
+
+        with self._lock, self._conn:
+            # Timestamps as epoch integers and no payload keep rows small
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS workflow_run_history (
+                    repo TEXT NOT NULL,
+                    run_id INTEGER NOT NULL,
+                    workflow TEXT NOT NULL,
+                    conclusion TEXT,
+                    created_at INTEGER NOT NULL,
+                    started_at INTEGER,
+                    completed_at INTEGER,
+                    PRIMARY KEY (repo, run_id)
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_workflow_run_history_created
+                ON workflow_run_history (repo, created_at)
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS workflow_history_watermarks (
+                    repo TEXT PRIMARY KEY,
+                    watermark INTEGER NOT NULL,
+                    collected_at REAL NOT NULL
+                )
+            """)
+
+    def _watermark(self, repo):
+        """Get (watermark, collected_at) for a repository, or (None, None)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, collected_at FROM workflow_history_watermarks "
+                "WHERE repo = ?", (repo,)
+            ).fetchone()
+        return row if row else (None, None)
+
+    def is_stale(self, repo):
+        """Whether a repository's history is older than the refresh interval."""
+        _, collected_at = self._watermark(repo)
+        return (collected_at is None
+                or time.time() - collected_at > Config.WORKFLOW_HISTORY_REFRESH)
+
+    def start_collect(self, github_client):
+        """
+        Collect new runs of the current request's repository in the background.
+
+        Args:
+            github_client: GitHubClient scoped to the repository
+
+        Returns:
+            True if a collection was started, False if one is already running
+        """
+        repo = github_client.full_name
+        with self._lock:
+            if repo in self._collecting:
+                return False
+            self._collecting.add(repo)
+
+        threading.Thread(
+            target=self._collect_in_background,
+            args=(github_client, repo),
+            name='workflow-history',
+            daemon=True
+        ).start()
+        return True
+
+    def _collect_in_background(self, github_client, repo):
+        """Background collection of one repository."""
+        try:
+            with github_priority(BACKGROUND), github_client.use_repository(repo):
+                self.collect(github_client)
+        except Exception as e:
+            logger.warning(f"Could not collect workflow runs for {repo}: {e}")
+        finally:
+            with self._lock:
+                self._collecting.discard(repo)
+
+    def collect(self, github_client):
+        """
+        Store completed runs created since the repository's watermark.
+
+        The watermark only moves past a run once it has completed, so runs
+        still in progress are picked up again by the next collection; runs
+        pending for longer than WORKFLOW_HISTORY_PENDING_MAX_AGE (e.g.
+        waiting for an approval) no longer hold it back.
+
+        GitHub returns at most RUNS_LISTING_CAP runs per filtered listing,
+        so windows holding more are split in half until each fits.
+
+        Args:
+            github_client: GitHubClient scoped to the repository
+
+        Returns:
+            Dictionary with the number of runs fetched and stored
+        """
+        repo = github_client.full_name
+        watermark, _ = self._watermark(repo)
+        now = int(time.time())
+        since = watermark or now - Config.WORKFLOW_HISTORY_BACKFILL_DAYS * 86400
+        pending_cutoff = now - Config.WORKFLOW_HISTORY_PENDING_MAX_AGE
+
+        rows = []
+        fetched = 0
+        oldest_pending = None
+        newest = since
+        windows = [(since, now)]
+        while windows:
+            start, end = windows.pop()
+            pages = github_client.iter_workflow_run_pages(to_iso(start), to_iso(end))
+            first = next(pages, None)
+            if first is None:
+                continue
+            if first['total_count'] > RUNS_LISTING_CAP:
+                if end - start > MIN_WINDOW_SECONDS:
+                    pages.close()
+                    middle = (start + end) // 2
+                    windows += [(start, middle), (middle + 1, end)]
+                    continue
+                logger.warning(
+                    f"More than {RUNS_LISTING_CAP} workflow runs of {repo} created "
+                    f"between {to_iso(start)} and {to_iso(end)}; some are skipped"
+                )
+
+            for page in itertools.chain([first], pages):
+                for run in page.get('workflow_runs', []):
+                    fetched += 1
+                    created_at = to_epoch(run['created_at'])
+                    if run['status'] != 'completed':
+                        if created_at >= pending_cutoff:
+                            oldest_pending = min(oldest_pending or created_at, created_at)
+                        continue
+                    newest = max(newest, created_at)
+                    rows.append((
+                        repo, run['id'], run['name'], run['conclusion'], created_at,
+                        to_epoch(run.get('run_started_at')), to_epoch(run['updated_at'])
+                    ))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO workflow_run_history "
+                "(repo, run_id, workflow, conclusion, created_at, started_at, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO workflow_history_watermarks "
+                "(repo, watermark, collected_at) VALUES (?, ?, ?)",
+                (repo, oldest_pending or newest, time.time())
+            )
+
+        logger.info(f"Collected {len(rows)} completed workflow runs of {repo} ({fetched} fetched)")
+        return {'fetched': fetched, 'stored': len(rows)}
+
+    def get_stats(self, repo, days=30, recent_days=7):
+        """
+        Compute per-workflow timing and failure statistics.
+
+        Args:
+            repo: Repository full name
+            days: Window of run history to analyse
+            recent_days: Length of the recent and previous windows compared
+                to show whether a workflow is getting slower
+
+        Returns:
+            List of per-workflow dictionaries (times in seconds)
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT workflow, conclusion, created_at, started_at, completed_at "
+                "FROM workflow_run_history "
+                "WHERE repo = ? AND created_at >= ? AND conclusion NOT IN (?, ?, ?, ?)",
+                (repo, int(now - days * 86400)) + IGNORED_CONCLUSIONS
+            ).fetchall()
+        if not rows:
+            return []
+
+        workflows, conclusions, created, started, completed = zip(*rows)
+        names, group = np.unique(np.array(workflows), return_inverse=True)
+        created = np.array(created, dtype=float)
+        started = np.array([s if s is not None else np.nan for s in started], dtype=float)
+        completed = np.array(completed, dtype=float)
+        duration = completed - started
+        queue = started - created
+        failed = np.isin(np.array(conclusions), FAILED_CONCLUSIONS)
+
+        runs = np.bincount(group, minlength=len(names))
+        failures = np.bincount(group, weights=failed, minlength=len(names))
+
+        # Sort once by workflow, then split into per-workflow slices
+        order = np.argsort(group, kind='stable')
+        bounds = np.cumsum(runs)[:-1]
+        age = now - created[order]
+        recent = age <= recent_days * 86400
+        previous = (age > recent_days * 86400) & (age <= 2 * recent_days * 86400)
+
+        def percentiles(values):
+            values = values[~np.isnan(values)]
+            if not values.size:
+                return [None, None]
+            return [round(float(v), 1) for v in np.percentile(values, [50, 95])]
+
+        def median(values):
+            values = values[~np.isnan(values)]
+            return round(float(np.median(values)), 1) if values.size else None
+
+        stats = []
+        for i, (name, durations, queues, is_recent, is_previous) in enumerate(zip(
+                names,
+                np.split(duration[order], bounds),
+                np.split(queue[order], bounds),
+                np.split(recent, bounds),
+                np.split(previous, bounds))):
+            duration_p50, duration_p95 = percentiles(durations)
+            queue_p50, queue_p95 = percentiles(queues)
+            stats.append({
+                'workflow': str(name),
+                'runs': int(runs[i]),
+                'failure_rate': round(float(failures[i] / runs[i]), 3),
+                'duration_p50': duration_p50,
+                'duration_p95': duration_p95,
+                'queue_p50': queue_p50,
+                'queue_p95': queue_p95,
+                'duration_p50_recent': median(durations[is_recent]),
+                'duration_p50_previous': median(durations[is_previous])
+            })
+        return stats
+
+    def get_collection_info(self, repo):
+        """Get the watermark, last collection time and collection state of a repository."""
+        watermark, collected_at = self._watermark(repo)
+        with self._lock:
+            collecting = repo in self._collecting
+        return {
+            'collecting': collecting,
+            'watermark': to_iso(watermark) if watermark else None,
+            'collected_at': (
+                datetime.fromtimestamp(collected_at).isoformat() if collected_at else None
+            )
+        }